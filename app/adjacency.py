@@ -0,0 +1,89 @@
+# app/adjacency.py
+
+# The moves a grid allows, as (d_row, d_col), in the order get_neighbors
+# returns them: the four straight moves first (right, left, down, up), then
+# the diagonals. Bit k of a cell's link mask stands for DIRECTIONS[k].
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1))
+STRAIGHT_MOVES = 4
+
+class Adjacency:
+    """
+    Precomputed moves for every cell of a rows x cols grid: one byte per
+    cell whose bits say which neighbours can be stepped onto. A straight
+    move needs its target cell to be walkable. A diagonal move
+    additionally needs both cells it passes between to be walkable, so
+    paths never cut a wall's corner. The cell's own walkability does not
+    matter, matching what get_neighbors has always returned.
+
+    The grid keeps this up to date: set_walkable() after each wall edit
+    touches only the 3x3 block around the cell, and rebuild() after bulk
+    changes recomputes everything with big-int bit operations.
+    """
+    def __init__(self, rows, cols, walkable=None):
+        self.rows, self.cols = rows, cols
+        self.open = bytearray([1]) * (rows * cols) # 1 for walkable cells
+        self.links = bytearray(rows * cols)
+        self.rebuild(walkable)
+
+    def rebuild(self, walkable=None):
+        """
+        Recomputes every mask. `walkable` (one byte per cell, non-zero for
+        walkable) replaces the walkability first if given.
+        """
+        rows, cols = self.rows, self.cols
+        if walkable is not None:
+            self.open = bytearray(walkable).translate(_OPEN_TABLE)
+        width = cols + 1 # A zero pad column per row keeps moves from wrapping
+        total = rows * width
+        # Same packing as app/wavefront.py: bit j is padded cell j.
+        text = b"".join(self.open[start:start + cols] + b"\x00" for start in range(0, rows * cols, cols))
+        o = int(text.translate(_ASCII_TABLE)[::-1] or b"0", 2)
+        full = (1 << total) - 1
+        right, left, down, up = o >> 1, (o << 1) & full, o >> width, (o << width) & full
+        planes = (right, left, down, up,
+                  right & down & (o >> (width + 1)), left & down & (o >> (width - 1)),
+                  right & up & (o << (width - 1)), left & up & (o << (width + 1)))
+        # Spread each plane to one byte per cell (bit k set for plane k) and
+        # add them up; the planes use different bits, so nothing carries.
+        spread = 0
+        for k, plane in enumerate(planes):
+            text = format(plane & full, "b").zfill(total)[::-1].encode()
+            spread += int.from_bytes(text.translate(_BIT_TABLES[k]), "little")
+        padded = spread.to_bytes(total, "little")
+        self.links = bytearray(b"".join(padded[row * width:row * width + cols] for row in range(rows)))
+
+    def set_walkable(self, index, walkable):
+        """Records that cell `index` became walkable or a wall."""
+        walkable = int(bool(walkable))
+        if self.open[index] == walkable:
+            return
+        self.open[index] = walkable
+        row, col = divmod(index, self.cols)
+        for r in range(max(row - 1, 0), min(row + 2, self.rows)):
+            for c in range(max(col - 1, 0), min(col + 2, self.cols)):
+                self.links[r * self.cols + c] = self._cell_links(r, c)
+
+    def _cell_links(self, row, col):
+        rows, cols, is_open = self.rows, self.cols, self.open
+        def free(r, c):
+            return 0 <= r < rows and 0 <= c < cols and is_open[r * cols + c]
+        mask = 0
+        for k, (d_row, d_col) in enumerate(DIRECTIONS):
+            if free(row + d_row, col + d_col) and (k < STRAIGHT_MOVES or
+                                                    (free(row + d_row, col) and free(row, col + d_col))):
+                mask |= 1 << k
+        return mask
+
+    def neighbor_table(self, diagonal=False):
+        """
+        For every mask value, the flat index offsets of the moves it allows,
+        in DIRECTIONS order. Diagonal bits are ignored unless `diagonal`.
+        """
+        cols = self.cols
+        offsets = [d_row * cols + d_col for d_row, d_col in DIRECTIONS]
+        moves = len(DIRECTIONS) if diagonal else STRAIGHT_MOVES
+        return [tuple(offsets[k] for k in range(moves) if mask >> k & 1) for mask in range(256)]
+
+_OPEN_TABLE = bytes([0]) + bytes([1]) * 255
+_ASCII_TABLE = b"0" + b"1" * 255
+_BIT_TABLES = [bytes(1 << k if code == ord("1") else 0 for code in range(256)) for k in range(len(DIRECTIONS))]
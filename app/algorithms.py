@@ -1,98 +1,78 @@
 # app/algorithms.py
 
-import collections
-import heapq
 from .constants import NodeState
-
-# --- Helper function for all algorithms ---
-def _reconstruct_path(draw_callback, end_node):
-    """Backtracks from the end node to the start, drawing the path."""
-    current = end_node.parent
-    while current and current.parent:
-        current.state = NodeState.PATH
+from . import engine
+from .connectivity import shared_connectivity
+
+# The searches themselves live in the headless engine. The functions here
+# are the visual layer on top: they replay each engine step onto the Node
+# states so the visualizer can animate it.
+
+# --- Helper functions for all algorithms ---
+def _reconstruct_path(draw_callback, path):
+    """Paints the cells between start and end as the final path."""
+    for node in path[1:-1]:
+        node.state = NodeState.PATH
         draw_callback()
-        current = current.parent
 
-# --- Pathfinding Algorithm Implementations ---
+def _animate(search, grid, draw_callback):
+    """
+    Runs an engine search from the grid's start to end node, colouring the
+    open and expanded nodes step by step. Yields once per engine step and
+    returns True if a path was found. Disconnected endpoints return False
+    at once.
+    """
+    if not shared_connectivity(grid).may_connect(grid.start_node, grid.end_node):
+        return False
+    return (yield from animate_steps(search(grid, grid.start_node, grid.end_node), draw_callback))
+
+def animate_steps(steps, draw_callback):
+    """Like _animate, but for an already started search generator."""
+    while True:
+        try:
+            closed, opened = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        for node in opened:
+            if node.state not in (NodeState.START, NodeState.END):
+                node.state = NodeState.VISITING
+        for node in closed:
+            if node.state not in (NodeState.START, NodeState.END):
+                node.state = NodeState.VISITED
+        yield
+
+    _reconstruct_path(draw_callback, result.path)
+    return result.found
+
+def show_result(result):
+    """Paints a finished SearchResult in one go: expanded cells, then the path."""
+    for node in result.expanded:
+        if node.state not in (NodeState.START, NodeState.END):
+            node.state = NodeState.VISITED
+    for node in result.path[1:-1]:
+        node.state = NodeState.PATH
+
+# --- Pathfinding Algorithm Visualizations ---
 
 def a_star_search(grid, draw_callback):
     """
-    A* Search Algorithm. Uses a heuristic (Manhattan distance) to find the
-    most promising path. It's both complete and optimal.
+    A* Search Algorithm. Uses a heuristic (Manhattan distance, or octile
+    distance with diagonal movement) to find the most promising path. It's
+    both complete and optimal, also on weighted cells.
     Yields control to allow for animation.
     """
-    def h(p1, p2):
-        return abs(p1.row - p2.row) + abs(p1.col - p2.col)
-
-    count = 0
-    open_set = [(0, count, grid.start_node)]
-    g_score = {node: float("inf") for row in grid.nodes for node in row}
-    g_score[grid.start_node] = 0
-    f_score = {node: float("inf") for row in grid.nodes for node in row}
-    f_score[grid.start_node] = h(grid.start_node, grid.end_node)
-
-    open_set_hash = {grid.start_node}
-
-    while open_set:
-        current = heapq.heappop(open_set)[2]
-        open_set_hash.remove(current)
-
-        if current == grid.end_node:
-            _reconstruct_path(draw_callback, grid.end_node)
-            return True
-
-        for neighbor in grid.get_neighbors(current):
-            temp_g_score = g_score[current] + 1
-            if temp_g_score < g_score[neighbor]:
-                neighbor.parent = current
-                g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h(neighbor, grid.end_node)
-                if neighbor not in open_set_hash:
-                    count += 1
-                    heapq.heappush(open_set, (f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    if neighbor.state != NodeState.END:
-                        neighbor.state = NodeState.VISITING
-        yield
-        if current != grid.start_node:
-            current.state = NodeState.VISITED
-    return False
+    return (yield from _animate(engine.a_star, grid, draw_callback))
 
 def dijkstra(grid, draw_callback):
     """
-    Dijkstra's Algorithm. Finds the shortest path in a weighted graph.
-    For our unweighted grid, it behaves identically to BFS but is implemented
-    with a priority queue for correctness and extensibility.
+    Dijkstra's Algorithm. Finds the cheapest path when cells have costs
+    (weights). The integer costs let it use a bucket queue instead of a
+    binary heap; with diagonal movement, whose steps cost sqrt(2), it runs
+    as A* with a zero heuristic.
     Yields control to allow for animation.
     """
-    count = 0
-    pq = [(0, count, grid.start_node)] # (distance, count, node)
-    distances = {node: float('inf') for row in grid.nodes for node in row}
-    distances[grid.start_node] = 0
-    
-    visited_hash = {grid.start_node}
-
-    while pq:
-        dist, _, current = heapq.heappop(pq)
-
-        if current == grid.end_node:
-            _reconstruct_path(draw_callback, grid.end_node)
-            return True
-            
-        if current.state != NodeState.START:
-            current.state = NodeState.VISITED
-
-        for neighbor in grid.get_neighbors(current):
-            if neighbor not in visited_hash:
-                neighbor.parent = current
-                distances[neighbor] = dist + 1
-                count += 1
-                heapq.heappush(pq, (distances[neighbor], count, neighbor))
-                visited_hash.add(neighbor)
-                if neighbor.state != NodeState.END:
-                    neighbor.state = NodeState.VISITING
-        yield
-    return False
+    return (yield from _animate(engine.dijkstra, grid, draw_callback))
 
 def breadth_first_search(grid, draw_callback):
     """
@@ -100,28 +80,7 @@ def breadth_first_search(grid, draw_callback):
     shortest path on an unweighted grid.
     Yields control to allow for animation.
     """
-    queue = collections.deque([grid.start_node])
-    visited = {grid.start_node}
-
-    while queue:
-        current = queue.popleft()
-
-        if current == grid.end_node:
-            _reconstruct_path(draw_callback, grid.end_node)
-            return True
-
-        if current != grid.start_node:
-            current.state = NodeState.VISITED
-
-        for neighbor in grid.get_neighbors(current):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                neighbor.parent = current
-                queue.append(neighbor)
-                if neighbor.state != NodeState.END:
-                    neighbor.state = NodeState.VISITING
-        yield
-    return False
+    return (yield from _animate(engine.breadth_first_search, grid, draw_callback))
 
 def depth_first_search(grid, draw_callback):
     """
@@ -129,28 +88,65 @@ def depth_first_search(grid, draw_callback):
     backtracking. Does not guarantee the shortest path.
     Yields control to allow for animation.
     """
-    stack = [grid.start_node]
-    visited = {grid.start_node}
+    return (yield from _animate(engine.depth_first_search, grid, draw_callback))
+
+def wavefront_bfs(grid, draw_callback):
+    """
+    Wavefront BFS. Expands a whole BFS layer per step using bitwise
+    operations over the entire grid. Same shortest paths as BFS.
+    Yields control to allow for animation.
+    """
+    return (yield from _animate(engine.wavefront_search, grid, draw_callback))
 
-    while stack:
-        current = stack.pop()
+def jump_point_search(grid, draw_callback):
+    """
+    Jump Point Search (JPS). A* that jumps along straight runs and only
+    expands the jump points where the path may need to turn. Optimal on
+    the uniform-cost grid. Yields control to allow for animation.
+    """
+    return (yield from _animate(engine.jump_point_search, grid, draw_callback))
 
-        if current == grid.end_node:
-            _reconstruct_path(draw_callback, grid.end_node)
-            return True
+def bidirectional_bfs(grid, draw_callback):
+    """
+    Bidirectional BFS. Grows BFS layers from both the start and the end
+    until the two frontiers meet. Shortest path on an unweighted grid.
+    Yields control to allow for animation.
+    """
+    return (yield from _animate(engine.bidirectional_bfs, grid, draw_callback))
 
-        if current != grid.start_node:
-            current.state = NodeState.VISITED
+def bidirectional_a_star(grid, draw_callback):
+    """
+    Bidirectional A*. Runs A* forwards from the start and backwards from
+    the end, alternating between them, and stops once no shorter meeting
+    point can exist. Yields control to allow for animation.
+    """
+    return (yield from _animate(engine.bidirectional_a_star, grid, draw_callback))
 
-        for neighbor in reversed(grid.get_neighbors(current)): # Reverse for more intuitive visualization
-            if neighbor not in visited:
-                visited.add(neighbor)
-                neighbor.parent = current
-                stack.append(neighbor)
-                if neighbor.state != NodeState.END:
-                    neighbor.state = NodeState.VISITING
-        yield
-    return False
+def lpa_star(grid, draw_callback):
+    """
+    Lifelong Planning A* (LPA*). Finds the same paths as A*, but keeps its
+    search state so later wall edits only repair the affected part (the
+    visualizer replans live while you draw). Yields control to allow for
+    animation.
+    """
+    return (yield from _animate(engine.lpa_star, grid, draw_callback))
+
+def landmark_a_star(grid, draw_callback):
+    """
+    A* with landmarks (ALT). Precomputes exact distances to a few far-apart
+    landmark cells and uses the triangle inequality as a sharper heuristic,
+    so A* explores far fewer nodes on mazes. Yields control to allow for
+    animation.
+    """
+    return (yield from _animate(engine.landmark_a_star, grid, draw_callback))
+
+def hpa_star(grid, draw_callback):
+    """
+    Hierarchical A* (HPA*). Plans over cluster entrances first, so only a
+    handful of cells light up, then fills in the path inside each cluster.
+    Paths are near-optimal. Yields control to allow for animation.
+    """
+    return (yield from _animate(engine.hpa_star, grid, draw_callback))
 
 # Map algorithm names to functions
 ALGORITHM_MAP = {
@@ -158,4 +154,11 @@ ALGORITHM_MAP = {
     "Dijkstra": dijkstra,
     "Breadth-First Search (BFS)": breadth_first_search,
     "Depth-First Search (DFS)": depth_first_search,
-}
\ No newline at end of file
+    "Wavefront BFS": wavefront_bfs,
+    "Jump Point Search": jump_point_search,
+    "Bidirectional BFS": bidirectional_bfs,
+    "Bidirectional A*": bidirectional_a_star,
+    "LPA* (Incremental)": lpa_star,
+    "A* + Landmarks (ALT)": landmark_a_star,
+    "HPA* (Hierarchical)": hpa_star,
+}
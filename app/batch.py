@@ -0,0 +1,107 @@
+# app/batch.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from .compact_grid import CompactGrid
+from .constants import NodeState
+from .connectivity import shared_connectivity
+from .engine import check_movement, find_path
+
+# Many-queries-one-map pathfinding across a process pool.
+#
+#     for result in solve_batch(grid, [(start, goal), ...], workers=8):
+#         print(result.index, result.cost)
+#
+# The map (cell states followed by cell costs) is copied once into a
+# multiprocessing.shared_memory block; every worker attaches to it and wraps
+# it in a CompactGrid without copying, so tasks only carry the (start, goal)
+# index pairs. Edits made to the grid after solve_batch starts are not seen.
+# Queries between disconnected cells are answered by the caller's
+# connectivity index and never sent, so the workers don't each have to
+# label the map.
+
+class QueryResult:
+    """The outcome of one batch query, kept small so it pickles cheaply."""
+    def __init__(self, index, start, goal, path, cost, nodes_expanded):
+        self.index = index  # Position of the query in the input sequence
+        self.start = start
+        self.goal = goal
+        self.path = path    # Cells of the caller's grid, start ... goal
+        self.cost = cost
+        self.nodes_expanded = nodes_expanded
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    def __repr__(self):
+        return f"QueryResult(#{self.index}, found={self.found}, cost={self.cost}, expanded={self.nodes_expanded})"
+
+# --- Worker side ---
+_worker = {}
+
+def _attach(name, rows, cols, diagonal):
+    """Pool initializer: maps the shared block as this worker's grid."""
+    # Pool workers share the parent's resource tracker, so attaching here
+    # doesn't add a second owner; the parent unlinks the block when done.
+    block = shared_memory.SharedMemory(name=name)
+    size = rows * cols
+    view = block.buf
+    _worker["block"] = block
+    _worker["grid"] = CompactGrid.from_buffers(rows, cols, view[:size], view[size:2 * size], diagonal)
+
+def _solve_chunk(algorithm, first_index, pairs):
+    grid = _worker["grid"]
+    results = []
+    for offset, pair in enumerate(pairs):
+        if pair is None: # Disconnected, seen by the caller
+            results.append((first_index + offset, [], None, 0))
+            continue
+        result = find_path(grid, *pair, algorithm, precheck=False)
+        results.append((first_index + offset, result.path, result.cost, result.nodes_expanded))
+    return results
+
+# --- Caller side ---
+def _share(grid):
+    """Copies the grid's walls and costs into a new shared memory block."""
+    size = grid.rows * grid.cols
+    block = shared_memory.SharedMemory(create=True, size=2 * size)
+    if isinstance(grid, CompactGrid):
+        walls = bytes(grid.cells)
+    else:
+        walls = bytes(NodeState.EMPTY if node.is_walkable() else NodeState.WALL
+                      for row in grid.nodes for node in row)
+    block.buf[:size] = walls
+    block.buf[size:2 * size] = bytes(grid.weights)
+    return block
+
+def solve_batch(grid, queries, algorithm="A* Search", workers=None, ordered=True, chunksize=64):
+    """
+    Solves every (start, goal) pair in `queries` on `grid` with `algorithm`
+    (a name from engine.SEARCHES), spread over `workers` processes (default:
+    one per CPU). Yields QueryResults as they arrive: in input order when
+    `ordered`, otherwise as soon as each chunk of `chunksize` queries
+    completes. Works with both Grid and CompactGrid, in either movement
+    mode; cells in the results belong to the grid that was passed in.
+    """
+    check_movement(grid, algorithm)
+    queries = list(queries)
+    index_of, cell_at = grid.index_of, grid.cell_at
+    connectivity = shared_connectivity(grid)
+    pairs = [(index_of(start), index_of(goal)) if connectivity.may_connect(start, goal) else None
+             for start, goal in queries]
+    chunks = [(first, pairs[first:first + chunksize]) for first in range(0, len(pairs), chunksize)]
+
+    block = _share(grid)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_attach,
+                                 initargs=(block.name, grid.rows, grid.cols, grid.diagonal)) as pool:
+            futures = [pool.submit(_solve_chunk, algorithm, first, chunk) for first, chunk in chunks]
+            for future in (futures if ordered else as_completed(futures)):
+                for index, path, cost, expanded in future.result():
+                    start, goal = queries[index]
+                    yield QueryResult(index, start, goal, [cell_at(i) for i in path], cost, expanded)
+    finally:
+        block.close()
+        block.unlink()
@@ -0,0 +1,203 @@
+# app/bench.py
+
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from .algorithms import ALGORITHM_MAP
+from .compact_grid import CompactGrid
+from .connectivity import shared_connectivity
+from .engine import find_path
+from .generators import GENERATORS, generate
+from .grid import Grid
+
+# Benchmark runner for every entry in ALGORITHM_MAP.
+#
+#     python -m app.bench --sizes 25x40 200x200 --densities 0 0.25 --seeds 1 2
+#     python -m app.bench --json runs/new.json --baseline runs/old.json
+#     python -m app.bench --generator "Recursive Backtracker" --sizes 101x101
+#
+# Each case searches from the top-left to the bottom-right corner of a grid
+# filled by generate_random_walls(density, seed), or by another of
+# generators.GENERATORS (which has no density). Runs are keyed by
+# (size, generator, density, seed, algorithm) so they can be compared
+# against a saved baseline; the process exits with status 1 if any case
+# regressed.
+#
+# Times are for warm queries. The grid's connectivity index is built once,
+# untimed, before any algorithm runs. Each case then makes one untimed
+# warm-up query, which builds that algorithm's own per-grid caches
+# (landmark tables, the HPA* cluster graph). What that first query took
+# beyond a warm one is reported separately as preprocess_seconds.
+
+RANDOM_WALLS = "Random Walls"
+
+FIELDS = ["size", "generator", "density", "seed", "algorithm", "seconds", "preprocess_seconds",
+          "expanded", "max_open", "path_length", "peak_kib"]
+
+def parse_size(text):
+    """Parses 'ROWSxCOLS' (or a single number for a square grid)."""
+    rows, _, cols = text.lower().partition("x")
+    return int(rows), int(cols or rows)
+
+def make_grid(rows, cols, density, seed, compact=False, generator=RANDOM_WALLS):
+    """
+    Builds a seeded grid with start/end in opposite corners. Random walls
+    are placed over the corners; the other generators usually wall in the
+    border, so there start/end go on the first and last open cells in
+    row-major order instead.
+    """
+    grid = CompactGrid(rows, cols) if compact else Grid(rows, cols)
+    if generator == RANDOM_WALLS:
+        grid.generate_random_walls(density, seed=seed)
+        first, last = 0, rows * cols - 1
+    else:
+        generate(grid, generator, seed)
+        cell_at, is_walkable = grid.cell_at, grid.is_walkable
+        open_cells = [index for index in range(rows * cols) if is_walkable(cell_at(index))] or [0, rows * cols - 1]
+        first, last = open_cells[0], open_cells[-1]
+    grid.set_start(grid.cell_at(first))
+    grid.set_end(grid.cell_at(last))
+    return grid
+
+def run_case(grid, algorithm, repeat=3):
+    """
+    Times `algorithm` on `grid` (best of `repeat`, after one untimed
+    warm-up query) and measures its peak memory in a separate, traced run
+    so tracing doesn't skew the timing.
+    """
+    began = time.perf_counter()
+    find_path(grid, grid.start_node, grid.end_node, algorithm)
+    cold = time.perf_counter() - began
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = find_path(grid, grid.start_node, grid.end_node, algorithm)
+        seconds = min(seconds, time.perf_counter() - began)
+
+    tracemalloc.start()
+    try:
+        find_path(grid, grid.start_node, grid.end_node, algorithm)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(seconds, 6),
+        "preprocess_seconds": round(max(cold - seconds, 0.0), 6),
+        "expanded": result.nodes_expanded,
+        "max_open": result.max_open_size,
+        "path_length": result.cost,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+def run_matrix(sizes, densities, seeds, algorithms, repeat=3, compact=False, log=None, generator=RANDOM_WALLS):
+    """
+    Runs every (size, density, seed, algorithm) combination. Generators
+    other than random walls ignore `densities`; their records have density
+    None.
+    """
+    records = []
+    if generator != RANDOM_WALLS:
+        densities = [None]
+    for rows, cols in sizes:
+        for density in densities:
+            for seed in seeds:
+                grid = make_grid(rows, cols, density, seed, compact, generator)
+                shared_connectivity(grid).rebuild() # Shared by every algorithm; not timed
+                for algorithm in algorithms:
+                    record = {"size": f"{rows}x{cols}", "generator": generator, "density": density,
+                              "seed": seed, "algorithm": algorithm}
+                    record.update(run_case(grid, algorithm, repeat))
+                    records.append(record)
+                    if log:
+                        log(record)
+    return records
+
+def _key(record):
+    # Baselines written before --generator existed are all random walls.
+    density = record["density"]
+    return (record["size"], record.get("generator", RANDOM_WALLS), None if density is None else float(density),
+            int(record["seed"]), record["algorithm"])
+
+def compare(records, baseline, threshold=0.10):
+    """
+    Returns the regressions of `records` against `baseline`: cases whose
+    time or peak memory grew by more than `threshold` (a fraction).
+    """
+    previous = {_key(record): record for record in baseline}
+    regressions = []
+    for record in records:
+        old = previous.get(_key(record))
+        if not old:
+            continue
+        for metric in ("seconds", "peak_kib"):
+            if old[metric] and record[metric] > old[metric] * (1 + threshold):
+                regressions.append((record, metric, old[metric], record[metric]))
+    return regressions
+
+def write_json(records, path):
+    with open(path, "w") as handle:
+        json.dump(records, handle, indent=2)
+
+def write_csv(records, path):
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+def _format(record):
+    return (f"{record['size']:>11} {str(record['density']):>5} {record['seed']:>5}  {record['algorithm']:<28}"
+            f"{record['seconds'] * 1000:>10.2f} ms {record['preprocess_seconds'] * 1000:>10.2f} ms "
+            f"{record['expanded']:>9} {record['max_open']:>8} "
+            f"{str(record['path_length']):>7} {record['peak_kib']:>10} KiB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description="Benchmark the pathfinding algorithms.")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[(25, 40), (100, 100)],
+                        metavar="ROWSxCOLS", help="grid sizes (default: 25x40 100x100)")
+    parser.add_argument("--generator", choices=list(GENERATORS), default=RANDOM_WALLS, metavar="NAME",
+                        help="map generator from app.generators (default: Random Walls)")
+    parser.add_argument("--densities", nargs="+", type=float, default=[0.0, 0.25],
+                        help="wall densities passed to generate_random_walls (Random Walls only)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1], help="random wall seeds")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHM_MAP), default=list(ALGORITHM_MAP),
+                        metavar="NAME", help="algorithm names (default: all of ALGORITHM_MAP)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, best is kept")
+    parser.add_argument("--compact", action="store_true", help="use CompactGrid instead of Grid")
+    parser.add_argument("--json", help="write the results as JSON")
+    parser.add_argument("--csv", help="write the results as CSV")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown / memory growth before flagging (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    print(f"Generator: {args.generator}")
+    print(f"{'size':>11} {'dens':>5} {'seed':>5}  {'algorithm':<28}{'time':>13} {'preprocess':>13} {'expanded':>9} "
+          f"{'max_open':>8} {'length':>7} {'peak mem':>14}")
+    records = run_matrix(args.sizes, args.densities, args.seeds, args.algorithms,
+                         args.repeat, args.compact, log=lambda record: print(_format(record)),
+                         generator=args.generator)
+
+    if args.json:
+        write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare(records, baseline, args.threshold)
+        for record, metric, old, new in regressions:
+            print(f"REGRESSION: {record['size']} {record['generator']} density={record['density']} seed={record['seed']} "
+                  f"{record['algorithm']}: {metric} {old} -> {new}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# app/compact_grid.py
+
+import random
+from array import array
+from .adjacency import Adjacency
+from .generators import random_walls
+from .constants import GRID_ROWS, GRID_COLS, NodeState, DEFAULT_COST, MAX_COST, SQRT2
+
+# The search overlay states that clear_path removes.
+_PAINTED_STATES = (NodeState.VISITED, NodeState.VISITING, NodeState.PATH)
+
+# Translation table used by clear_path: visualization states become EMPTY,
+# everything else (EMPTY, START, END, WALL) is kept.
+_CLEAR_PATH_TABLE = bytes(
+    NodeState.EMPTY if state in (NodeState.VISITED, NodeState.VISITING, NodeState.PATH) else state
+    for state in range(256)
+)
+
+# Used by set_walls: walls are kept, every other state becomes EMPTY.
+_WALLS_ONLY_TABLE = bytes(state if state == NodeState.WALL else NodeState.EMPTY for state in range(256))
+
+# Cell state -> 1 if walkable, for building the adjacency table.
+_WALKABLE_TABLE = bytes(0 if state == NodeState.WALL else 1 for state in range(256))
+
+class CompactGrid:
+    """
+    Array-backed alternative to Grid for large maps. Cells are flat integer
+    indices (row * cols + col); their states and step costs live in
+    bytearrays and the parent links in an int32 array, so a 2000x2000 map costs ~20 MB instead
+    of millions of Node objects. Dimensions are chosen at construction.
+
+    It offers the same interface the engine needs (get_node, get_neighbors,
+    position, start_node/end_node), so find_path works on it unchanged.
+    """
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS, diagonal=False):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.cells = bytearray(self.size)            # NodeState per cell
+        self.weights = bytearray([DEFAULT_COST]) * self.size  # Cost of entering each cell
+        self.parents = array("i", [-1]) * self.size  # -1 means no parent
+        self.painted = array("i")  # Cells given a search state or parent since the last clear_path
+        self._max_cost = DEFAULT_COST # None when it needs recomputing
+        self.start_node = None
+        self.end_node = None
+        # Precomputed moves per cell; see app/adjacency.py.
+        self.adjacency = Adjacency(rows, cols)
+        self.diagonal = diagonal # 8-connected movement
+        self._moves = self.adjacency.neighbor_table(diagonal)
+        # Terrain (walls and costs) bookkeeping for caches built on the grid.
+        self.version = 0
+        self._watchers = []
+
+    def watch(self, callback):
+        """
+        Registers callback(cell), called whenever a cell becomes or stops
+        being a wall, or its cost changes. Bulk operations that replace the
+        whole grid, and switching the movement mode, call it with None.
+        Write cells through set_state and set_weight (not self.cells
+        directly) so watchers and the adjacency table are told.
+        """
+        self._watchers.append(callback)
+
+    def unwatch(self, callback):
+        self._watchers.remove(callback)
+
+    def _terrain_changed(self, cell):
+        self.version += 1
+        for callback in self._watchers:
+            callback(cell)
+
+    @classmethod
+    def from_buffers(cls, rows, cols, cells, weights, diagonal=False):
+        """
+        Wraps existing state and cost buffers (e.g. memoryviews of shared
+        memory) without copying them. Bulk operations such as clear_path
+        and generate_random_walls need real bytearrays, so grids made this
+        way are meant for searching only.
+        """
+        grid = cls.__new__(cls)
+        grid.rows, grid.cols, grid.size = rows, cols, rows * cols
+        grid.cells, grid.weights = cells, weights
+        grid.parents = array("i", [-1]) * grid.size
+        grid.painted, grid._max_cost = array("i"), None
+        grid.start_node = grid.end_node = None
+        grid.adjacency = Adjacency(rows, cols, bytes(cells).translate(_WALKABLE_TABLE))
+        grid.diagonal = diagonal
+        grid._moves = grid.adjacency.neighbor_table(diagonal)
+        grid.version, grid._watchers = 0, []
+        return grid
+
+    # --- Cell addressing ---
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def position(self, cell):
+        """Returns (row, col) for a flat cell index."""
+        return divmod(cell, self.cols)
+
+    def index_of(self, cell):
+        """Cells already are flat indices; mirrors Grid.index_of."""
+        return cell
+
+    def cell_at(self, index):
+        return index
+
+    def get_node(self, row, col):
+        """Returns the flat index of (row, col), or None if out of bounds."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return None
+
+    # --- Cell state ---
+    def get_state(self, cell):
+        return self.cells[cell]
+
+    def set_state(self, cell, state):
+        was_wall = self.cells[cell] == NodeState.WALL
+        self.cells[cell] = state
+        if state in _PAINTED_STATES:
+            self.painted.append(cell)
+        if was_wall != (state == NodeState.WALL):
+            self.adjacency.set_walkable(cell, was_wall)
+            self._terrain_changed(cell)
+
+    def is_walkable(self, cell):
+        return self.cells[cell] != NodeState.WALL
+
+    def cost(self, cell):
+        """The cost of stepping onto `cell`."""
+        return self.weights[cell]
+
+    def move_cost(self, cell, neighbor):
+        """The cost of moving from `cell` to `neighbor`: diagonal steps cost sqrt(2) times as much."""
+        cols = self.cols
+        if cell // cols == neighbor // cols or cell % cols == neighbor % cols: # Same row or column
+            return self.weights[neighbor]
+        return self.weights[neighbor] * SQRT2
+
+    def set_diagonal(self, diagonal):
+        """Switches between 4- and 8-connected movement."""
+        if diagonal != self.diagonal:
+            self.diagonal = diagonal
+            self._moves = self.adjacency.neighbor_table(diagonal)
+            self._terrain_changed(None) # Every cached distance is off now
+
+    def max_cost(self):
+        """The highest cell cost, cached until a cost changes."""
+        if self._max_cost is None:
+            self._max_cost = max(self.weights)
+        return self._max_cost
+
+    def set_weight(self, cell, cost):
+        """Sets the cost of stepping onto `cell` (1 to MAX_COST)."""
+        if not DEFAULT_COST <= cost <= MAX_COST:
+            raise ValueError(f"cell cost must be between {DEFAULT_COST} and {MAX_COST}, got {cost}")
+        if self.weights[cell] != cost:
+            self.weights[cell] = cost
+            self._max_cost = None
+            self._terrain_changed(cell)
+
+    def _set_endpoint(self, cell, attr, state):
+        old_cell = getattr(self, attr)
+        if old_cell is not None:
+            self.set_state(old_cell, NodeState.EMPTY)
+        setattr(self, attr, cell)
+        if cell is not None:
+            self.set_state(cell, state)
+
+    def set_start(self, cell):
+        self._set_endpoint(cell, "start_node", NodeState.START)
+
+    def set_end(self, cell):
+        self._set_endpoint(cell, "end_node", NodeState.END)
+
+    def clear_path(self):
+        """
+        Resets visualization states and parents; keeps walls, start and end.
+        Only the cells painted since the last call are visited, unless so
+        many were painted that a whole-grid pass is cheaper.
+        """
+        painted, self.painted = self.painted, array("i")
+        if len(painted) > self.size // 8:
+            self.cells[:] = self.cells.translate(_CLEAR_PATH_TABLE)
+            self.parents = array("i", [-1]) * self.size
+            return
+        cells, parents = self.cells, self.parents
+        for cell in painted:
+            if cells[cell] in _PAINTED_STATES:
+                cells[cell] = NodeState.EMPTY
+            parents[cell] = -1
+
+    def clear_all(self):
+        """Resets the entire grid to its initial state."""
+        self.start_node = None
+        self.end_node = None
+        self.cells = bytearray(self.size)
+        self.weights = bytearray([DEFAULT_COST]) * self.size
+        self.parents = array("i", [-1]) * self.size
+        self.painted, self._max_cost = array("i"), DEFAULT_COST
+        self.adjacency.rebuild(bytes([1]) * self.size)
+        self._terrain_changed(None)
+
+    def get_neighbors(self, cell):
+        """
+        Returns the walkable neighbor indices (right, left, down, up, then
+        the diagonals in 8-connected mode), read from the adjacency table.
+        """
+        return [cell + offset for offset in self._moves[self.adjacency.links[cell]]]
+
+    def show_result(self, result):
+        """
+        Writes a SearchResult into the grid: expanded cells become VISITED,
+        the path becomes PATH and its parent links are stored.
+        """
+        cells = self.cells
+        self.painted.extend(result.expanded)
+        self.painted.extend(result.path)
+        for cell in result.expanded:
+            if cells[cell] not in (NodeState.START, NodeState.END):
+                cells[cell] = NodeState.VISITED
+        for parent, cell in zip(result.path, result.path[1:]):
+            self.parents[cell] = parent
+            if cells[cell] != NodeState.END:
+                cells[cell] = NodeState.PATH
+
+    def set_walls(self, cells):
+        """
+        Replaces the layout: clears the grid and takes the walls from
+        `cells` (one NodeState per cell, row-major). Watchers are told once.
+        """
+        if len(cells) != self.size:
+            raise ValueError(f"expected {self.size} cells, got {len(cells)}")
+        self.start_node = None
+        self.end_node = None
+        self.cells = bytearray(cells).translate(_WALLS_ONLY_TABLE)
+        self.weights = bytearray([DEFAULT_COST]) * self.size
+        self.parents = array("i", [-1]) * self.size
+        self.painted, self._max_cost = array("i"), DEFAULT_COST
+        self.adjacency.rebuild(self.cells.translate(_WALKABLE_TABLE))
+        self._terrain_changed(None)
+
+    def generate_random_walls(self, density=0.25, seed=None):
+        """
+        Generates random walls across the grid. Passing a seed makes the
+        layout reproducible.
+        """
+        self.set_walls(random_walls(self.rows, self.cols, random.Random(seed), density))
@@ -0,0 +1,181 @@
+# app/connectivity.py
+
+import collections
+import re
+from array import array
+
+# The 8 cells around a cell in clockwise order, starting north. Even
+# positions are the 4-connected neighbours; consecutive positions are
+# 4-adjacent to each other.
+_RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+# A run of walkable cells in an Adjacency.open row.
+_RUN = re.compile(b"\x01+")
+
+class ConnectivityIndex:
+    """
+    Connected components of the walkable cells. With it, a query between
+    cells in different components can be answered "no path" in O(1), where
+    a search would flood the whole reachable region first.
+
+    Every cell carries a component label (-1 for walls). Labels are merged
+    with a union-find when an erased wall joins components. A new wall can
+    only split its component, and rarely does: if the open cells around it
+    stay connected through its 8-neighbourhood nothing changes. Otherwise
+    the component is marked dirty and relabelled the next time a query
+    needs it.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = None  # component label per cell index; None until built
+        self.parent = []    # union-find over labels
+        self.dirty = set()  # roots whose component may have been split
+        self.relabels = 0   # lazy relabels so far, for inspection
+        grid.watch(self._on_terrain_change)
+
+    def close(self):
+        """Stops watching the grid."""
+        self.grid.unwatch(self._on_terrain_change)
+
+    # --- Building ---
+    def rebuild(self):
+        """
+        Labels every component from scratch, a run of open cells at a time
+        rather than a cell at a time. Each row's runs are found with a regex
+        over the adjacency table's walkability bytes. A run takes the label
+        of the runs it touches in the row above (uniting them if there are
+        several) or a fresh one, written with a single slice assignment.
+        """
+        grid = self.grid
+        cols = grid.cols
+        self.labels = labels = array("i", [-1]) * (grid.rows * cols)
+        self.parent = parent = []
+        self.dirty = set()
+        find, is_open, new_run = self._find, grid.adjacency.open, _RUN.finditer
+        for start in range(0, len(labels), cols):
+            for match in new_run(is_open, start, start + cols):
+                begin, end = match.span()
+                touching = set(labels[begin - cols:end - cols]) if start else set()
+                touching.discard(-1)
+                if touching:
+                    label = find(touching.pop())
+                    for other in touching:
+                        other = find(other)
+                        if other != label:
+                            parent[other] = label
+                else:
+                    label = len(parent)
+                    parent.append(label)
+                labels[begin:end] = array("i", [label]) * (end - begin)
+
+    def _flood(self, cell):
+        """Gives the component of `cell` a fresh label and returns it."""
+        grid, labels = self.grid, self.labels
+        label = len(self.parent)
+        self.parent.append(label)
+        labels[grid.index_of(cell)] = label
+        queue = collections.deque([cell])
+        while queue:
+            for neighbor in grid.get_neighbors(queue.popleft()):
+                index = grid.index_of(neighbor)
+                if labels[index] != label:
+                    labels[index] = label
+                    queue.append(neighbor)
+        return label
+
+    def _find(self, label):
+        parent = self.parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]] # Path halving
+            label = parent[label]
+        return label
+
+    # --- Keeping up with edits ---
+    def _on_terrain_change(self, cell):
+        if self.labels is None:
+            return
+        if cell is None: # The whole grid was replaced; relabel on next use
+            self.labels = None
+            return
+        index = self.grid.index_of(cell)
+        walkable = self.grid.is_walkable(cell)
+        if walkable == (self.labels[index] != -1):
+            return # Only the cost changed
+        if walkable:
+            self._wall_erased(cell, index)
+        else:
+            self._wall_added(cell, index)
+
+    def _wall_erased(self, cell, index):
+        roots = {self._find(self.labels[self.grid.index_of(n)]) for n in self.grid.get_neighbors(cell)}
+        if not roots:
+            root = len(self.parent)
+            self.parent.append(root)
+        else:
+            root = roots.pop()
+            for other in roots:
+                self.parent[other] = root
+                if other in self.dirty:
+                    self.dirty.discard(other)
+                    self.dirty.add(root)
+        self.labels[index] = root
+
+    def _wall_added(self, cell, index):
+        root = self._find(self.labels[index])
+        self.labels[index] = -1
+        if self._may_split(cell):
+            self.dirty.add(root)
+
+    def _may_split(self, cell):
+        """
+        True unless the open neighbours of `cell` are all in one run of open
+        cells around it (and so still connected without it).
+        """
+        grid = self.grid
+        row, col = grid.position(cell)
+        ring = []
+        for d_row, d_col in _RING:
+            neighbor = grid.get_node(row + d_row, col + d_col)
+            ring.append(neighbor is not None and grid.is_walkable(neighbor))
+        runs = 0
+        for i in range(8):
+            if ring[i] and not ring[i - 1]: # A run of open cells starts here
+                j, touches = i, False
+                while ring[j % 8] and j < i + 8:
+                    touches = touches or j % 2 == 0
+                    j += 1
+                runs += touches
+        return runs > 1
+
+    # --- Queries ---
+    def may_connect(self, a, b):
+        """
+        False if no path can exist between cells a and b. Walls have no
+        component, so a query from or to one returns True and leaves the
+        answer to the search.
+        """
+        if self.labels is None:
+            self.rebuild()
+        grid, labels = self.grid, self.labels
+        label_a, label_b = labels[grid.index_of(a)], labels[grid.index_of(b)]
+        if label_a == -1 or label_b == -1:
+            return True
+        root = self._find(label_a)
+        if root != self._find(label_b):
+            return False
+        if root not in self.dirty:
+            return True
+        # The component may have split: give a's part a fresh, clean label.
+        # The rest keeps the old (still dirty) one.
+        self.relabels += 1
+        return self._flood(a) == labels[grid.index_of(b)]
+
+# One index per grid, shared by find_path and the visualizer. It is stored on
+# the grid itself: the index refers back to its grid, so a WeakKeyDictionary
+# would keep every grid alive, while a grid <-> index cycle is collected.
+def shared_connectivity(grid):
+    """Returns the connectivity index cached for `grid`, creating it if needed."""
+    index = getattr(grid, "_connectivity", None)
+    if index is None:
+        index = grid._connectivity = ConnectivityIndex(grid)
+    return index
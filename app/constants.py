@@ -1,11 +1,14 @@
 # app/constants.py
 
-import tkinter as tk  # <--- THIS LINE IS THE CRITICAL FIX
+# Kept free of tkinter so the engine can be imported on headless machines.
 
 # --- Grid & Window Dimensions ---
 GRID_ROWS = 25
 GRID_COLS = 40
 CELL_SIZE = 24  # Pixels
+ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48) # Cell sizes the view can zoom through
+RASTER_BELOW = 8 # Below this cell size the view is drawn as one image, not one item per cell
+RASTER_FLUSH_SHARE = 8 # In raster mode, redraw the whole image once 1/this of the view is dirty
 CONTROL_PANEL_WIDTH = 280
 GRID_WIDTH = GRID_COLS * CELL_SIZE
 GRID_HEIGHT = GRID_ROWS * CELL_SIZE
@@ -21,6 +24,7 @@ COLOR_WALL = "#34495E"          # Wet Asphalt (Dark Blue/Grey)
 COLOR_VISITED = "#3498DB"       # Peter River Blue
 COLOR_VISITING = "#85C1E9"      # Lighter Blue for open set
 COLOR_PATH = "#F1C40F"          # Sunflower Yellow
+COLOR_WEIGHT = "#B9770E"        # Mud Brown for weighted (costly) cells
 
 # --- Node States (Enum-style class for clarity and type safety) ---
 class NodeState:
@@ -44,14 +48,20 @@ STATE_COLORS = {
 }
 
 # --- UI & Algorithm Settings ---
-ALGORITHMS = ["A* Search", "Dijkstra", "Breadth-First Search (BFS)", "Depth-First Search (DFS)"]
+ALGORITHMS = ["A* Search", "Dijkstra", "Breadth-First Search (BFS)", "Depth-First Search (DFS)",
+              "Wavefront BFS", "Jump Point Search", "Bidirectional BFS", "Bidirectional A*",
+              "LPA* (Incremental)", "A* + Landmarks (ALT)",
+              "HPA* (Hierarchical)"]
+INCREMENTAL_ALGORITHM = "LPA* (Incremental)" # Keeps replanning as walls are edited
 DEFAULT_ALGORITHM = ALGORITHMS[0]
-DEFAULT_SPEED = 5 # ms delay between animation steps (higher is slower)
+DEFAULT_GENERATOR = "Random Walls" # One of app.generators.GENERATORS
+DEFAULT_SPEED = 200  # Animation speed in search steps per second
+MIN_SPEED = 1        # The speed slider is logarithmic between these
+MAX_SPEED = 100000
+FRAME_INTERVAL = 16  # ms between animation frames (about 60 fps)
+FRAME_BUDGET = 10    # ms of search stepping allowed per frame; the rest is for drawing
+DEFAULT_COST = 1  # Cost of entering a normal cell
+WEIGHT_COST = 5   # Cost of entering a cell painted with the weight tool
+MAX_COST = 255    # Costs are stored one byte per cell
+SQRT2 = 2 ** 0.5  # Cost factor of a diagonal step in 8-connected mode
 
-# --- Class for shared Tkinter variables ---
-# This class needs `tk` to be defined, which is why the import was crucial.
-class TkinterState:
-    def __init__(self):
-        self.tool_var = tk.StringVar(value="start")
-        self.speed_var = tk.DoubleVar(value=DEFAULT_SPEED)
-        self.algorithm_var = tk.StringVar(value=DEFAULT_ALGORITHM)
\ No newline at end of file
@@ -0,0 +1,574 @@
+# app/engine.py
+
+import collections
+import heapq
+from .connectivity import shared_connectivity
+from .hierarchy import shared_cluster_graph
+from .landmarks import shared_landmarks
+from .replanning import lpa_star
+from .result import SearchResult, manhattan, octile, set_path
+from .wavefront import LayerCells, ReachedCells, iter_layers
+from .workspace import borrowed_workspace
+
+# Walkable byte -> ASCII bit, for packing a row of grid.adjacency.open into an int.
+_ASCII_TABLE = b"0" + b"1" * 255
+
+# The engine is the headless half of the project: it never imports tkinter
+# and never writes to Node.state, so any number of searches can run against
+# the same grid (e.g. in server workers) while the visualizer is only one
+# consumer of it.
+#
+# A grid is anything with `get_neighbors(cell)`, `position(cell)` and
+# `cost(cell)` (the cost of stepping onto the cell, an integer >= 1); cells
+# are Node objects for Grid and flat integer indices for CompactGrid.
+# Grids in 8-connected mode (grid.diagonal) also return diagonal
+# neighbours, and a diagonal step costs sqrt(2) times the cell's cost
+# (grid.move_cost). Only the searches in DIAGONAL_SEARCHES handle that.
+#
+# Every search is a generator function `search(grid, start, goal)` that
+# yields one `(closed, opened)` step per expansion -- the cells expanded in
+# that step and the cells newly added to the open set -- and finally returns
+# a SearchResult. Use `find_path` to simply run a search to completion.
+
+# --- Helpers shared by all searches ---
+def _finish(result, grid, came_from, goal):
+    """Fills in the path and cost by backtracking through came_from."""
+    path = []
+    current = goal
+    while current is not None:
+        path.append(current)
+        current = came_from[current]
+    path.reverse()
+    return set_path(result, grid, path)
+
+# --- Search Implementations ---
+
+def a_star(grid, start, goal, heuristic=None):
+    """
+    A* Search guided by the Manhattan distance heuristic (octile distance
+    on 8-connected grids), which stays admissible with weights because
+    every step costs at least 1. Complete and optimal. An admissible
+    `heuristic(cell, goal)` can be passed instead, e.g.
+    DistanceField.heuristic for an exact estimate.
+
+    A cell whose cost improves while it is queued is simply pushed again;
+    the outdated heap entry is skipped when it is popped. Scores and
+    parents live in a borrowed SearchWorkspace, so nothing is allocated
+    or cleared per cell of the grid.
+    """
+    diagonal = grid.diagonal
+    if heuristic is None:
+        distance = octile if diagonal else manhattan
+        heuristic = lambda cell, goal: distance(grid, cell, goal)
+    result = SearchResult("A* Search", start, goal)
+    index_of, cost, move_cost = grid.index_of, grid.cost, grid.move_cost
+    with borrowed_workspace(grid) as workspace:
+        reached = workspace.begin()
+        closed = reached + 1
+        stamps, g_score, parents = workspace.stamps, workspace.scores, workspace.parents
+        index = index_of(start)
+        stamps[index], g_score[index], parents[index] = reached, 0, -1
+        count = 0
+        open_set = [(heuristic(start, goal), count, start)]
+        result.nodes_opened = 1
+
+        while open_set:
+            result.max_open_size = max(result.max_open_size, len(open_set))
+            current = heapq.heappop(open_set)[2]
+            index = index_of(current)
+            if stamps[index] == closed:
+                result.stale_entries += 1
+                continue
+            stamps[index] = closed
+            result.expanded.append(current)
+
+            if current == goal:
+                return set_path(result, grid, workspace.path_to(grid, index))
+
+            g = g_score[index]
+            opened = []
+            for neighbor in grid.get_neighbors(current):
+                n_index = index_of(neighbor)
+                temp_g_score = g + (move_cost(current, neighbor) if diagonal else cost(neighbor))
+                fresh = stamps[n_index] < reached # Not reached yet in this query
+                if fresh or temp_g_score < g_score[n_index]:
+                    if fresh:
+                        stamps[n_index] = reached
+                    g_score[n_index], parents[n_index] = temp_g_score, index
+                    count += 1
+                    heapq.heappush(open_set, (temp_g_score + heuristic(neighbor, goal), count, neighbor))
+                    opened.append(neighbor)
+            result.nodes_opened += len(opened)
+            yield (current,), opened
+    return result
+
+def landmark_a_star(grid, start, goal):
+    """
+    A* with the ALT landmark heuristic (see app/landmarks.py). The landmark
+    tables are built on the first query for a grid and reused by later
+    queries until the walls or costs change.
+    """
+    result = yield from a_star(grid, start, goal, heuristic=shared_landmarks(grid).bound_for(goal))
+    result.algorithm = "A* + Landmarks (ALT)"
+    return result
+
+def hpa_star(grid, start, goal):
+    """
+    Hierarchical A* (HPA*, see app/hierarchy.py). Searches a small graph of
+    cluster entrances and then refines the route inside each cluster, so a
+    long query expands a few hundred abstract nodes. Paths are near-optimal
+    rather than guaranteed shortest. The cluster graph is cached per grid
+    and only edited clusters are rebuilt.
+    """
+    return (yield from shared_cluster_graph(grid).search(start, goal))
+
+def dijkstra(grid, start, goal):
+    """
+    Dijkstra's Algorithm on the weighted grid. Cell costs are small integers,
+    so instead of a binary heap it uses Dial's bucket queue: max_cost + 1
+    circular buckets, one per pending distance. Every pending distance lies
+    in [d, d + max_cost], so the buckets never mix two distances and each
+    push/pop is O(1). Distances and parents live in a borrowed
+    SearchWorkspace, as in a_star.
+    """
+    if grid.diagonal:
+        # Diagonal steps cost sqrt(2) and would not fit the integer
+        # buckets; A* with a zero heuristic is Dijkstra on a binary heap.
+        result = yield from a_star(grid, start, goal, heuristic=lambda cell, goal: 0)
+        result.algorithm = "Dijkstra"
+        return result
+    result = SearchResult("Dijkstra", start, goal)
+    index_of, cost = grid.index_of, grid.cost
+    span = grid.max_cost() + 1
+    with borrowed_workspace(grid) as workspace:
+        reached = workspace.begin()
+        closed = reached + 1
+        stamps, distances, parents = workspace.stamps, workspace.scores, workspace.parents
+        index = index_of(start)
+        stamps[index], distances[index], parents[index] = reached, 0, -1
+        buckets = [[] for _ in range(span)]
+        buckets[0].append(start)
+        pending = 1 # Entries in the buckets, including outdated ones
+        dist = 0
+        result.nodes_opened = 1
+
+        while pending:
+            bucket = buckets[dist % span]
+            if not bucket:
+                dist += 1
+                continue
+            result.max_open_size = max(result.max_open_size, pending)
+            current = bucket.pop()
+            pending -= 1
+            index = index_of(current)
+            if stamps[index] == closed: # Outdated entry; the cell was reached cheaper
+                result.stale_entries += 1
+                continue
+            stamps[index] = closed
+            result.expanded.append(current)
+
+            if current == goal:
+                return set_path(result, grid, workspace.path_to(grid, index))
+
+            opened = []
+            for neighbor in grid.get_neighbors(current):
+                new_dist = dist + cost(neighbor)
+                n_index = index_of(neighbor)
+                fresh = stamps[n_index] < reached # Not reached yet in this query
+                if fresh or new_dist < distances[n_index]:
+                    if fresh:
+                        stamps[n_index] = reached
+                    distances[n_index], parents[n_index] = new_dist, index
+                    buckets[new_dist % span].append(neighbor)
+                    opened.append(neighbor)
+            pending += len(opened)
+            result.nodes_opened += len(opened)
+            yield (current,), opened
+    return result
+
+def breadth_first_search(grid, start, goal):
+    """
+    Breadth-First Search. Fewest steps; ignores cell costs, so the path is
+    only the cheapest on an unweighted grid.
+    """
+    result = SearchResult("Breadth-First Search (BFS)", start, goal)
+    queue = collections.deque([start])
+    came_from = {start: None}
+    result.nodes_opened = 1
+
+    while queue:
+        result.max_open_size = max(result.max_open_size, len(queue))
+        current = queue.popleft()
+        result.expanded.append(current)
+
+        if current == goal:
+            return _finish(result, grid, came_from, goal)
+
+        opened = []
+        for neighbor in grid.get_neighbors(current):
+            if neighbor not in came_from:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+                opened.append(neighbor)
+        result.nodes_opened += len(opened)
+        yield (current,), opened
+    return result
+
+def depth_first_search(grid, start, goal):
+    """Depth-First Search. Finds a path, but not necessarily the shortest."""
+    result = SearchResult("Depth-First Search (DFS)", start, goal)
+    stack = [start]
+    came_from = {start: None}
+    result.nodes_opened = 1
+
+    while stack:
+        result.max_open_size = max(result.max_open_size, len(stack))
+        current = stack.pop()
+        result.expanded.append(current)
+
+        if current == goal:
+            return _finish(result, grid, came_from, goal)
+
+        opened = []
+        for neighbor in reversed(grid.get_neighbors(current)): # Reverse for more intuitive visualization
+            if neighbor not in came_from:
+                came_from[neighbor] = current
+                stack.append(neighbor)
+                opened.append(neighbor)
+        result.nodes_opened += len(opened)
+        yield (current,), opened
+    return result
+
+def jump_point_search(grid, start, goal):
+    """
+    Jump Point Search for the 4-connected unit-cost grid. Among equally short
+    paths it only follows canonical ones (vertical runs, scanning sideways at
+    every cell), so straight runs are "jumped" instead of pushed onto the
+    heap one cell at a time. Only jump points are expanded; the returned
+    path is the same length as A*'s. Cell costs are ignored while searching
+    (the pruning is only valid for uniform costs).
+
+    Walkability is read straight from grid.adjacency.open. The sideways
+    scans, which run at every row of every vertical jump, work on one
+    big-int bitmask per row (bit c for column c) that marks where a scan
+    stops, so each scan is a few integer operations instead of a walk.
+    Scores and parents live in a borrowed SearchWorkspace, as in a_star.
+    """
+    result = SearchResult("Jump Point Search", start, goal)
+    rows, cols = grid.rows, grid.cols
+    is_open = grid.adjacency.open
+
+    def free(row, col):
+        return 0 <= row < rows and 0 <= col < cols and is_open[row * cols + col]
+
+    goal_row, goal_col = grid.position(goal)
+    edge = 1 << cols # Marks the right edge in the rightward stop masks
+    stops = {} # row -> (rightward stops, leftward stops), built on first use
+
+    def row_bits(row):
+        if not 0 <= row < rows:
+            return 0
+        return int(is_open[row * cols:(row + 1) * cols].translate(_ASCII_TABLE)[::-1], 2)
+
+    def row_stops(row):
+        """Where sideways scans along `row` stop: at walls, and at cells with a forced turn."""
+        if row not in stops:
+            here, above, below = row_bits(row), row_bits(row - 1), row_bits(row + 1)
+            walls = (edge - 1) & ~here
+            # A turn is forced where the cell above (below) opens up after a wall.
+            right = walls | edge | (above & ~(above << 1)) | (below & ~(below << 1))
+            left = walls | (above & ~(above >> 1)) | (below & ~(below >> 1))
+            stops[row] = right, left
+        return stops[row]
+
+    def jump_horizontal(row, col, d_col):
+        """Scans sideways; stops at the goal or a cell with a forced turn."""
+        right, left = row_stops(row)
+        if d_col > 0:
+            ahead = right >> (col + 1)
+            stop = col + (ahead & -ahead).bit_length() # The lowest stop bit past col
+            if row == goal_row and col < goal_col < stop:
+                return goal_row, goal_col
+        else:
+            stop = (left & ((1 << col) - 1)).bit_length() - 1 # -1 for the left edge
+            if row == goal_row and stop < goal_col < col:
+                return goal_row, goal_col
+        return (row, stop) if free(row, stop) else None
+
+    def jump_vertical(row, col, d_row):
+        """Moves up/down; stops where a sideways scan finds a jump point."""
+        while True:
+            row += d_row
+            if not free(row, col):
+                return None
+            if (row, col) == (goal_row, goal_col):
+                return row, col
+            if jump_horizontal(row, col, 1) or jump_horizontal(row, col, -1):
+                return row, col
+
+    def successors(row, col, parent):
+        if parent == -1: # The start node scans in all four directions
+            jumps = [jump_horizontal(row, col, 1), jump_horizontal(row, col, -1),
+                     jump_vertical(row, col, 1), jump_vertical(row, col, -1)]
+        elif parent // cols == row: # Reached horizontally: keep going, plus forced turns
+            d_col = 1 if col > parent % cols else -1
+            jumps = [jump_horizontal(row, col, d_col)]
+            for d_row in (-1, 1):
+                if free(row + d_row, col) and not free(row + d_row, col - d_col):
+                    jumps.append(jump_vertical(row, col, d_row))
+        else: # Reached vertically: keep going and scan both ways
+            d_row = 1 if row > parent // cols else -1
+            jumps = [jump_vertical(row, col, d_row), jump_horizontal(row, col, 1), jump_horizontal(row, col, -1)]
+        return [jump for jump in jumps if jump]
+
+    cell_at = grid.cell_at
+    goal_index = goal_row * cols + goal_col
+    with borrowed_workspace(grid) as workspace:
+        reached = workspace.begin()
+        closed = reached + 1
+        stamps, g_score, parents = workspace.stamps, workspace.scores, workspace.parents
+        index = grid.index_of(start)
+        stamps[index], g_score[index], parents[index] = reached, 0, -1
+        row, col = divmod(index, cols)
+        count = 0
+        open_set = [(abs(row - goal_row) + abs(col - goal_col), count, index)]
+        result.nodes_opened = 1
+
+        while open_set:
+            result.max_open_size = max(result.max_open_size, len(open_set))
+            index = heapq.heappop(open_set)[2]
+            if stamps[index] == closed:
+                result.stale_entries += 1
+                continue
+            stamps[index] = closed
+            current = cell_at(index)
+            result.expanded.append(current)
+
+            if index == goal_index:
+                # Fill in the straight segments between consecutive jump points.
+                points = []
+                while index != -1:
+                    points.append(index)
+                    index = parents[index]
+                points.reverse()
+                path = [start]
+                for at, end in zip(points, points[1:]):
+                    step = (1 if at // cols == end // cols else cols) * (1 if end > at else -1)
+                    while at != end:
+                        at += step
+                        path.append(cell_at(at))
+                return set_path(result, grid, path)
+
+            row, col = divmod(index, cols)
+            g = g_score[index]
+            opened = []
+            for jump_row, jump_col in successors(row, col, parents[index]):
+                jump = jump_row * cols + jump_col
+                temp_g_score = g + abs(jump_row - row) + abs(jump_col - col)
+                fresh = stamps[jump] < reached
+                if fresh or temp_g_score < g_score[jump]:
+                    if fresh:
+                        stamps[jump] = reached
+                    g_score[jump], parents[jump] = temp_g_score, index
+                    count += 1
+                    h = abs(jump_row - goal_row) + abs(jump_col - goal_col)
+                    heapq.heappush(open_set, (temp_g_score + h, count, jump))
+                    opened.append(cell_at(jump))
+            result.nodes_opened += len(opened)
+            yield (current,), opened
+    return result
+
+def _join(result, grid, forward, backward, meet):
+    """Builds the path through `meet` from the two parent maps."""
+    path = []
+    current = meet
+    while current is not None:
+        path.append(current)
+        current = forward[current]
+    path.reverse()
+    current = backward[meet]
+    while current is not None:
+        path.append(current)
+        current = backward[current]
+    return set_path(result, grid, path)
+
+def bidirectional_bfs(grid, start, goal):
+    """
+    Meet-in-the-middle BFS. Grows one full layer at a time from whichever
+    side has the smaller frontier, and stops at the first cell reached from
+    both sides. The two balls were disjoint before this layer, so that first
+    meeting already gives a path with the fewest steps (cell costs are
+    ignored, as in BFS).
+    """
+    result = SearchResult("Bidirectional BFS", start, goal)
+    if not (grid.is_walkable(start) and grid.is_walkable(goal)):
+        return result # The backward side would set off from a wall
+    forward, backward = {start: None}, {goal: None}
+    fringes = {True: [start], False: [goal]}
+    result.nodes_opened = 2 if start != goal else 1
+    if start == goal:
+        result.expanded.append(start)
+        return _join(result, grid, forward, backward, start)
+
+    while fringes[True] and fringes[False]:
+        is_forward = len(fringes[True]) <= len(fringes[False])
+        seen, other = (forward, backward) if is_forward else (backward, forward)
+        result.max_open_size = max(result.max_open_size, len(fringes[True]) + len(fringes[False]))
+        next_fringe = []
+        for current in fringes[is_forward]:
+            result.expanded.append(current)
+            opened = []
+            for neighbor in grid.get_neighbors(current):
+                if neighbor in seen:
+                    continue
+                seen[neighbor] = current
+                if neighbor in other:
+                    result.nodes_opened += len(opened)
+                    yield (current,), opened
+                    return _join(result, grid, forward, backward, neighbor)
+                next_fringe.append(neighbor)
+                opened.append(neighbor)
+            result.nodes_opened += len(opened)
+            yield (current,), opened
+        fringes[is_forward] = next_fringe
+    return result
+
+def bidirectional_a_star(grid, start, goal):
+    """
+    Bidirectional A*: a forward search towards the goal and a backward search
+    towards the start, each guided by Manhattan distance. The backward search
+    walks edges in reverse, so stepping from a cell to its neighbor costs the
+    cell's own cost, and g_forward + g_backward at a shared cell is the full
+    start-to-goal cost. The searches take
+    turns; mu is the best start-to-goal cost seen where they touch. It
+    stops once the smallest f on either open set is at least mu. No path
+    cheaper than mu can remain, because any such path would keep a node
+    with f below mu on both open sets.
+    """
+    result = SearchResult("Bidirectional A*", start, goal)
+    if not (grid.is_walkable(start) and grid.is_walkable(goal)):
+        return result # The backward side would set off from a wall
+    targets = {True: goal, False: start}
+    open_sets = {True: [(manhattan(grid, start, goal), 0, start)],
+                 False: [(manhattan(grid, goal, start), 1, goal)]}
+    g_scores = {True: {start: 0}, False: {goal: 0}}
+    parents = {True: {start: None}, False: {goal: None}}
+    closed = {True: set(), False: set()}
+    count = 1
+    best, meet = float("inf"), None
+    if start == goal:
+        best, meet = 0, start
+    result.nodes_opened = 2
+
+    while open_sets[True] and open_sets[False]:
+        for side in (True, False): # Drop entries of already-closed cells
+            heap = open_sets[side]
+            while heap and heap[0][2] in closed[side]:
+                heapq.heappop(heap)
+                result.stale_entries += 1
+        if not open_sets[True] or not open_sets[False]:
+            break
+        if open_sets[True][0][0] >= best or open_sets[False][0][0] >= best:
+            break
+        result.max_open_size = max(result.max_open_size, len(open_sets[True]) + len(open_sets[False]))
+
+        side = len(open_sets[True]) <= len(open_sets[False])
+        g_score, other_g = g_scores[side], g_scores[not side]
+        current = heapq.heappop(open_sets[side])[2]
+        closed[side].add(current)
+        result.expanded.append(current)
+
+        opened = []
+        step_cost = None if side else grid.cost(current)
+        for neighbor in grid.get_neighbors(current):
+            temp_g_score = g_score[current] + (grid.cost(neighbor) if side else step_cost)
+            if temp_g_score < g_score.get(neighbor, float("inf")):
+                g_score[neighbor] = temp_g_score
+                parents[side][neighbor] = current
+                count += 1
+                f = temp_g_score + manhattan(grid, neighbor, targets[side])
+                heapq.heappush(open_sets[side], (f, count, neighbor))
+                opened.append(neighbor)
+                if neighbor in other_g and temp_g_score + other_g[neighbor] < best:
+                    best, meet = temp_g_score + other_g[neighbor], neighbor
+        result.nodes_opened += len(opened)
+        yield (current,), opened
+
+    if meet is None:
+        return result
+    return _join(result, grid, parents[True], parents[False], meet)
+
+def wavefront_search(grid, start, goal):
+    """
+    Bit-parallel BFS (see app/wavefront.py). Each step expands a whole layer
+    at once; the path is read off the resulting distance field. Like BFS it
+    minimises steps and ignores cell costs. Steps and the result hold the
+    layers as LayerCells/ReachedCells, so cells are only decoded by callers
+    that iterate over them.
+    """
+    result = SearchResult("Wavefront BFS", start, goal)
+    previous, reached = (), 0
+    for field, layer in iter_layers(grid, start, goal):
+        size, reached = field.reached - reached, field.reached
+        result.nodes_opened += size
+        result.max_open_size = max(result.max_open_size, size)
+        cells = LayerCells(field, layer)
+        yield previous, cells
+        previous = cells
+    result.expanded = ReachedCells(field)
+    return set_path(result, grid, field.path_to(goal))
+
+# Map algorithm names (the same names the visualizer shows) to searches
+SEARCHES = {
+    "A* Search": a_star,
+    "Dijkstra": dijkstra,
+    "Breadth-First Search (BFS)": breadth_first_search,
+    "Depth-First Search (DFS)": depth_first_search,
+    "Wavefront BFS": wavefront_search,
+    "Jump Point Search": jump_point_search,
+    "Bidirectional BFS": bidirectional_bfs,
+    "Bidirectional A*": bidirectional_a_star,
+    "LPA* (Incremental)": lpa_star,
+    "A* + Landmarks (ALT)": landmark_a_star,
+    "HPA* (Hierarchical)": hpa_star,
+}
+
+# Searches that are correct on 8-connected grids. The others assume
+# 4-connected movement: their heuristics, pruning rules or precomputed
+# tables would give wrong or non-optimal paths.
+DIAGONAL_SEARCHES = {"A* Search", "Dijkstra", "Breadth-First Search (BFS)",
+                     "Depth-First Search (DFS)", "Bidirectional BFS"}
+
+# --- Public API ---
+
+def check_movement(grid, algorithm):
+    """Raises ValueError if `algorithm` (a name) cannot run on the grid's movement mode."""
+    if grid.diagonal and isinstance(algorithm, str) and algorithm not in DIAGONAL_SEARCHES:
+        raise ValueError(f"{algorithm} only supports 4-connected movement")
+
+def run_search(steps):
+    """Drives a search generator to completion and returns its SearchResult."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def find_path(grid, start, goal, algorithm="A* Search", precheck=True, **options):
+    """
+    Runs `algorithm` (a name from SEARCHES or a search function) from
+    `start` to `goal` on `grid` and returns a SearchResult. Extra keyword
+    options are passed on to the search. The grid is only read, never
+    modified. Endpoints in different connected components return an empty
+    result straight away, without searching. Raises ValueError for an
+    algorithm that does not support the grid's movement mode.
+
+    The component check labels the whole grid the first time it runs after
+    a bulk change. For a single query that can cost more than the search,
+    so pass precheck=False to skip it.
+    """
+    check_movement(grid, algorithm)
+    search = SEARCHES[algorithm] if isinstance(algorithm, str) else algorithm
+    if precheck and not shared_connectivity(grid).may_connect(start, goal):
+        return SearchResult(algorithm if isinstance(algorithm, str) else search.__name__, start, goal)
+    return run_search(search(grid, start, goal, **options))
@@ -0,0 +1,276 @@
+# app/generators.py
+
+import random
+from array import array
+from .constants import NodeState
+
+# Seeded map generators. Each takes (rows, cols, rng) and returns a bytearray
+# with one NodeState (EMPTY or WALL) per cell in row-major order; generate()
+# writes that into a grid with set_walls.
+#
+# - Mazes carve passages between the cells at odd (row, col); the wall
+#   between two neighbouring maze cells is at their midpoint. The recursive
+#   backtracker, Kruskal and Prim need a decision per maze cell (Kruskal one
+#   per wall), so they run a Python loop iteration per cell and take
+#   seconds on maps of a few million cells. Sidewinder decides a whole row
+#   with bytes operations and only loops once per run of cells, which makes
+#   it the one to use for very large maps.
+# - Rooms and corridors are carved with slice assignments, one per room row
+#   or corridor leg.
+# - Caves run the cellular automaton on the whole map at once as big-int bit
+#   masks (the same packing as app/wavefront.py).
+
+EMPTY, WALL = NodeState.EMPTY, NodeState.WALL
+# Random byte -> EMPTY or WALL with even odds.
+_COIN = bytes(EMPTY if b < 128 else WALL for b in range(256))
+
+def _maze_cells(rows, cols):
+    """
+    All-wall cells plus a mask of the maze cells (odd row and column, with
+    a wall border kept on every side). The mask has 2*cols zero bytes of
+    padding at the end, so neighbour lookups at +-2 and +-2*cols never need
+    a bounds check (negative indices land in the last row, which is never
+    a maze cell).
+    """
+    cells = bytearray([WALL]) * (rows * cols)
+    mask = bytearray(rows * cols + 2 * cols)
+    if rows >= 3 and cols >= 3:
+        row_mask = bytearray(cols)
+        row_mask[1:cols - 1:2] = b"\x01" * len(range(1, cols - 1, 2))
+        for row in range(1, rows - 1, 2):
+            mask[row * cols:(row + 1) * cols] = row_mask
+    return cells, mask
+
+def random_walls(rows, cols, rng, density=0.25):
+    """Independent noise: each cell is a wall with probability `density`."""
+    cutoff = int(density * 256)
+    table = bytes(WALL if b < cutoff else EMPTY for b in range(256))
+    return bytearray(rng.randbytes(rows * cols).translate(table))
+
+def recursive_backtracker(rows, cols, rng):
+    """
+    Depth-first maze: long, winding corridors with few branches. Uses an
+    explicit stack, so it never runs out of recursion depth, but it takes a
+    Python loop iteration per maze cell.
+    """
+    cells, free = _maze_cells(rows, cols)
+    cell = free.find(1)
+    if cell < 0:
+        return cells
+    down = 2 * cols
+    random_ = rng.random
+    stack = []
+    push, pop = stack.append, stack.pop
+    cells[cell] = EMPTY
+    free[cell] = 0
+    while True:
+        options = []
+        if free[cell + 2]: options.append(cell + 2)
+        if free[cell - 2]: options.append(cell - 2)
+        if free[cell + down]: options.append(cell + down)
+        if free[cell - down]: options.append(cell - down)
+        if options:
+            nxt = options[int(random_() * len(options))]
+            free[nxt] = 0
+            cells[nxt] = cells[(cell + nxt) >> 1] = EMPTY
+            push(cell)
+            cell = nxt
+        elif stack:
+            cell = pop()
+        else:
+            return cells
+
+def kruskal(rows, cols, rng):
+    """
+    Randomized Kruskal: knocks down walls in random order whenever they
+    separate two unconnected regions. Many short dead ends. Shuffles and
+    walks every wall in Python, so it is the slowest maze on big maps.
+    """
+    cells = bytearray([WALL]) * (rows * cols)
+    height, width = (rows - 1) // 2, (cols - 1) // 2 # Maze cells, numbered k = i * width + j
+    if height < 1 or width < 1:
+        return cells
+    for i in range(height):
+        row = (2 * i + 1) * cols
+        cells[row + 1:row + 2 * width:2] = bytes(width)
+    # Wall k joins k and k + 1; wall -k - 1 joins k and k + width.
+    walls = [k for k in range(height * width) if k % width != width - 1]
+    walls += [-k - 1 for k in range((height - 1) * width)]
+    rng.shuffle(walls)
+    parent = array("i", range(height * width))
+    for wall in walls:
+        a, b = (wall, wall + 1) if wall >= 0 else (-wall - 1, -wall - 1 + width)
+        root_a = a
+        while parent[root_a] != root_a:
+            parent[root_a] = root_a = parent[parent[root_a]] # Path halving
+        root_b = b
+        while parent[root_b] != root_b:
+            parent[root_b] = root_b = parent[parent[root_b]]
+        if root_a != root_b:
+            parent[root_a] = root_b
+            i, j = divmod(a, width)
+            # The wall cell sits between the two maze cells.
+            cells[(2 * i + 1) * cols + 2 * j + 1 + (1 if wall >= 0 else cols)] = EMPTY
+    return cells
+
+def prim(rows, cols, rng):
+    """
+    Randomized Prim: grows the maze from one cell by opening a random wall
+    on its frontier. Short, bushy branches radiating from the start. One
+    Python loop iteration per frontier entry.
+    """
+    cells, free = _maze_cells(rows, cols)
+    cell = free.find(1)
+    if cell < 0:
+        return cells
+    down = 2 * cols
+    random_ = rng.random
+    frontier = []  # (maze cell, neighbour already in the maze)
+    push, pop = frontier.append, frontier.pop
+    while True:
+        cells[cell] = EMPTY
+        free[cell] = 0
+        if free[cell + 2]: push((cell + 2, cell))
+        if free[cell - 2]: push((cell - 2, cell))
+        if free[cell + down]: push((cell + down, cell))
+        if free[cell - down]: push((cell - down, cell))
+        while frontier:
+            # Take a random entry: swap it with the last one and pop.
+            i = int(random_() * len(frontier))
+            entry = pop()
+            if i < len(frontier):
+                entry, frontier[i] = frontier[i], entry
+            cell, via = entry
+            if free[cell]:
+                cells[(cell + via) >> 1] = EMPTY
+                break
+        else:
+            return cells
+
+def sidewinder(rows, cols, rng):
+    """
+    Sidewinder: the top row is one corridor. Every later row is cut into
+    runs of cells joined east-west, and each run opens one passage north at
+    a random cell. Passages lean north-south and the top edge is straight,
+    but each row is carved with a few bytes operations plus one Python
+    step per run, so it is fast on very large maps.
+    """
+    cells = bytearray([WALL]) * (rows * cols)
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    if height < 1 or width < 1:
+        return cells
+    cells[cols + 1:cols + 2 * width] = bytes(2 * width - 1)
+    random_ = rng.random
+    for i in range(1, height):
+        row = (2 * i + 1) * cols
+        cells[row + 1:row + 2 * width:2] = bytes(width)
+        # gaps[j] is the wall between maze cells j and j + 1; a closed one ends a run.
+        gaps = rng.randbytes(width - 1).translate(_COIN)
+        cells[row + 2:row + 2 * width - 1:2] = gaps
+        first = 0
+        while first < width:
+            last = gaps.find(WALL, first)
+            if last < 0:
+                last = width - 1
+            j = first + int(random_() * (last - first + 1))
+            cells[row - cols + 2 * j + 1] = EMPTY # Up into the row above
+            first = last + 1
+    return cells
+
+def rooms_and_corridors(rows, cols, rng, room_min=4, room_max=12):
+    """
+    Rectangular rooms scattered over a wall-filled map, chained together by
+    L-shaped corridors in a serpentine order so corridors stay short.
+    """
+    cells = bytearray([WALL]) * (rows * cols)
+    if rows < room_min + 2 or cols < room_min + 2:
+        return cells
+    count = max(2, rows * cols // (room_max * room_max * 3))
+    band = room_max * 3
+    rooms = []
+    for _ in range(count):
+        height, width = rng.randint(room_min, room_max), rng.randint(room_min, room_max)
+        height, width = min(height, rows - 2), min(width, cols - 2)
+        top, left = rng.randint(1, rows - height - 1), rng.randint(1, cols - width - 1)
+        for row in range(top, top + height):
+            cells[row * cols + left:row * cols + left + width] = bytes(width)
+        rooms.append((top + height // 2, left + width // 2))
+    # Serpentine order: bands of rows, alternating left-to-right and back.
+    rooms.sort(key=lambda c: (c[0] // band, c[1] if c[0] // band % 2 == 0 else -c[1]))
+    for (row1, col1), (row2, col2) in zip(rooms, rooms[1:]):
+        if rng.random() < 0.5: # Horizontal leg first
+            corner = (row1, col2)
+        else:
+            corner = (row2, col1)
+        for (a_row, a_col), (b_row, b_col) in (((row1, col1), corner), (corner, (row2, col2))):
+            if a_row == b_row:
+                low, high = sorted((a_col, b_col))
+                cells[a_row * cols + low:a_row * cols + high + 1] = bytes(high - low + 1)
+            else:
+                low, high = sorted((a_row, b_row))
+                cells[low * cols + a_col:high * cols + a_col + 1:cols] = bytes(high - low + 1)
+    return cells
+
+def caves(rows, cols, rng, fill=0.45, iterations=4):
+    """
+    Cellular-automaton caves: random noise smoothed by the 4-5 rule (a cell
+    becomes a wall with 5 or more wall neighbours, and stays one with 4).
+    The map border counts as wall. Each iteration runs over the whole map
+    as a few dozen big-int operations.
+    """
+    width = cols + 1
+    # A pad column per row, a pad row below and two above: row 0's left
+    # neighbours are the pad column ending the row above it, so the up-left
+    # neighbour of cell (0, 0) is the last bit of the first pad row.
+    total = (rows + 3) * width
+    # ASCII "1" = wall. int(..., 2) reads the most significant bit first, so
+    # the text is built back to front.
+    cutoff = int(fill * 256)
+    noise = rng.randbytes(rows * cols).translate(bytes(49 if b < cutoff else 48 for b in range(256)))
+    pad_row = b"1" * width
+    text = pad_row * 2 + b"".join(noise[start:start + cols] + b"1" for start in range(0, rows * cols, cols)) + pad_row
+    walls = int(text[::-1], 2)
+    zero_row = b"0" * width
+    inner = int((zero_row * 2 + (b"1" * cols + b"0") * rows + zero_row)[::-1], 2) # The real cells
+    pad = ((1 << total) - 1) ^ inner
+
+    for _ in range(iterations):
+        shifted = [walls << 1, walls >> 1, walls << width, walls >> width,
+                   walls << (width + 1), walls >> (width + 1), walls << (width - 1), walls >> (width - 1)]
+        # Bit-sliced 8-input counter from full adders.
+        n1, n2, n3, n4, n5, n6, n7, n8 = shifted
+        sum_a, carry_a = n1 ^ n2 ^ n3, (n1 & n2) | (n3 & (n1 ^ n2))
+        sum_b, carry_b = n4 ^ n5 ^ n6, (n4 & n5) | (n6 & (n4 ^ n5))
+        sum_c, carry_c = n7 ^ n8, n7 & n8
+        bit0, carry_1 = sum_a ^ sum_b ^ sum_c, (sum_a & sum_b) | (sum_c & (sum_a ^ sum_b))
+        twos, fours_a = carry_a ^ carry_b ^ carry_c, (carry_a & carry_b) | (carry_c & (carry_a ^ carry_b))
+        bit1, fours_b = twos ^ carry_1, twos & carry_1
+        bit2, bit3 = fours_a ^ fours_b, fours_a & fours_b
+        at_least_4 = bit2 | bit3
+        at_least_5 = bit3 | (bit2 & (bit0 | bit1))
+        walls = ((at_least_5 | (walls & at_least_4)) & inner) | pad
+
+    text = format(walls, "b").zfill(total)[::-1].encode()
+    table = bytes(WALL if b == 49 else EMPTY for b in range(256))
+    body = b"".join(text[(row + 2) * width:(row + 2) * width + cols] for row in range(rows))
+    return bytearray(body.translate(table))
+
+# Generator names, as offered by the control panel and app.bench --generator.
+GENERATORS = {
+    "Random Walls": random_walls,
+    "Recursive Backtracker": recursive_backtracker,
+    "Kruskal": kruskal,
+    "Prim": prim,
+    "Sidewinder": sidewinder,
+    "Rooms & Corridors": rooms_and_corridors,
+    "Caves": caves,
+}
+
+def generate(grid, name="Random Walls", seed=None, **options):
+    """
+    Fills `grid` (Grid or CompactGrid) with the named generator. The same
+    seed and grid size always give the same map.
+    """
+    rng = random.Random(seed)
+    grid.set_walls(GENERATORS[name](grid.rows, grid.cols, rng, **options))
+    return grid
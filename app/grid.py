@@ -1,20 +1,121 @@
 import random
 from .node import Node
-from .constants import GRID_ROWS, GRID_COLS, NodeState
+from .adjacency import Adjacency
+from .generators import random_walls
+from .constants import GRID_ROWS, GRID_COLS, NodeState, DEFAULT_COST, MAX_COST, SQRT2
+
+# The search overlay states that clear_path removes.
+_PAINTED_STATES = (NodeState.VISITING, NodeState.VISITED, NodeState.PATH)
+
+# Cell state -> 1 if walkable, for building the adjacency table.
+_WALKABLE_TABLE = bytes(0 if state == NodeState.WALL else 1 for state in range(256))
 
 class Grid:
     """Manages the 2D array of nodes, their states, and grid-wide operations."""
-    def __init__(self):
-        self.nodes = [[Node(row, col) for col in range(GRID_COLS)] for row in range(GRID_ROWS)]
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS, diagonal=False):
+        self.rows = rows
+        self.cols = cols
+        # Nodes whose state changed since the renderer last drew them.
+        self.dirty = set()
+        self.nodes = [[Node(row, col, self._node_changed) for col in range(cols)] for row in range(rows)]
+        self._flat = [node for row in self.nodes for node in row] # Nodes by flat index
+        # Precomputed moves per cell; see app/adjacency.py.
+        self.adjacency = Adjacency(rows, cols)
+        self.diagonal = diagonal # 8-connected movement
+        self._moves = self.adjacency.neighbor_table(diagonal)
+        # Cost of entering each cell, one byte per cell (row-major).
+        self.weights = bytearray([DEFAULT_COST]) * (rows * cols)
+        self._max_cost = DEFAULT_COST # None when it needs recomputing
+        # Nodes painted VISITING/VISITED/PATH since the last clear_path.
+        self.painted = set()
         self.start_node = None
         self.end_node = None
+        # Terrain (walls and costs) bookkeeping for caches built on the grid.
+        self.version = 0
+        self._watchers = []
+        self._bulk = False # Set while set_walls or clear_all rewrites the grid
+
+    def _node_changed(self, node, old_state):
+        """Called by a Node whenever its state changes."""
+        self.dirty.add(node)
+        if node.state in _PAINTED_STATES:
+            self.painted.add(node)
+        if (old_state == NodeState.WALL) != (node.state == NodeState.WALL) and not self._bulk:
+            self.adjacency.set_walkable(node.row * self.cols + node.col, node.state != NodeState.WALL)
+            self._terrain_changed(node)
+
+    def watch(self, callback):
+        """
+        Registers callback(node), called whenever a node becomes or stops
+        being a wall, or its cost changes. Switching the movement mode
+        calls it with None.
+        """
+        self._watchers.append(callback)
+
+    def unwatch(self, callback):
+        self._watchers.remove(callback)
+
+    def _terrain_changed(self, node):
+        self.version += 1
+        if self._bulk:
+            return # Told once, when the bulk change is done
+        for callback in self._watchers:
+            callback(node)
 
     def get_node(self, row, col):
         """Safely retrieves a node from the grid."""
-        if 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS:
+        if 0 <= row < self.rows and 0 <= col < self.cols:
             return self.nodes[row][col]
         return None
 
+    def is_walkable(self, node):
+        return node.is_walkable()
+
+    def position(self, node):
+        """Returns (row, col) of a node. CompactGrid offers the same for indices."""
+        return node.row, node.col
+
+    def index_of(self, node):
+        """Flat row-major index of a node, for per-cell arrays."""
+        return node.row * self.cols + node.col
+
+    def cell_at(self, index):
+        """Inverse of index_of."""
+        return self._flat[index]
+
+    def cost(self, node):
+        """The cost of stepping onto `node`."""
+        return self.weights[node.row * self.cols + node.col]
+
+    def move_cost(self, node, neighbor):
+        """The cost of moving from `node` to `neighbor`: diagonal steps cost sqrt(2) times as much."""
+        cost = self.weights[neighbor.row * self.cols + neighbor.col]
+        return cost * SQRT2 if node.row != neighbor.row and node.col != neighbor.col else cost
+
+    def set_diagonal(self, diagonal):
+        """Switches between 4- and 8-connected movement."""
+        if diagonal != self.diagonal:
+            self.diagonal = diagonal
+            self._moves = self.adjacency.neighbor_table(diagonal)
+            self._terrain_changed(None) # Every cached distance is off now
+
+    def max_cost(self):
+        """The highest cell cost, cached until a cost changes."""
+        if self._max_cost is None:
+            self._max_cost = max(self.weights)
+        return self._max_cost
+
+    def set_weight(self, node, cost):
+        """Sets the cost of stepping onto `node` (1 to MAX_COST)."""
+        if not DEFAULT_COST <= cost <= MAX_COST:
+            raise ValueError(f"cell cost must be between {DEFAULT_COST} and {MAX_COST}, got {cost}")
+        index = node.row * self.cols + node.col
+        if self.weights[index] != cost:
+            self.weights[index] = cost
+            self._max_cost = None
+            self.dirty.add(node)
+            self._terrain_changed(node)
+
     def _set_node_as(self, node, new_state_attr, old_node_attr):
         """Helper to set start/end nodes and reset the old ones."""
         old_node = getattr(self, old_node_attr)
@@ -32,35 +133,69 @@ class Grid:
         self._set_node_as(node, "end", "end_node")
 
     def clear_path(self):
-        """Resets the grid but keeps walls, start, and end points."""
-        for row in self.nodes:
-            for node in row:
-                node.reset(keep_essentials=True)
+        """
+        Resets the grid but keeps walls, start, and end points. Only the
+        nodes painted since the last call are visited.
+        """
+        painted, self.painted = self.painted, set()
+        for node in painted:
+            node.reset(keep_essentials=True)
 
     def clear_all(self):
-        """Resets the entire grid to its initial state."""
+        """
+        Resets the entire grid to its initial state. Watchers are told
+        once, with None.
+        """
         self.start_node = None
         self.end_node = None
-        for row in self.nodes:
-            for node in row:
+        self.painted = set()
+        bulk, self._bulk = self._bulk, True # set_walls calls this mid-bulk
+        try:
+            for node in self._flat:
                 node.reset(keep_essentials=False)
+        finally:
+            self._bulk = bulk
+        weights, flat = self.weights, self._flat
+        for index in range(len(weights)):
+            if weights[index] != DEFAULT_COST:
+                self.dirty.add(flat[index])
+        self.weights = bytearray([DEFAULT_COST]) * len(weights)
+        self._max_cost = DEFAULT_COST
+        if not bulk:
+            self.adjacency.rebuild(bytes([1]) * len(weights))
+            self._terrain_changed(None)
 
     def get_neighbors(self, node):
-        """Returns valid neighbors (up, down, left, right)."""
-        neighbors = []
-        row, col = node.row, node.col
-        # No diagonal movement as per MVP
-        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            neighbor_row, neighbor_col = row + dr, col + dc
-            neighbor = self.get_node(neighbor_row, neighbor_col)
-            if neighbor and neighbor.is_walkable():
-                neighbors.append(neighbor)
-        return neighbors
+        """
+        Returns the walkable neighbors (right, left, down, up, then the
+        diagonals in 8-connected mode), read from the adjacency table.
+        """
+        index = node.row * self.cols + node.col
+        flat = self._flat
+        return [flat[index + offset] for offset in self._moves[self.adjacency.links[index]]]
         
-    def generate_random_walls(self, density=0.25):
-        """Generates random walls across the grid."""
-        self.clear_all() # Start with a clean slate
-        for row in self.nodes:
-            for node in row:
-                if random.random() < density:
-                    node.state = NodeState.WALL
\ No newline at end of file
+    def set_walls(self, cells):
+        """
+        Replaces the layout: clears the grid, then turns every cell that is
+        WALL in `cells` (one NodeState per cell, row-major) into a wall.
+        Watchers are told once, with None.
+        """
+        self._bulk = True
+        try:
+            self.clear_all()
+            wall, flat = NodeState.WALL, self._flat
+            index = cells.find(wall)
+            while index != -1:
+                flat[index].state = wall
+                index = cells.find(wall, index + 1)
+        finally:
+            self._bulk = False
+        self.adjacency.rebuild(bytes(cells).translate(_WALKABLE_TABLE))
+        self._terrain_changed(None)
+
+    def generate_random_walls(self, density=0.25, seed=None):
+        """
+        Generates random walls across the grid. Passing a seed makes the
+        layout reproducible (and the same as CompactGrid's for that seed).
+        """
+        self.set_walls(random_walls(self.rows, self.cols, random.Random(seed), density))
@@ -0,0 +1,267 @@
+# app/hierarchy.py
+
+import heapq
+from .result import SearchResult, manhattan, set_path
+
+CLUSTER_SIZE = 10     # Cells per cluster side
+ENTRANCE_SPLIT = 6    # Entrances at least this wide get a transition at each end
+
+class ClusterGraph:
+    """
+    The abstraction used by HPA* (Botea, Müller & Schaeffer). The grid is cut
+    into square clusters. Wherever two neighbouring clusters share an open
+    stretch of border (an entrance), one or two transition cells are placed
+    on each side. Inside a cluster every pair of its transition cells is
+    joined by an edge carrying their exact in-cluster path cost. The abstract
+    graph is tiny compared to the grid, so long-range queries expand a few
+    hundred abstract nodes instead of large areas.
+
+    The graph watches the grid. A wall or cost edit only marks the cluster
+    it lands in (and, for border cells, the border and the neighbouring
+    cluster) as stale, and the next query rebuilds just those. A bulk change
+    (set_walls, a new movement mode) marks everything stale, so nothing is
+    rebuilt until HPA* is actually queried again.
+    """
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.borders = {}   # (cluster, neighbour below/right) -> [(cell, cell across the border)]
+        self.intra = {}     # cluster -> {transition cell: [(transition cell, cost)]}
+        self.inter = {}     # transition cell -> [(cell across the border, cost)]
+        self.stale_clusters = set()
+        self.stale_borders = set()
+        self.rebuilds = 0   # Clusters rebuilt so far, for inspection
+        self._mark_all_stale() # Built by the first query
+        grid.watch(self._on_terrain_change)
+
+    def close(self):
+        """Stops watching the grid."""
+        self.grid.unwatch(self._on_terrain_change)
+
+    # --- Geometry ---
+    def cluster_of(self, cell):
+        row, col = self.grid.position(cell)
+        return row // self.size, col // self.size
+
+    def _bounds(self, cluster):
+        row, col = cluster[0] * self.size, cluster[1] * self.size
+        return row, col, min(row + self.size, self.grid.rows), min(col + self.size, self.grid.cols)
+
+    def _free(self, row, col):
+        return self.grid.is_walkable(self.grid.get_node(row, col))
+
+    # --- Building ---
+    def _mark_all_stale(self):
+        self.borders, self.intra, self.inter = {}, {}, {}
+        self.stale_clusters = {(r, c) for r in range(self.cluster_rows) for c in range(self.cluster_cols)}
+        self.stale_borders = set()
+        for cluster in self.stale_clusters:
+            r, c = cluster
+            if r + 1 < self.cluster_rows:
+                self.stale_borders.add((cluster, (r + 1, c)))
+            if c + 1 < self.cluster_cols:
+                self.stale_borders.add((cluster, (r, c + 1)))
+
+    def _on_terrain_change(self, cell):
+        if cell is None: # The whole grid was replaced; rebuilt by the next query
+            self._mark_all_stale()
+            return
+        row, col = self.grid.position(cell)
+        cluster = (row // self.size, col // self.size)
+        self.stale_clusters.add(cluster)
+        # A cell on the edge of its cluster also changes the entrances of
+        # that border, and so the transitions of the cluster across it.
+        for d_row, d_col in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            across = self.grid.get_node(row + d_row, col + d_col)
+            if across is None:
+                continue
+            other = self.cluster_of(across)
+            if other != cluster:
+                self.stale_clusters.add(other)
+                self.stale_borders.add((min(cluster, other), max(cluster, other)))
+
+    def _scan_border(self, border):
+        """Finds the entrances of one border and places their transitions."""
+        (r1, c1), (r2, c2) = border
+        grid = self.grid
+        if r2 > r1: # Horizontal border: last row of the upper cluster
+            row = r2 * self.size
+            _, col0, _, col1 = self._bounds((r1, c1))
+            pairs = [((row - 1, col), (row, col)) for col in range(col0, col1)]
+        else:       # Vertical border: last column of the left cluster
+            col = c2 * self.size
+            row0, _, row1, _ = self._bounds((r1, c1))
+            pairs = [((row, col - 1), (row, col)) for row in range(row0, row1)]
+
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and self._free(*a) and self._free(*b):
+                run.append((a, b))
+                continue
+            if run:
+                picks = [run[len(run) // 2]] if len(run) < ENTRANCE_SPLIT else [run[0], run[-1]]
+                transitions.extend((grid.get_node(*a), grid.get_node(*b)) for a, b in picks)
+                run = []
+        return transitions
+
+    def _cluster_search(self, source, cluster, reverse=False, targets=None):
+        """
+        Dijkstra confined to one cluster. Returns (cost, came_from) dicts; with
+        reverse=True the costs are from each cell *to* source. Given a set of
+        targets it stops as soon as all of them are settled.
+        """
+        grid = self.grid
+        row0, col0, row1, col1 = self._bounds(cluster)
+        cost = {source: 0}
+        came_from = {source: None}
+        heap = [(0, 0, source)]
+        count = 0
+        remaining = set(targets) if targets else None
+        while heap:
+            dist, _, current = heapq.heappop(heap)
+            if dist > cost[current]:
+                continue
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            step = grid.cost(current) if reverse else None
+            for neighbor in grid.get_neighbors(current):
+                row, col = grid.position(neighbor)
+                if not (row0 <= row < row1 and col0 <= col < col1):
+                    continue
+                new_cost = dist + (step if reverse else grid.cost(neighbor))
+                if new_cost < cost.get(neighbor, float("inf")):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    count += 1
+                    heapq.heappush(heap, (new_cost, count, neighbor))
+        return cost, came_from
+
+    def refresh(self):
+        """Rebuilds whatever wall edits made stale since the last query."""
+        if not self.stale_clusters and not self.stale_borders:
+            return
+        for border in self.stale_borders:
+            self.borders[border] = self._scan_border(border)
+        # Inter-cluster edges: stepping across a border costs the cell entered.
+        self.inter = {}
+        for transitions in self.borders.values():
+            for a, b in transitions:
+                self.inter.setdefault(a, []).append((b, self.grid.cost(b)))
+                self.inter.setdefault(b, []).append((a, self.grid.cost(a)))
+        # Intra-cluster edges between every pair of a stale cluster's transitions.
+        for cluster in self.stale_clusters:
+            nodes = self._transitions(cluster)
+            edges = {}
+            for node in nodes:
+                cost, _ = self._cluster_search(node, cluster, targets=nodes)
+                edges[node] = [(other, cost[other]) for other in nodes if other != node and other in cost]
+            self.intra[cluster] = edges
+            self.rebuilds += 1
+        self.stale_clusters, self.stale_borders = set(), set()
+
+    def _transitions(self, cluster):
+        r, c = cluster
+        nodes = set()
+        for border in (((r - 1, c), cluster), ((r, c - 1), cluster), (cluster, (r + 1, c)), (cluster, (r, c + 1))):
+            for a, b in self.borders.get(border, ()):
+                nodes.add(a if border[0] == cluster else b)
+        return nodes
+
+    # --- Querying ---
+    def search(self, start, goal):
+        """
+        HPA* query: links start and goal into the abstract graph, runs A* on
+        it (one step per abstract expansion) and refines the abstract path
+        segment by segment with searches confined to single clusters.
+        Returns a SearchResult; paths are near-optimal, not always shortest.
+        """
+        self.refresh()
+        grid = self.grid
+        result = SearchResult("HPA* (Hierarchical)", start, goal)
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+
+        # Temporary edges from the start and into the goal.
+        start_cost, _ = self._cluster_search(start, start_cluster)
+        goal_cost, _ = self._cluster_search(goal, goal_cluster, reverse=True) if grid.is_walkable(goal) else ({}, None)
+        start_edges = [(node, start_cost[node]) for node in self._transitions(start_cluster) if node in start_cost]
+        goal_edges = {node: goal_cost[node] for node in self._transitions(goal_cluster) if node in goal_cost}
+        if start_cluster == goal_cluster and goal in start_cost and goal_cost:
+            start_edges.append((goal, start_cost[goal]))
+
+        count = 0
+        # Ties on f go to the deeper node: Manhattan distance is often exact on
+        # open terrain and FIFO ties would flood the whole plateau.
+        open_set = [(manhattan(grid, start, goal), 0, count, start)]
+        g_score = {start: 0}
+        came_from = {start: None}
+        closed = set()
+        result.nodes_opened = 1
+        while open_set:
+            result.max_open_size = max(result.max_open_size, len(open_set))
+            current = heapq.heappop(open_set)[3]
+            if current in closed:
+                result.stale_entries += 1
+                continue
+            closed.add(current)
+            result.expanded.append(current)
+            if current == goal:
+                break
+
+            if current == start:
+                edges = start_edges + self.inter.get(start, [])
+            else:
+                edges = self.intra.get(self.cluster_of(current), {}).get(current, []) + self.inter.get(current, [])
+            if current in goal_edges:
+                edges = edges + [(goal, goal_edges[current])]
+            opened = []
+            for neighbor, cost in edges:
+                temp_g_score = g_score[current] + cost
+                if temp_g_score < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = temp_g_score
+                    came_from[neighbor] = current
+                    count += 1
+                    heapq.heappush(open_set, (temp_g_score + manhattan(grid, neighbor, goal), -temp_g_score, count, neighbor))
+                    opened.append(neighbor)
+            result.nodes_opened += len(opened)
+            yield (current,), opened
+
+        if goal not in closed:
+            return result
+        waypoints = []
+        current = goal
+        while current is not None:
+            waypoints.append(current)
+            current = came_from[current]
+        waypoints.reverse()
+        return set_path(result, grid, self._refine(waypoints))
+
+    def _refine(self, waypoints):
+        """Expands abstract edges into grid paths."""
+        path = [waypoints[0]]
+        for a, b in zip(waypoints, waypoints[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b): # Inter-cluster edge: adjacent cells
+                path.append(b)
+                continue
+            _, came_from = self._cluster_search(a, cluster, targets=(b,))
+            segment = []
+            current = b
+            while current != a:
+                segment.append(current)
+                current = came_from[current]
+            path.extend(reversed(segment))
+        return path
+
+# One lazily built abstraction per grid for the "HPA* (Hierarchical)" entry,
+# stored on the grid (see connectivity.shared_connectivity).
+def shared_cluster_graph(grid):
+    """Returns the cluster graph cached for `grid`, creating it if needed."""
+    graph = getattr(grid, "_cluster_graph", None)
+    if graph is None:
+        graph = grid._cluster_graph = ClusterGraph(grid)
+    return graph
@@ -0,0 +1,194 @@
+# app/instrument.py
+
+import threading
+import time
+from .connectivity import shared_connectivity
+from .engine import SEARCHES, check_movement
+from .result import SearchResult
+
+# Opt-in instrumentation for the engine searches. Nothing here is imported
+# or called on the normal path, so an uninstrumented search pays nothing:
+#
+#     stats = SearchStats()
+#     result = find_path(grid, start, goal, instrumented("A* Search", stats))
+#     print(stats)
+#
+# or, to also collect a cProfile profile of the run,
+#
+#     profiler = cProfile.Profile()
+#     result, stats = profile_search(grid, start, goal, "A* Search", profiler=profiler)
+#     profiler.print_stats("cumulative")
+#
+# Most counters come from the SearchResult, which every search keeps anyway.
+# Only the neighbour-call count and the phase times need extra work: while
+# any measured search runs on a grid, its get_neighbors is shadowed by one
+# shared _NeighborCounter. Each call is counted for the measured search
+# that is executing at that moment, so searches interleaved on the same
+# grid keep separate counts, and the counter removes itself when the last
+# measured search on the grid ends.
+
+# Phases of a run, in order. "setup" is the time to the first step, which
+# includes any preprocessing the search does (landmark tables, the HPA*
+# cluster graph) and its first expansion; "finish" is the resume that
+# builds the path and returns the result.
+PHASES = ("connectivity", "setup", "search", "finish")
+
+class _NeighborCounter:
+    """
+    Stands in for grid.get_neighbors while measured searches run on the
+    grid. `users` counts those searches; each thread keeps a stack of the
+    SearchStats whose search is currently being stepped.
+    """
+    def __init__(self, grid):
+        self.get_neighbors = type(grid).get_neighbors.__get__(grid) # The real method
+        self.users = 0
+        self.local = threading.local()
+
+    def __call__(self, cell):
+        running = getattr(self.local, "running", None)
+        if running:
+            running[-1].neighbor_calls += 1
+        return self.get_neighbors(cell)
+
+    @classmethod
+    def attach(cls, grid):
+        counter = vars(grid).get("get_neighbors")
+        if not isinstance(counter, cls):
+            counter = grid.get_neighbors = cls(grid)
+        counter.users += 1
+        return counter
+
+    def detach(self, grid):
+        self.users -= 1
+        if self.users == 0 and vars(grid).get("get_neighbors") is self:
+            del grid.get_neighbors # The class method shows through again
+
+    def stack(self):
+        if not hasattr(self.local, "running"):
+            self.local.running = []
+        return self.local.running
+
+class SearchStats:
+    """Counters and phase times of one measured run. Readable while it runs."""
+    def __init__(self, algorithm=""):
+        self.algorithm = algorithm
+        self.steps = 0              # (closed, opened) steps yielded
+        self.expanded = 0
+        self.pushes = 0             # entries added to the open set
+        self.pops = 0               # entries taken off it, stale ones included
+        self.stale = 0              # outdated entries skipped
+        self.peak_open = 0
+        self.neighbor_calls = 0     # grid.get_neighbors calls
+        self.phases = dict.fromkeys(PHASES, 0.0) # Seconds per phase
+        self.done = False
+
+    @property
+    def seconds(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        return {"algorithm": self.algorithm, "steps": self.steps, "expanded": self.expanded,
+                "pushes": self.pushes, "pops": self.pops, "stale": self.stale, "peak_open": self.peak_open,
+                "neighbor_calls": self.neighbor_calls, "seconds": self.seconds,
+                **{f"{phase}_seconds": seconds for phase, seconds in self.phases.items()}}
+
+    def summary(self):
+        """A few lines of text for the visualizer's stats panel."""
+        return (f"Expanded: {self.expanded:,}   Steps: {self.steps:,}\n"
+                f"Pushes: {self.pushes:,}   Pops: {self.pops:,}\n"
+                f"Stale: {self.stale:,}   Peak open: {self.peak_open:,}\n"
+                f"Neighbour calls: {self.neighbor_calls:,}\n"
+                f"Time: {self.seconds * 1000:.1f} ms (setup {self.phases['setup'] * 1000:.1f})")
+
+    def __repr__(self):
+        return (f"SearchStats({self.algorithm!r}, expanded={self.expanded}, pushes={self.pushes}, "
+                f"pops={self.pops}, stale={self.stale}, peak_open={self.peak_open}, "
+                f"neighbor_calls={self.neighbor_calls}, {self.seconds * 1000:.2f} ms)")
+
+    def _take(self, result):
+        """Copies the counters the search kept on its SearchResult."""
+        self.expanded = result.nodes_expanded
+        self.pushes = result.nodes_opened
+        self.stale = result.stale_entries
+        self.pops = self.expanded + self.stale
+        self.peak_open = result.max_open_size
+
+    def measure(self, grid, steps):
+        """
+        Wraps the search generator `steps` (running on `grid`): yields the
+        same steps and returns the same result, counting as it goes. Time
+        spent by the caller between steps, e.g. drawing them, is not counted.
+        """
+        phases, clock = self.phases, time.perf_counter
+        phase = "setup"
+        counter = _NeighborCounter.attach(grid)
+        try:
+            while True:
+                began = clock()
+                running = counter.stack() # Of the thread stepping the search
+                running.append(self)
+                try:
+                    step = next(steps)
+                except StopIteration as stop:
+                    phases["finish"] += clock() - began
+                    result = stop.value
+                    break
+                finally:
+                    running.pop()
+                phases[phase] += clock() - began
+                phase = "search"
+                self.steps += 1
+                self.expanded += len(step[0])
+                self.pushes += len(step[1])
+                yield step
+        finally:
+            counter.detach(grid)
+        self._take(result)
+        self.done = True
+        return result
+
+def instrumented(algorithm, stats):
+    """
+    A search function that runs `algorithm` (a name from engine.SEARCHES or
+    a search function) under `stats`. It can be passed anywhere a search
+    is accepted: find_path, trace.record, algorithms._animate. Like
+    find_path, calling it raises ValueError if the algorithm does not
+    support the grid's movement mode.
+    """
+    search = SEARCHES[algorithm] if isinstance(algorithm, str) else algorithm
+    stats.algorithm = algorithm if isinstance(algorithm, str) else search.__name__
+
+    def run(grid, start, goal, **options):
+        check_movement(grid, algorithm)
+        return stats.measure(grid, search(grid, start, goal, **options))
+    run.__name__ = stats.algorithm # Keeps trace and result names readable
+    return run
+
+def profile_search(grid, start, goal, algorithm="A* Search", profiler=None, **options):
+    """
+    Runs a query like engine.find_path, measured, and returns
+    (result, stats). The connectivity check is timed as its own phase. If
+    `profiler` is given (a cProfile.Profile, or anything with enable() and
+    disable()) it is enabled for the duration of the run only.
+    """
+    check_movement(grid, algorithm)
+    stats = SearchStats()
+    search = instrumented(algorithm, stats)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        began = time.perf_counter()
+        connected = shared_connectivity(grid).may_connect(start, goal)
+        stats.phases["connectivity"] = time.perf_counter() - began
+        if not connected:
+            stats.done = True
+            return SearchResult(stats.algorithm, start, goal), stats
+        steps = search(grid, start, goal, **options)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value, stats
+    finally:
+        if profiler is not None:
+            profiler.disable()
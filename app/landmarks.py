@@ -0,0 +1,141 @@
+# app/landmarks.py
+
+import random
+from array import array
+from .result import manhattan
+
+def distance_table(grid, source, reverse=False):
+    """
+    Exact cost from `source` to every cell (or, with reverse=True, from every
+    cell to `source`) as a flat array indexed by grid.index_of; -1 marks
+    unreachable cells. Dijkstra with Dial's bucket queue, like engine.dijkstra.
+    """
+    size = grid.rows * grid.cols
+    table = array("l", [-1]) * size
+    span = grid.max_cost() + 1
+    buckets = [[] for _ in range(span)]
+    buckets[0].append(source)
+    best = {source: 0}
+    pending, dist = 1, 0
+    index_of, cost, get_neighbors = grid.index_of, grid.cost, grid.get_neighbors
+    while pending:
+        bucket = buckets[dist % span]
+        if not bucket:
+            dist += 1
+            continue
+        current = bucket.pop()
+        pending -= 1
+        index = index_of(current)
+        if table[index] >= 0:
+            continue
+        table[index] = dist
+        # Walking an edge backwards costs the cell we walk away from.
+        step = cost(current) if reverse else None
+        for neighbor in get_neighbors(current):
+            new_dist = dist + (step if reverse else cost(neighbor))
+            if new_dist < best.get(neighbor, float("inf")):
+                best[neighbor] = new_dist
+                buckets[new_dist % span].append(neighbor)
+                pending += 1
+    return table
+
+class LandmarkHeuristic:
+    """
+    ALT heuristic (A*, Landmarks, Triangle inequality). A one-time
+    preprocessing step picks `count` landmarks spread far apart and stores
+    exact distance tables to and from each of them. For any landmark L the
+    triangle inequality gives two lower bounds on the remaining cost:
+
+        d(v, t) >= d(L, t) - d(L, v)    and    d(v, t) >= d(v, L) - d(t, L)
+
+    The heuristic is the largest of these bounds and the Manhattan distance.
+    It stays admissible and consistent, and on mazes it is far more informed
+    than Manhattan alone. bound_for(goal) gives the heuristic for one goal,
+    to pass as A*'s heuristic:
+
+        landmarks = LandmarkHeuristic(grid)
+        find_path(grid, start, goal, heuristic=landmarks.bound_for(goal))
+
+    Each search keeps its own bound, so searches towards different goals can
+    share one LandmarkHeuristic, also across threads. The tables are rebuilt
+    lazily by the next bound_for after the grid's walls or costs change
+    (tracked with grid.version); bounds handed out earlier keep the tables
+    they were made from.
+    """
+    def __init__(self, grid, count=8, seed=0):
+        self.grid = grid
+        self.count = count
+        self.seed = seed
+        self.landmarks = []
+        self.tables = []     # (from_landmark, to_landmark) distance tables
+        self.version = None  # grid.version the tables were built for
+
+    def build(self):
+        """Picks the landmarks and computes their tables (farthest-point selection)."""
+        grid = self.grid
+        version = grid.version
+        size = grid.rows * grid.cols
+        walkable = [index for index in range(size) if grid.is_walkable(grid.cell_at(index))]
+        landmarks, tables = [], []
+        if not walkable:
+            self.landmarks, self.tables, self.version = landmarks, tables, version
+            return
+        symmetric = grid.max_cost() == 1 # Unit costs: d(L, v) == d(v, L)
+        # Start from the cell farthest from a random seed cell, then keep
+        # adding the cell farthest from all landmarks chosen so far.
+        seed_cell = grid.cell_at(random.Random(self.seed).choice(walkable))
+        farthest = distance_table(grid, seed_cell)
+        nearest = None
+        for _ in range(self.count):
+            scores = farthest if nearest is None else nearest
+            candidate = max(walkable, key=scores.__getitem__)
+            if scores[candidate] <= 0:
+                break # Every reachable cell is already a landmark
+            landmark = grid.cell_at(candidate)
+            from_table = distance_table(grid, landmark)
+            to_table = from_table if symmetric else distance_table(grid, landmark, reverse=True)
+            landmarks.append(landmark)
+            tables.append((from_table, to_table))
+            if nearest is None:
+                nearest = array("l", from_table)
+            else:
+                for index in walkable:
+                    if 0 <= from_table[index] < nearest[index] or nearest[index] < 0:
+                        nearest[index] = from_table[index]
+        # Published together, once complete, for bound_for to pick up.
+        self.landmarks, self.tables, self.version = landmarks, tables, version
+
+    def bound_for(self, goal):
+        """
+        Returns heuristic(cell, goal): the ALT lower bound on the cost from
+        `cell` to this `goal`. The goal passed to it is not looked at.
+        """
+        if self.version != self.grid.version:
+            self.build()
+        grid = self.grid
+        index_of = grid.index_of
+        goal_index = index_of(goal)
+        bounds = [(from_table, to_table, from_table[goal_index], to_table[goal_index])
+                  for from_table, to_table in self.tables
+                  if from_table[goal_index] >= 0 or to_table[goal_index] >= 0]
+
+        def heuristic(cell, _goal):
+            index = index_of(cell)
+            best = manhattan(grid, cell, goal)
+            for from_table, to_table, from_goal, to_goal in bounds:
+                from_cell, to_cell = from_table[index], to_table[index]
+                if from_goal >= 0 and from_cell >= 0 and from_goal - from_cell > best:
+                    best = from_goal - from_cell
+                if to_cell >= 0 and to_goal >= 0 and to_cell - to_goal > best:
+                    best = to_cell - to_goal
+            return best
+        return heuristic
+
+# One lazily built heuristic per grid for the "A* + Landmarks (ALT)" entry,
+# stored on the grid (see connectivity.shared_connectivity).
+def shared_landmarks(grid):
+    """Returns the landmark heuristic cached for `grid`, creating it if needed."""
+    landmarks = getattr(grid, "_landmarks", None)
+    if landmarks is None:
+        landmarks = grid._landmarks = LandmarkHeuristic(grid)
+    return landmarks
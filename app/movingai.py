@@ -0,0 +1,191 @@
+# app/movingai.py
+
+import argparse
+import math
+import sys
+import time
+from .compact_grid import CompactGrid
+from .constants import NodeState, DEFAULT_COST
+from .engine import SEARCHES, DIAGONAL_SEARCHES, find_path
+
+# Maps and scenarios in the Moving AI benchmark formats
+# (https://movingai.com/benchmarks/formats.html).
+#
+#     python -m app.movingai maps/arena.map maps/arena.map.scen --algorithms "A* Search" "Jump Point Search"
+#
+# A .map file is a small header ("type", "height", "width", "map") followed
+# by one line of characters per row. A .scen file lists queries as
+#     bucket  map  width  height  start_x  start_y  goal_x  goal_y  optimal_length
+# with x the column and y the row.
+
+PASSABLE = b".GS" # Open ground, grass, swamp; everything else (@ O T W) is blocked
+
+# One byte per map character -> cell state, for bytes.translate.
+_PARSE_TABLE = bytes(NodeState.EMPTY if code in PASSABLE else NodeState.WALL for code in range(256))
+# And back: cell state -> "@" for walls, "." for everything else.
+_SAVE_TABLE = bytes(b"@"[0] if code == NodeState.WALL else b"."[0] for code in range(256))
+
+def parse_map(data):
+    """
+    Parses the bytes of a .map file into (rows, cols, cells), where cells
+    is a bytearray of NodeState values in row-major order. The body is
+    converted in one bytes.translate call rather than cell by cell.
+    """
+    lines = data.splitlines()
+    header = {}
+    for i, line in enumerate(lines):
+        key, _, value = line.strip().partition(b" ")
+        if key == b"map":
+            body = lines[i + 1:]
+            break
+        header[key] = value.strip()
+    else:
+        raise ValueError("not a Moving AI map: no 'map' line")
+    try:
+        rows, cols = int(header[b"height"]), int(header[b"width"])
+    except (KeyError, ValueError):
+        raise ValueError("not a Moving AI map: missing or bad height/width") from None
+    body = body[:rows]
+    if len(body) != rows or any(len(line) != cols for line in body):
+        raise ValueError(f"map body does not match its {rows}x{cols} header")
+    return rows, cols, bytearray(b"".join(body).translate(_PARSE_TABLE))
+
+def load_map(path, grid_class=CompactGrid, diagonal=False):
+    """
+    Loads a .map file into a new grid (a CompactGrid unless told
+    otherwise), 8-connected if `diagonal`.
+    """
+    with open(path, "rb") as f:
+        rows, cols, cells = parse_map(f.read())
+    if grid_class is CompactGrid:
+        return CompactGrid.from_buffers(rows, cols, cells, bytearray([DEFAULT_COST]) * (rows * cols), diagonal)
+    grid = grid_class(rows, cols, diagonal)
+    grid.set_walls(cells)
+    return grid
+
+def save_map(grid, path):
+    """
+    Writes the grid's walls as an octile .map file. Cell costs have no
+    place in the format and are not saved.
+    """
+    cols = grid.cols
+    if isinstance(grid, CompactGrid):
+        cells = bytes(grid.cells).translate(_SAVE_TABLE)
+    else:
+        cells = bytes(_SAVE_TABLE[NodeState.EMPTY if grid.is_walkable(grid.cell_at(i)) else NodeState.WALL]
+                      for i in range(grid.rows * cols))
+    with open(path, "wb") as f:
+        f.write(b"type octile\nheight %d\nwidth %d\nmap\n" % (grid.rows, cols))
+        for start in range(0, len(cells), cols):
+            f.write(cells[start:start + cols] + b"\n")
+
+class Scenario:
+    """One query of a .scen file."""
+    __slots__ = ("bucket", "map_name", "start", "goal", "optimal")
+
+    def __init__(self, bucket, map_name, start, goal, optimal):
+        self.bucket = bucket
+        self.map_name = map_name
+        self.start = start      # (row, col)
+        self.goal = goal        # (row, col)
+        self.optimal = optimal  # Recorded optimal length (octile moves)
+
+    def __repr__(self):
+        return f"Scenario({self.bucket}, {self.start} -> {self.goal}, optimal={self.optimal})"
+
+def load_scenarios(path):
+    """Reads a .scen file (version 1) into a list of Scenarios."""
+    scenarios = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == "version":
+                continue
+            bucket, map_name = int(fields[0]), fields[1]
+            start_x, start_y, goal_x, goal_y = map(int, fields[4:8])
+            scenarios.append(Scenario(bucket, map_name, (start_y, start_x), (goal_y, goal_x), float(fields[8])))
+    return scenarios
+
+class ScenarioReport:
+    """Outcome of running one algorithm over a scenario list."""
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.queries = 0
+        self.solved = 0
+        self.mismatches = []    # (scenario, expected cost, actual cost)
+        self.seconds = 0.0      # Search time only; reference runs are not counted
+        self.expanded = 0
+
+    @property
+    def queries_per_second(self):
+        return self.queries / self.seconds if self.seconds else float("inf")
+
+    def __repr__(self):
+        return (f"ScenarioReport({self.algorithm!r}, queries={self.queries}, solved={self.solved}, "
+                f"mismatches={len(self.mismatches)}, {self.queries_per_second:.1f} queries/s)")
+
+def run_scenarios(grid, scenarios, algorithm="A* Search", reference="Dijkstra"):
+    """
+    Runs every scenario on `grid` with `algorithm` and checks each path
+    cost. The recorded optimal lengths assume 8-connected octile movement
+    without corner cutting. On an 8-connected grid they are compared
+    directly (to within the 8 decimals the files are written with). On a
+    4-connected grid the expected cost is taken from the `reference`
+    search instead.
+    """
+    report = ScenarioReport(algorithm)
+    for scenario in scenarios:
+        start, goal = grid.get_node(*scenario.start), grid.get_node(*scenario.goal)
+        if start is None or goal is None:
+            raise ValueError(f"{scenario} lies outside the {grid.rows}x{grid.cols} map")
+        began = time.perf_counter()
+        result = find_path(grid, start, goal, algorithm)
+        report.seconds += time.perf_counter() - began
+        report.queries += 1
+        report.solved += result.found
+        report.expanded += result.nodes_expanded
+        if grid.diagonal:
+            expected = scenario.optimal
+            matches = result.found and math.isclose(result.cost, expected, rel_tol=1e-9, abs_tol=1e-4)
+        else:
+            expected = find_path(grid, start, goal, reference).cost
+            matches = result.cost == expected
+        if not matches:
+            report.mismatches.append((scenario, expected, result.cost))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.movingai",
+                                     description="Run a Moving AI scenario file against the algorithms.")
+    parser.add_argument("map", help=".map file")
+    parser.add_argument("scen", help=".scen file for that map")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SEARCHES), default=["A* Search"],
+                        metavar="NAME", help="algorithm names (default: A* Search)")
+    parser.add_argument("--limit", type=int, help="run only the first LIMIT scenarios")
+    parser.add_argument("--diagonal", action="store_true",
+                        help="8-connected movement; costs are checked against the recorded optimal lengths")
+    args = parser.parse_args(argv)
+    if args.diagonal:
+        unsupported = [name for name in args.algorithms if name not in DIAGONAL_SEARCHES]
+        if unsupported:
+            parser.error(f"4-connected only, cannot use --diagonal: {', '.join(unsupported)}")
+
+    began = time.perf_counter()
+    grid = load_map(args.map, diagonal=args.diagonal)
+    print(f"Loaded {args.map}: {grid.rows}x{grid.cols} in {time.perf_counter() - began:.2f} s")
+    scenarios = load_scenarios(args.scen)[:args.limit]
+
+    failed = False
+    print(f"{'algorithm':<28}{'queries':>8} {'solved':>7} {'wrong':>6} {'time':>10} {'queries/s':>10} {'expanded/q':>11}")
+    for algorithm in args.algorithms:
+        report = run_scenarios(grid, scenarios, algorithm)
+        print(f"{algorithm:<28}{report.queries:>8} {report.solved:>7} {len(report.mismatches):>6} "
+              f"{report.seconds:>8.2f} s {report.queries_per_second:>10.1f} "
+              f"{report.expanded / max(report.queries, 1):>11.0f}")
+        for scenario, expected, actual in report.mismatches[:5]:
+            print(f"    {scenario}: expected cost {expected}, got {actual}")
+        failed = failed or bool(report.mismatches)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
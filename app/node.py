@@ -2,15 +2,34 @@ from .constants import NodeState
 
 class Node:
     """
-    Represents a single cell in the grid. It knows its own state, position,
-    and holds data crucial for pathfinding algorithms (like its parent for
-    path reconstruction).
+    Represents a single cell in the grid. It knows its own position and its
+    visual state. Search bookkeeping (scores, parents) lives in the engine,
+    not on the node.
     """
-    def __init__(self, row, col):
+    __slots__ = ("row", "col", "_state", "_on_change")
+
+    def __init__(self, row, col, on_change=None):
         self.row = row
         self.col = col
-        self.state = NodeState.EMPTY
-        self.parent = None
+        self._state = NodeState.EMPTY
+        self._on_change = on_change
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        """
+        Updates the state and, if it actually changed, notifies the owner
+        (the Grid) so the cell can be queued for redrawing.
+        """
+        if value == self._state:
+            return
+        old_state = self._state
+        self._state = value
+        if self._on_change:
+            self._on_change(self, old_state)
 
     def is_walkable(self):
         """A node is walkable if it's not a wall."""
@@ -23,19 +42,10 @@ class Node:
         Otherwise, it's a full reset for 'Clear All'.
         """
         if keep_essentials and self.state in (NodeState.START, NodeState.END, NodeState.WALL):
-            self.parent = None
             return
-        
-        # If this node was the start or end, it should be fully reset
-        if self.state in (NodeState.START, NodeState.END):
-            if not keep_essentials:
-                self.state = NodeState.EMPTY
 
-        # Reset visualization states
-        elif self.state not in (NodeState.WALL, NodeState.EMPTY):
-             self.state = NodeState.EMPTY
-
-        self.parent = None
+        # Visualization states always go; start, end and walls only on a full reset
+        self.state = NodeState.EMPTY
 
     def __lt__(self, other):
         """
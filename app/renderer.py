@@ -0,0 +1,142 @@
+# app/renderer.py
+
+import tkinter as tk
+from .constants import (CELL_SIZE, STATE_COLORS, COLOR_GRID_LINE, COLOR_WEIGHT, NodeState, DEFAULT_COST,
+                        ZOOM_LEVELS, RASTER_BELOW, RASTER_FLUSH_SHARE)
+
+class GridRenderer:
+    """
+    Draws the part of the Grid that is in view onto a Tkinter canvas. The
+    view can be zoomed (cell size in pixels, one of ZOOM_LEVELS) and panned.
+
+    At normal zoom every visible cell gets one rectangle, created when the
+    view changes; afterwards only the cells in the grid's dirty set are
+    recoloured, so the cost of a frame scales with the number of changed
+    cells rather than with the size of the grid. Below RASTER_BELOW pixels
+    per cell that many rectangles would swamp the canvas, so the view is
+    rasterized into a single PhotoImage instead, one block of pixels per
+    cell, and dirty cells are written straight into the image; when many
+    are dirty, one rasterize of the whole view is cheaper than a put() per
+    cell.
+    """
+    def __init__(self, canvas, grid):
+        self.canvas = canvas
+        self.grid = grid
+        self.cell_size = CELL_SIZE
+        self.view_x = 0             # Grid pixel shown at the canvas' left edge
+        self.view_y = 0             # ... and at its top edge
+        self.rows = self.cols = range(0) # Cells currently in view
+        self.items = {}             # (row, col) -> rectangle id, in rectangle mode
+        self.image = None           # The rasterized view, in raster mode
+        self.build()
+
+    # --- View ---
+    def _canvas_size(self):
+        # Before the canvas is mapped winfo_* reports 1; fall back to its requested size.
+        canvas = self.canvas
+        return max(canvas.winfo_width(), canvas.winfo_reqwidth()), max(canvas.winfo_height(), canvas.winfo_reqheight())
+
+    def build(self):
+        """
+        (Re)creates the canvas content for the current view. Needed after a
+        zoom, pan, resize or a new grid.
+        """
+        canvas, size = self.canvas, self.cell_size
+        canvas.delete("all")
+        self.items, self.image = {}, None
+        width, height = self._canvas_size()
+        self.view_x = max(0, min(self.view_x, self.grid.cols * size - width))
+        self.view_y = max(0, min(self.view_y, self.grid.rows * size - height))
+        self.rows = range(self.view_y // size, min(self.grid.rows, (self.view_y + height) // size + 1))
+        self.cols = range(self.view_x // size, min(self.grid.cols, (self.view_x + width) // size + 1))
+
+        if size < RASTER_BELOW:
+            self.image = tk.PhotoImage(master=canvas, width=len(self.cols) * size, height=len(self.rows) * size)
+            canvas.create_image(self.cols.start * size - self.view_x, self.rows.start * size - self.view_y,
+                                image=self.image, anchor=tk.NW)
+            self._rasterize()
+        else:
+            nodes = self.grid.nodes
+            for row in self.rows:
+                for col in self.cols:
+                    x1, y1 = col * size - self.view_x, row * size - self.view_y
+                    self.items[row, col] = canvas.create_rectangle(
+                        x1, y1, x1 + size, y1 + size, fill=self._color(nodes[row][col]), outline=COLOR_GRID_LINE)
+        self.grid.dirty.clear()
+
+    def zoom_at(self, x, y, steps):
+        """
+        Moves `steps` levels through ZOOM_LEVELS (positive zooms in), keeping
+        the cell under canvas point (x, y) in place.
+        """
+        level = ZOOM_LEVELS.index(self.cell_size) if self.cell_size in ZOOM_LEVELS else ZOOM_LEVELS.index(CELL_SIZE)
+        new_size = ZOOM_LEVELS[max(0, min(len(ZOOM_LEVELS) - 1, level + steps))]
+        if new_size == self.cell_size:
+            return
+        self.view_x = (self.view_x + x) * new_size // self.cell_size - x
+        self.view_y = (self.view_y + y) * new_size // self.cell_size - y
+        self.cell_size = new_size
+        self.build()
+
+    def pan(self, dx, dy):
+        """
+        Shifts the view by (dx, dy) canvas pixels. The drawn content is only
+        moved; call build() when the drag ends to fill in the uncovered edges.
+        """
+        self.view_x -= dx
+        self.view_y -= dy
+        self.canvas.move("all", dx, dy)
+
+    def cell_at(self, x, y):
+        """The (row, col) under canvas point (x, y); may be outside the grid."""
+        return (self.view_y + y) // self.cell_size, (self.view_x + x) // self.cell_size
+
+    # --- Painting ---
+    def refresh(self):
+        """Recolours every cell in view without creating or deleting canvas items."""
+        if self.image is not None:
+            self._rasterize()
+        else:
+            nodes = self.grid.nodes
+            for row, col in self.items:
+                self._paint(nodes[row][col])
+        self.grid.dirty.clear()
+
+    def flush(self):
+        """Recolours only the cells that changed since the last frame."""
+        dirty = self.grid.dirty
+        rows, cols = self.rows, self.cols
+        changed = len(dirty)
+        if self.image is not None and changed * RASTER_FLUSH_SHARE > len(rows) * len(cols):
+            self._rasterize()
+        else:
+            for node in dirty:
+                if node.row in rows and node.col in cols:
+                    self._paint(node)
+        dirty.clear()
+        return changed
+
+    def _rasterize(self):
+        """Writes the whole view into the image in one put() call."""
+        size, nodes = self.cell_size, self.grid.nodes
+        lines = []
+        for row in self.rows:
+            colors = [self._color(nodes[row][col]) for col in self.cols]
+            line = "{" + " ".join(color for color in colors for _ in range(size)) + "}"
+            lines.extend([line] * size)
+        if lines:
+            self.image.put(" ".join(lines))
+
+    def _color(self, node):
+        """Empty cells with a raised cost are shown as terrain."""
+        if node.state == NodeState.EMPTY and self.grid.cost(node) != DEFAULT_COST:
+            return COLOR_WEIGHT
+        return STATE_COLORS[node.state]
+
+    def _paint(self, node):
+        if self.image is not None:
+            size = self.cell_size
+            x, y = (node.col - self.cols.start) * size, (node.row - self.rows.start) * size
+            self.image.put(self._color(node), to=(x, y, x + size, y + size))
+        else:
+            self.canvas.itemconfigure(self.items[node.row, node.col], fill=self._color(node))
@@ -0,0 +1,148 @@
+# app/replanning.py
+
+import heapq
+from .result import SearchResult, manhattan, set_path
+
+INF = float("inf")
+
+class LPAStar:
+    """
+    Lifelong Planning A* (Koenig & Likhachev): a search that can be repeated
+    cheaply after the terrain changes. It keeps its g-values between runs
+    and watches the grid; after walls or costs are edited, the next
+    `search()` only re-expands the cells whose shortest distance actually
+    changed instead of starting from zero.
+
+        planner = LPAStar(grid, start, goal)
+        result = run_search(planner.search())  # full first search
+        ... edit some walls ...
+        result = run_search(planner.search())  # repairs the affected part
+
+    Start and goal are fixed for the planner's lifetime; call close() when
+    done so it stops watching the grid.
+    """
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.g = {}             # Settled cost from start (missing = infinity)
+        self.rhs = {start: 0}   # One-step lookahead cost (missing = infinity)
+        self.open = {}          # cell -> its current key in the heap
+        self.heap = []          # (key, count, cell); outdated entries are skipped
+        self.count = 0
+        self.changed = set()    # Cells edited since the last search
+        self.newly_opened = []  # Cells queued during the current step
+        self.reset_needed = False
+        self._queue(start)
+        grid.watch(self._on_terrain_change)
+
+    def close(self):
+        """Stops watching the grid."""
+        self.grid.unwatch(self._on_terrain_change)
+
+    def _on_terrain_change(self, cell):
+        if cell is None: # The whole grid was replaced
+            self.reset_needed = True
+        else:
+            self.changed.add(cell)
+
+    def _reset(self):
+        self.g, self.rhs, self.open, self.heap = {}, {self.start: 0}, {}, []
+        self.changed.clear()
+        self.reset_needed = False
+        self._queue(self.start)
+
+    # --- LPA* core ---
+    def _key(self, cell):
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (best + manhattan(self.grid, cell, self.goal), best)
+
+    def _queue(self, cell):
+        key = self._key(cell)
+        if cell not in self.open:
+            self.newly_opened.append(cell)
+        self.open[cell] = key
+        self.count += 1
+        heapq.heappush(self.heap, (key, self.count, cell))
+
+    def _update(self, cell):
+        """Recomputes rhs(cell) from its neighbors and (re)queues it if inconsistent."""
+        grid = self.grid
+        if cell != self.start:
+            if grid.is_walkable(cell):
+                step = grid.cost(cell)
+                g = self.g
+                self.rhs[cell] = min((g.get(p, INF) for p in grid.get_neighbors(cell)), default=INF) + step
+            else:
+                self.rhs[cell] = INF
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._queue(cell)
+        else:
+            self.open.pop(cell, None)
+
+    def _top_key(self):
+        heap, open_keys = self.heap, self.open
+        while heap and open_keys.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else (INF, INF)
+
+    def search(self):
+        """
+        Applies the terrain edits seen since the last call and brings the
+        plan up to date. Yields (closed, opened) steps like the engine
+        searches and returns a SearchResult for this run.
+        """
+        result = SearchResult("LPA* (Incremental)", self.start, self.goal)
+        if self.reset_needed:
+            self._reset()
+        for cell in self.changed:
+            self._update(cell)
+            for neighbor in self.grid.get_neighbors(cell):
+                self._update(neighbor)
+        self.changed.clear()
+
+        g, rhs, goal = self.g, self.rhs, self.goal
+        while self._top_key() < self._key(goal) or rhs.get(goal, INF) != g.get(goal, INF):
+            result.max_open_size = max(result.max_open_size, len(self.open))
+            cell = heapq.heappop(self.heap)[2]
+            del self.open[cell]
+            result.expanded.append(cell)
+            self.newly_opened = []
+            if g.get(cell, INF) > rhs.get(cell, INF): # Overconsistent: settle it
+                g[cell] = rhs[cell]
+                for neighbor in self.grid.get_neighbors(cell):
+                    self._update(neighbor)
+            else: # Underconsistent: its old cost is no longer valid
+                g[cell] = INF
+                self._update(cell)
+                for neighbor in self.grid.get_neighbors(cell):
+                    self._update(neighbor)
+            opened = [c for c in self.newly_opened if c in self.open]
+            result.nodes_opened += len(opened)
+            yield (cell,), opened
+        return set_path(result, self.grid, self.path())
+
+    def path(self):
+        """Follows the cheapest predecessors back from the goal."""
+        g, grid = self.g, self.grid
+        if g.get(self.goal, INF) == INF:
+            return []
+        path = [self.goal]
+        current = self.goal
+        while current != self.start:
+            current = min(grid.get_neighbors(current), key=lambda cell: g.get(cell, INF))
+            path.append(current)
+        path.reverse()
+        return path
+
+def lpa_star(grid, start, goal):
+    """
+    One-shot LPA* run, for comparing it with the other searches. The first
+    run of LPA* expands about as much as A*; the gain comes from repeated
+    runs with the same LPAStar planner.
+    """
+    planner = LPAStar(grid, start, goal)
+    try:
+        return (yield from planner.search())
+    finally:
+        planner.close()
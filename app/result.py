@@ -0,0 +1,53 @@
+# app/result.py
+
+from .constants import SQRT2
+
+# The result type and small helpers shared by every search module. Kept
+# separate from engine.py so search modules can use them while engine.py
+# imports those modules for its SEARCHES registry.
+
+class SearchResult:
+    """The structured outcome of a single search."""
+    def __init__(self, algorithm, start, goal):
+        self.algorithm = algorithm
+        self.start = start
+        self.goal = goal
+        self.path = []          # start ... goal, empty if the goal is unreachable
+        self.cost = None        # total cost of the path, None if no path
+        self.expanded = []      # cells in the order they were expanded
+        self.nodes_opened = 0   # cells pushed onto the open set
+        self.max_open_size = 0  # peak size of the open set
+        self.stale_entries = 0  # outdated open-set entries popped and skipped
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    @property
+    def nodes_expanded(self):
+        return len(self.expanded)
+
+    def __repr__(self):
+        return (f"SearchResult({self.algorithm!r}, found={self.found}, cost={self.cost}, "
+                f"expanded={self.nodes_expanded}, opened={self.nodes_opened})")
+
+def set_path(result, grid, path):
+    """Stores `path` on the result and prices it with the grid's cell costs."""
+    result.path = path
+    if not path:
+        result.cost = None
+    elif grid.diagonal:
+        result.cost = sum(grid.move_cost(a, b) for a, b in zip(path, path[1:]))
+    else:
+        result.cost = sum(grid.cost(cell) for cell in path[1:])
+    return result
+
+def manhattan(grid, a, b):
+    (a_row, a_col), (b_row, b_col) = grid.position(a), grid.position(b)
+    return abs(a_row - b_row) + abs(a_col - b_col)
+
+def octile(grid, a, b):
+    """The 8-connected counterpart of manhattan: diagonal steps cost sqrt(2)."""
+    (a_row, a_col), (b_row, b_col) = grid.position(a), grid.position(b)
+    d_row, d_col = abs(a_row - b_row), abs(a_col - b_col)
+    return max(d_row, d_col) + (SQRT2 - 1) * min(d_row, d_col)
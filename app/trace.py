@@ -0,0 +1,212 @@
+# app/trace.py
+
+import bisect
+import json
+import struct
+import sys
+import zlib
+from array import array
+from .connectivity import shared_connectivity
+from .engine import SEARCHES, check_movement
+
+# Event types. Each is also the overlay value it leaves on its cell, with
+# 0 meaning "not touched yet".
+OPEN, CLOSED, PATH = 1, 2, 3
+
+MAGIC = b"PFTRACE1"
+MAX_KEYFRAMES = 64
+KEYFRAME_BUDGET = 32 * 1024 * 1024 # Bytes of keyframes kept per trace
+
+def _le(values):
+    """Array bytes in little-endian order, whatever the platform."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_le(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+class SearchTrace:
+    """
+    A recorded search, stored as flat arrays rather than objects. Event i
+    marks cell `cells[i]` (a flat cell index) as `kinds[i]` (OPEN, CLOSED or
+    PATH). Engine step s covers events step_starts[s] up to the start of
+    step s + 1, and the path is painted as one last step. The terrain the
+    search ran on is kept too, so a saved trace can be inspected later
+    without the grid or re-running the search.
+    """
+    def __init__(self, algorithm, rows, cols, start, goal):
+        self.algorithm = algorithm
+        self.rows, self.cols = rows, cols
+        self.start, self.goal = start, goal # Flat cell indices
+        self.cells = array("i")
+        self.kinds = array("b")
+        self.step_starts = array("i")
+        self.found = False
+        self.cost = None
+        self.walls = bytes(rows * cols)     # 1 for wall cells
+        self.weights = bytes([1]) * (rows * cols)
+        self._keyframe_steps = None
+        self._keyframes = None
+
+    @property
+    def steps(self):
+        return len(self.step_starts)
+
+    def event_start(self, step):
+        """Index of the first event of `step` (the event count when step == steps)."""
+        return self.step_starts[step] if step < self.steps else len(self.cells)
+
+    def __repr__(self):
+        return (f"SearchTrace({self.algorithm!r}, {self.rows}x{self.cols}, steps={self.steps}, "
+                f"events={len(self.cells)}, found={self.found})")
+
+    # --- Seeking ---
+    def _build_keyframes(self):
+        """
+        Snapshots of the overlay at up to MAX_KEYFRAMES step boundaries,
+        spaced by event count so a seek never replays more than about
+        events / keyframes events.
+        """
+        size = self.rows * self.cols
+        count = max(1, min(MAX_KEYFRAMES, KEYFRAME_BUDGET // max(size, 1)))
+        spacing = max(1, len(self.cells) // count)
+        overlay = bytearray(size)
+        self._keyframe_steps, self._keyframes = [0], [bytes(size)]
+        applied = 0
+        for step in range(1, self.steps + 1):
+            end = self.event_start(step)
+            if end - self.event_start(self._keyframe_steps[-1]) < spacing:
+                continue
+            for i in range(applied, end):
+                overlay[self.cells[i]] = self.kinds[i]
+            applied = end
+            self._keyframe_steps.append(step)
+            self._keyframes.append(bytes(overlay))
+
+    def state_at(self, step):
+        """The overlay (one byte per cell) after the first `step` steps."""
+        if self._keyframes is None:
+            self._build_keyframes()
+        k = bisect.bisect_right(self._keyframe_steps, step) - 1
+        overlay = bytearray(self._keyframes[k])
+        cells, kinds = self.cells, self.kinds
+        for i in range(self.event_start(self._keyframe_steps[k]), self.event_start(step)):
+            overlay[cells[i]] = kinds[i]
+        return overlay
+
+    # --- Files ---
+    def save(self, path):
+        """
+        Writes the trace: MAGIC, a length-prefixed JSON header, then one
+        zlib stream with the event, step and terrain arrays.
+        """
+        header = json.dumps({
+            "algorithm": self.algorithm, "rows": self.rows, "cols": self.cols,
+            "start": self.start, "goal": self.goal, "found": self.found, "cost": self.cost,
+            "events": len(self.cells), "steps": self.steps,
+        }).encode()
+        body = zlib.compress(_le(self.cells) + self.kinds.tobytes() + _le(self.step_starts)
+                             + bytes(self.walls) + bytes(self.weights))
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header + body)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a search trace")
+        (length,) = struct.unpack_from("<I", data, len(MAGIC))
+        offset = len(MAGIC) + 4
+        header = json.loads(data[offset:offset + length])
+        body = zlib.decompress(data[offset + length:])
+        trace = cls(header["algorithm"], header["rows"], header["cols"], header["start"], header["goal"])
+        trace.found, trace.cost = header["found"], header["cost"]
+        events, steps, size = header["events"], header["steps"], header["rows"] * header["cols"]
+        pos = 0
+        for name, typecode, nbytes in (("cells", "i", 4 * events), ("kinds", "b", events),
+                                       ("step_starts", "i", 4 * steps)):
+            setattr(trace, name, _from_le(typecode, body[pos:pos + nbytes]))
+            pos += nbytes
+        trace.walls = body[pos:pos + size]
+        trace.weights = body[pos + size:pos + 2 * size]
+        return trace
+
+def _append(cells, kinds, indices, kind):
+    before = len(cells)
+    cells.extend(indices)
+    kinds.frombytes(bytes([kind]) * (len(cells) - before))
+
+def record(grid, start, goal, algorithm="A* Search", **options):
+    """
+    Runs `algorithm` (a name from engine.SEARCHES or a search function) at
+    full speed and returns its SearchTrace. Like find_path it only reads the
+    grid, and disconnected endpoints give an empty trace at once. Raises
+    ValueError for an algorithm that does not support the grid's movement
+    mode.
+    """
+    check_movement(grid, algorithm)
+    search = SEARCHES[algorithm] if isinstance(algorithm, str) else algorithm
+    name = algorithm if isinstance(algorithm, str) else search.__name__
+    index_of = grid.index_of
+    trace = SearchTrace(name, grid.rows, grid.cols, index_of(start), index_of(goal))
+    size = grid.rows * grid.cols
+    trace.walls = bytes(not grid.is_walkable(grid.cell_at(i)) for i in range(size))
+    trace.weights = bytes(grid.weights)
+    if not shared_connectivity(grid).may_connect(start, goal):
+        return trace
+
+    cells, kinds, step_starts = trace.cells, trace.kinds, trace.step_starts
+    steps = search(grid, start, goal, **options)
+    while True:
+        try:
+            closed, opened = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        step_starts.append(len(cells))
+        _append(cells, kinds, map(index_of, opened), OPEN)
+        _append(cells, kinds, map(index_of, closed), CLOSED)
+    if result.found:
+        step_starts.append(len(cells))
+        _append(cells, kinds, map(index_of, result.path), PATH)
+    trace.found, trace.cost = result.found, result.cost
+    return trace
+
+class TracePlayer:
+    """
+    A position in a trace plus the overlay shown at it. seek() returns only
+    the cells whose overlay changed, so a viewer repaints just those.
+    Forward seeks apply the events in between; backward seeks restart from
+    the nearest keyframe.
+    """
+    def __init__(self, trace):
+        self.trace = trace
+        self.step = 0
+        self.overlay = bytearray(trace.rows * trace.cols)
+
+    def seek(self, step):
+        """Moves to `step` (clamped to 0..steps) and returns the changed cell indices."""
+        trace = self.trace
+        step = max(0, min(step, trace.steps))
+        if step >= self.step:
+            cells, kinds, overlay = trace.cells, trace.kinds, self.overlay
+            changed = set()
+            for i in range(trace.event_start(self.step), trace.event_start(step)):
+                if overlay[cells[i]] != kinds[i]:
+                    overlay[cells[i]] = kinds[i]
+                    changed.add(cells[i])
+        else:
+            # Only cells touched between the two positions can differ.
+            touched = set(trace.cells[trace.event_start(step):trace.event_start(self.step)])
+            overlay = trace.state_at(step)
+            changed = {cell for cell in touched if overlay[cell] != self.overlay[cell]}
+            self.overlay = overlay
+        self.step = step
+        return changed
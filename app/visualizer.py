@@ -1,14 +1,42 @@
 # app/visualizer.py
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
+import math
 import random
-# Corrected line below: added TkinterState to the import
+import time
 from .constants import (GRID_WIDTH, GRID_HEIGHT,GRID_ROWS,GRID_COLS, CONTROL_PANEL_WIDTH, COLOR_BG,
-                        CELL_SIZE, NodeState, STATE_COLORS, COLOR_GRID_LINE,
-                        ALGORITHMS, TkinterState)
+                        NodeState, ALGORITHMS, DEFAULT_ALGORITHM, DEFAULT_SPEED,
+                        DEFAULT_COST, WEIGHT_COST, INCREMENTAL_ALGORITHM,
+                        MIN_SPEED, MAX_SPEED, FRAME_INTERVAL, FRAME_BUDGET, DEFAULT_GENERATOR)
 from .grid import Grid
-from .algorithms import ALGORITHM_MAP
+from .renderer import GridRenderer
+from .algorithms import animate_steps, show_result
+from .engine import find_path, run_search, check_movement
+from .replanning import LPAStar
+from .connectivity import shared_connectivity
+from .generators import GENERATORS, generate
+from .instrument import SearchStats, instrumented
+from .movingai import load_map, save_map
+from .trace import record, SearchTrace, TracePlayer, OPEN, CLOSED, PATH
+
+# How the overlay values of a replayed trace are shown.
+REPLAY_STATES = {0: NodeState.EMPTY, OPEN: NodeState.VISITING, CLOSED: NodeState.VISITED, PATH: NodeState.PATH}
+# A trace's wall bytes (1 for walls) as cell states for Grid.set_walls.
+TRACE_WALLS = bytes([NodeState.EMPTY]) + bytes([NodeState.WALL]) * 255
+
+# --- Class for shared Tkinter variables ---
+class TkinterState:
+    def __init__(self):
+        self.tool_var = tk.StringVar(value="start")
+        # The slider works on log10(steps per second).
+        self.speed_var = tk.DoubleVar(value=math.log10(DEFAULT_SPEED))
+        self.instant_var = tk.BooleanVar(value=False)
+        self.replay_var = tk.DoubleVar(value=0) # Replay position, in steps
+        self.algorithm_var = tk.StringVar(value=DEFAULT_ALGORITHM)
+        self.diagonal_var = tk.BooleanVar(value=False) # 8-connected movement
+        self.generator_var = tk.StringVar(value=DEFAULT_GENERATOR)
+        self.seed_var = tk.StringVar(value="") # Blank means a fresh random map each time
 
 class PathfindingVisualizer(tk.Tk):
     """
@@ -16,20 +44,29 @@ class PathfindingVisualizer(tk.Tk):
     and orchestrates the visualization process by linking the Grid model,
     Algorithm logic, and Tkinter view.
     """
-    def __init__(self):
+    def __init__(self, rows=GRID_ROWS, cols=GRID_COLS):
         super().__init__()
         self.title("Pathfinding Visualizer")
         self.geometry(f"{self.winfo_screenwidth()}x{self.winfo_screenheight()-100}") # Use screen dimensions for better fit
         # self.state('zoomed') # Alternative for Windows/some Linux DEs
         self.resizable(True, True) # Allow resizing
         
-        self.grid = Grid()
-        self.tk_state = TkinterState() # This will now work
+        self.grid = Grid(rows, cols)
+        # Kept up to date by the grid's wall events, so unreachable goals are
+        # reported without running the search.
+        self.connectivity = shared_connectivity(self.grid)
+        self.connectivity.rebuild()
+        self.tk_state = TkinterState()
         self.is_running = False
         self.animation_job = None
         self.control_widgets = []
+        self.planner = None # LPA* planner kept alive for live replanning
+        self.pan_anchor = (0, 0) # Last pointer position while middle-dragging
+        self.player = None # Replays the trace of the last run
+        self.stats = None # SearchStats of the last (or running) search
 
         self._init_ui()
+        self.renderer = GridRenderer(self.canvas, self.grid)
         self._bind_events()
         self.draw_grid(full_redraw=True)
 
@@ -55,7 +92,8 @@ class PathfindingVisualizer(tk.Tk):
         # --- Tool Selection ---
         tool_frame = ttk.LabelFrame(parent, text="Tools")
         tool_frame.pack(fill=tk.X, pady=(0, 15))
-        tools = [("Set Start", "start"), ("Set End", "end"), ("Add Wall", "wall"), ("Erase", "empty")]
+        tools = [("Set Start", "start"), ("Set End", "end"), ("Add Wall", "wall"),
+                 (f"Add Weight (cost {WEIGHT_COST})", "weight"), ("Erase", "empty")]
         for text, value in tools:
             rb = ttk.Radiobutton(tool_frame, text=text, variable=self.tk_state.tool_var, value=value)
             rb.pack(anchor=tk.W)
@@ -67,13 +105,25 @@ class PathfindingVisualizer(tk.Tk):
         algo_dropdown = ttk.Combobox(algo_frame, textvariable=self.tk_state.algorithm_var, values=ALGORITHMS, state="readonly")
         algo_dropdown.pack(pady=5, padx=10)
         self.control_widgets.append(algo_dropdown)
+        diagonal_check = ttk.Checkbutton(algo_frame, text="Diagonal moves (8-connected)",
+                                         variable=self.tk_state.diagonal_var, command=self._toggle_diagonal)
+        diagonal_check.pack(anchor=tk.W, padx=10, pady=(0, 5))
+        self.control_widgets.append(diagonal_check)
         
         # --- Speed Control ---
-        speed_frame = ttk.LabelFrame(parent, text="Animation Speed (ms delay)")
+        # Left enabled while running, so a search can be sped up or slowed down.
+        speed_frame = ttk.LabelFrame(parent, text="Animation Speed")
         speed_frame.pack(fill=tk.X, pady=(0, 15))
-        speed_slider = ttk.Scale(speed_frame, from_=0, to=100, orient=tk.HORIZONTAL, variable=self.tk_state.speed_var)
+        speed_slider = ttk.Scale(speed_frame, from_=math.log10(MIN_SPEED), to=math.log10(MAX_SPEED),
+                                 orient=tk.HORIZONTAL, variable=self.tk_state.speed_var,
+                                 command=lambda _: self._update_speed_label())
         speed_slider.pack(pady=5, padx=10, fill=tk.X)
-        self.control_widgets.append(speed_slider)
+        self.speed_label = ttk.Label(speed_frame)
+        self.speed_label.pack()
+        self._update_speed_label()
+        instant_check = ttk.Checkbutton(speed_frame, text="Instant (show only the result)", variable=self.tk_state.instant_var)
+        instant_check.pack(anchor=tk.W, padx=10, pady=(5, 0))
+        self.control_widgets.append(instant_check)
 
         # --- Action Buttons ---
         run_button = ttk.Button(parent, text="Run Visualization", command=self.run_visualization, style="Accent.TButton")
@@ -85,20 +135,88 @@ class PathfindingVisualizer(tk.Tk):
         clear_path_button.pack(fill=tk.X, pady=5)
         self.control_widgets.append(clear_path_button)
         
-        generate_walls_button = ttk.Button(parent, text="Generate Random Walls", command=self.generate_random_walls)
-        generate_walls_button.pack(fill=tk.X, pady=5)
-        self.control_widgets.append(generate_walls_button)
+        # --- Map Generation ---
+        generator_frame = ttk.LabelFrame(parent, text="Map Generator")
+        generator_frame.pack(fill=tk.X, pady=5)
+        generator_dropdown = ttk.Combobox(generator_frame, textvariable=self.tk_state.generator_var,
+                                          values=list(GENERATORS), state="readonly")
+        generator_dropdown.pack(pady=5, padx=10)
+        seed_row = ttk.Frame(generator_frame)
+        seed_row.pack(fill=tk.X, padx=10)
+        ttk.Label(seed_row, text="Seed:").pack(side=tk.LEFT)
+        seed_entry = ttk.Entry(seed_row, textvariable=self.tk_state.seed_var, width=12)
+        seed_entry.pack(side=tk.LEFT, padx=(5, 0))
+        generate_walls_button = ttk.Button(generator_frame, text="Generate", command=self.generate_random_walls)
+        generate_walls_button.pack(fill=tk.X, pady=5, padx=10)
+        self.control_widgets.extend([generator_dropdown, seed_entry, generate_walls_button])
         
         reset_button = ttk.Button(parent, text="Full Reset", command=self.reset_all)
         reset_button.pack(fill=tk.X, pady=(5,0))
         self.control_widgets.append(reset_button)
 
+        for text, command in (("Load Map...", self.load_map), ("Save Map...", self.save_map)):
+            button = ttk.Button(parent, text=text, command=command)
+            button.pack(fill=tk.X, pady=(5, 0))
+            self.control_widgets.append(button)
+
+        # --- Trace Replay ---
+        # Play/pause and the scrub bar stay enabled while a replay runs.
+        replay_frame = ttk.LabelFrame(parent, text="Trace Replay")
+        replay_frame.pack(fill=tk.X, pady=(15, 0))
+        self.replay_scale = ttk.Scale(replay_frame, from_=0, to=0, orient=tk.HORIZONTAL,
+                                      variable=self.tk_state.replay_var, command=self._scrub_replay)
+        self.replay_scale.pack(pady=5, padx=10, fill=tk.X)
+        self.replay_label = ttk.Label(replay_frame, text="No trace")
+        self.replay_label.pack()
+        self.play_button = ttk.Button(replay_frame, text="Play / Pause", command=self.toggle_replay)
+        self.play_button.pack(fill=tk.X, pady=5, padx=10)
+        for text, command in (("Save Trace...", self.save_trace), ("Load Trace...", self.load_trace)):
+            button = ttk.Button(replay_frame, text=text, command=command)
+            button.pack(fill=tk.X, pady=(0, 5), padx=10)
+            self.control_widgets.append(button)
+
+        # --- Search Stats ---
+        # Counters of the last search, updated every frame while one runs live.
+        stats_frame = ttk.LabelFrame(parent, text="Search Stats")
+        stats_frame.pack(fill=tk.X, pady=(15, 0))
+        self.stats_label = ttk.Label(stats_frame, text="No search yet", justify=tk.LEFT)
+        self.stats_label.pack(anchor=tk.W, padx=10, pady=5)
+
     def _bind_events(self):
         """Binds mouse events to the canvas."""
         self.canvas.bind("<Button-1>", self.handle_mouse_event)
         self.canvas.bind("<B1-Motion>", self.handle_mouse_event)
         self.canvas.bind("<Button-3>", self.handle_mouse_event)
         self.canvas.bind("<B3-Motion>", self.handle_mouse_event)
+        # Mouse wheel zooms (X11 reports it as buttons 4 and 5), middle-drag pans.
+        self.canvas.bind("<MouseWheel>", lambda e: self.renderer.zoom_at(e.x, e.y, 1 if e.delta > 0 else -1))
+        self.canvas.bind("<Button-4>", lambda e: self.renderer.zoom_at(e.x, e.y, 1))
+        self.canvas.bind("<Button-5>", lambda e: self.renderer.zoom_at(e.x, e.y, -1))
+        self.canvas.bind("<Button-2>", self._start_pan)
+        self.canvas.bind("<B2-Motion>", self._pan)
+        self.canvas.bind("<ButtonRelease-2>", lambda e: self.renderer.build())
+        self.canvas.bind("<Configure>", lambda e: self.renderer.build())
+
+    def _start_pan(self, event):
+        self.pan_anchor = (event.x, event.y)
+
+    def _pan(self, event):
+        x, y = self.pan_anchor
+        self.renderer.pan(event.x - x, event.y - y)
+        self.pan_anchor = (event.x, event.y)
+
+    def _steps_per_second(self):
+        return round(10 ** self.tk_state.speed_var.get())
+
+    def _toggle_diagonal(self):
+        """Switches the grid between 4- and 8-connected movement."""
+        self._close_planner()
+        self.clear_path(draw=False)
+        self.grid.set_diagonal(self.tk_state.diagonal_var.get())
+        self.draw_grid()
+
+    def _update_speed_label(self):
+        self.speed_label.config(text=f"{self._steps_per_second()} steps/s")
 
     def _toggle_controls(self, state):
         """Disables or enables all control widgets."""
@@ -106,26 +224,21 @@ class PathfindingVisualizer(tk.Tk):
             widget.config(state=state)
 
     def draw_grid(self, full_redraw=False):
-        """Draws the nodes and grid lines onto the canvas."""
-        self.canvas.delete("all")
-        for r in range(GRID_ROWS):
-            for c in range(GRID_COLS):
-                self._draw_node(self.grid.get_node(r, c))
+        """
+        Brings the canvas up to date with the grid. By default only the cells
+        that changed since the last call are recoloured.
+        """
+        if full_redraw:
+            self.renderer.refresh()
+        else:
+            self.renderer.flush()
         self.update_idletasks() # Force UI update
 
-    def _draw_node(self, node):
-        """Draws a single node on the canvas."""
-        x1, y1 = node.col * CELL_SIZE, node.row * CELL_SIZE
-        x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-        color = STATE_COLORS[node.state]
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline=COLOR_GRID_LINE)
-
     def handle_mouse_event(self, event):
         """Handles all mouse clicks and drags on the canvas."""
         if self.is_running: return
         
-        col = event.x // CELL_SIZE
-        row = event.y // CELL_SIZE
+        row, col = self.renderer.cell_at(event.x, event.y)
         node = self.grid.get_node(row, col)
         if not node: return
 
@@ -134,26 +247,52 @@ class PathfindingVisualizer(tk.Tk):
             tool = "empty"
 
         # Prevent changing start/end nodes while adding walls/erasing
-        if tool in ["wall", "empty"] and (node == self.grid.start_node or node == self.grid.end_node):
+        if tool in ["wall", "weight", "empty"] and (node == self.grid.start_node or node == self.grid.end_node):
             return
 
+        terrain_version = self.grid.version
         if tool == "start":
             if node != self.grid.end_node:
-                old_start = self.grid.start_node
                 self.grid.set_start(node)
-                if old_start: self._draw_node(old_start)
+                self._close_planner()
+                self._close_replay()
         elif tool == "end":
             if node != self.grid.start_node:
-                old_end = self.grid.end_node
                 self.grid.set_end(node)
-                if old_end: self._draw_node(old_end)
+                self._close_planner()
+                self._close_replay()
         elif tool == "wall":
+            self.grid.set_weight(node, DEFAULT_COST)
             node.state = NodeState.WALL
+        elif tool == "weight":
+            if node.state == NodeState.WALL:
+                node.state = NodeState.EMPTY
+            self.grid.set_weight(node, WEIGHT_COST)
         elif tool == "empty":
+            self.grid.set_weight(node, DEFAULT_COST)
             if node.state != NodeState.EMPTY:
                 node.state = NodeState.EMPTY
-            
-        self._draw_node(node)
+
+        if self.grid.version != terrain_version:
+            self._close_replay() # The trace no longer matches the grid
+        if self.planner and self.grid.version != terrain_version:
+            self._replan()
+        self.draw_grid()
+
+    def _replan(self):
+        """Repairs the LPA* plan after a wall/weight edit and repaints it."""
+        self.grid.clear_path()
+        self.stats = SearchStats(INCREMENTAL_ALGORITHM)
+        result = run_search(self.stats.measure(self.grid, self.planner.search()))
+        show_result(result)
+        self._show_stats()
+        print(f"LOG: Replanned - {result.nodes_expanded} nodes re-expanded, "
+              f"{'path cost ' + str(result.cost) if result.found else 'no path'}.")
+
+    def _close_planner(self):
+        if self.planner:
+            self.planner.close()
+            self.planner = None
     
     def run_visualization(self):
         """Starts the selected pathfinding algorithm."""
@@ -161,55 +300,248 @@ class PathfindingVisualizer(tk.Tk):
             print("LOG: Visualization blocked - already running or missing start/end node.")
             return
         
-        print(f"LOG: Starting {self.tk_state.algorithm_var.get()}")
-        self.is_running = True
-        self._toggle_controls(tk.DISABLED)
+        algorithm = self.tk_state.algorithm_var.get()
+        try:
+            check_movement(self.grid, algorithm)
+        except ValueError as e:
+            print(f"LOG: Visualization blocked - {e}.")
+            return
+
+        print(f"LOG: Starting {algorithm}")
         self.clear_path(draw=False)
 
-        algorithm_func = ALGORITHM_MAP[self.tk_state.algorithm_var.get()]
-        
-        # We now need a callback that only draws the entire grid.
-        # This is less performant but much simpler for the generator model.
-        draw_callback = lambda: self.draw_grid(full_redraw=True)
-        algo_generator = algorithm_func(self.grid, draw_callback)
+        self._close_planner()
+        if self.tk_state.instant_var.get():
+            self._run_instant(algorithm)
+            return
+
+        if algorithm == INCREMENTAL_ALGORITHM:
+            # Keep the planner so later wall edits are replanned incrementally.
+            # It runs live: its replans are not part of any trace.
+            self.planner = LPAStar(self.grid, self.grid.start_node, self.grid.end_node)
+            self.stats = SearchStats(algorithm)
+            self._play(animate_steps(self.stats.measure(self.grid, self.planner.search()), lambda: None))
+        else:
+            # Record at full speed, then replay the trace.
+            self.stats = SearchStats()
+            trace = record(self.grid, self.grid.start_node, self.grid.end_node, instrumented(algorithm, self.stats))
+            self._show_stats()
+            print(f"LOG: Recorded {trace.steps} steps, {len(trace.cells)} events.")
+            self._open_replay(trace)
+            self._play(self._replay_steps())
+
+    def _play(self, steps):
+        """
+        Runs the step iterator `steps` on the animation clock. Steps are paid
+        for with credit that accrues at the slider's rate. Each frame spends
+        it, but for at most FRAME_BUDGET ms, then draws once. Slow speeds take
+        a step every few frames; fast ones are limited only by how quickly
+        the steps themselves run. The iterator returns True if a path was found.
+        """
+        self.is_running = True
+        self._toggle_controls(tk.DISABLED)
+        credit = 1.0
+        last_frame = time.perf_counter()
 
-        def _step_animation():
+        def _run_frame():
+            nonlocal credit, last_frame
+            frame_start = time.perf_counter()
+            rate = self._steps_per_second()
+            # Cap the credit at 0.1 s worth so a stalled frame does not cause a burst later.
+            credit = min(credit + (frame_start - last_frame) * rate, rate / 10 + 1)
+            last_frame = frame_start
+            deadline = frame_start + FRAME_BUDGET / 1000
             try:
-                next(algo_generator)
-                self.animation_job = self.after(int(self.tk_state.speed_var.get()), _step_animation)
+                while credit >= 1:
+                    next(steps)
+                    credit -= 1
+                    if time.perf_counter() >= deadline:
+                        break
             except StopIteration as e:
-                # The algorithm function will return True on success
                 if not e.value:
                     print("LOG: No path found.")
                 else:
                     print("LOG: Path found successfully.")
-                self.is_running = False
-                self._toggle_controls(tk.NORMAL)
-        
-        _step_animation()
+                self.animation_job = None
+                self.stop_animation()
+                self.draw_grid()
+                self._show_stats()
+                return
+            self.draw_grid()
+            self._show_replay_position()
+            self._show_stats()
+            self.animation_job = self.after(FRAME_INTERVAL, _run_frame)
+
+        _run_frame()
+
+    def _show_stats(self):
+        if self.stats is not None:
+            self.stats_label.configure(text=f"{self.stats.algorithm}\n{self.stats.summary()}")
+
+    # --- Trace replay ---
+    def _open_replay(self, trace):
+        self.player = TracePlayer(trace)
+        self.replay_scale.configure(to=trace.steps)
+        self._show_replay_position()
+
+    def _close_replay(self):
+        if self.player:
+            self.player = None
+            self.replay_scale.configure(to=0)
+            self._show_replay_position()
+
+    def _show_replay_position(self):
+        if self.player:
+            self.tk_state.replay_var.set(self.player.step)
+            self.replay_label.config(text=f"Step {self.player.step} / {self.player.trace.steps}")
+        else:
+            self.tk_state.replay_var.set(0)
+            self.replay_label.config(text="No trace")
+
+    def _seek_replay(self, step):
+        """Moves the replay to `step`, repainting only the cells that differ."""
+        player = self.player
+        changed = player.seek(step)
+        overlay, cell_at = player.overlay, self.grid.cell_at
+        for index in changed:
+            node = cell_at(index)
+            if node.state not in (NodeState.START, NodeState.END, NodeState.WALL):
+                node.state = REPLAY_STATES[overlay[index]]
+
+    def _replay_steps(self):
+        """Replays the trace one step at a time, from wherever the player is."""
+        while self.player.step < self.player.trace.steps:
+            self._seek_replay(self.player.step + 1)
+            yield
+        return self.player.trace.found
+
+    def _scrub_replay(self, value):
+        if self.player:
+            self._seek_replay(round(float(value)))
+            self._show_replay_position()
+            self.draw_grid()
+
+    def toggle_replay(self):
+        """Pauses a running replay, or plays the current trace from its position."""
+        if self.animation_job and self.player:
+            self.stop_animation()
+        elif self.player and not self.is_running:
+            if self.player.step == self.player.trace.steps:
+                self._scrub_replay(0)
+            self._play(self._replay_steps())
+
+    def save_trace(self):
+        if not self.player:
+            print("LOG: No trace to save - run a search first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".trace", filetypes=[("Search traces", "*.trace")])
+        if path:
+            self.player.trace.save(path)
+            print(f"LOG: Saved trace to {path}.")
+
+    def load_trace(self):
+        """Loads a saved trace together with the map it was recorded on."""
+        path = filedialog.askopenfilename(filetypes=[("Search traces", "*.trace"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            trace = SearchTrace.load(path)
+        except (OSError, ValueError) as e:
+            print(f"LOG: Could not load trace - {e}")
+            return
+        self._close_planner()
+        if (trace.rows, trace.cols) != (self.grid.rows, self.grid.cols):
+            self._replace_grid(Grid(trace.rows, trace.cols, self.grid.diagonal))
+        self.grid.set_walls(trace.walls.translate(TRACE_WALLS))
+        cell_at = self.grid.cell_at
+        for index, (wall, cost) in enumerate(zip(trace.walls, trace.weights)):
+            if cost != DEFAULT_COST and not wall:
+                self.grid.set_weight(cell_at(index), cost)
+        self.grid.set_start(cell_at(trace.start))
+        self.grid.set_end(cell_at(trace.goal))
+        self.connectivity.rebuild()
+        self.tk_state.algorithm_var.set(trace.algorithm)
+        self._open_replay(trace)
+        self.draw_grid(full_redraw=True)
+        print(f"LOG: Loaded {trace}.")
+
+    def load_map(self):
+        """Opens a Moving AI .map file as the grid."""
+        path = filedialog.askopenfilename(filetypes=[("Moving AI maps", "*.map"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            grid = load_map(path, Grid, self.grid.diagonal)
+        except (OSError, ValueError) as e:
+            print(f"LOG: Could not load map - {e}")
+            return
+        self._close_planner()
+        self._close_replay()
+        self._replace_grid(grid)
+        self.connectivity.rebuild()
+        print(f"LOG: Loaded {grid.rows}x{grid.cols} map from {path}.")
+
+    def save_map(self):
+        """Saves the walls as a Moving AI .map file (cell costs are not part of the format)."""
+        path = filedialog.asksaveasfilename(defaultextension=".map", filetypes=[("Moving AI maps", "*.map")])
+        if path:
+            save_map(self.grid, path)
+            print(f"LOG: Saved map to {path}.")
+
+    def _replace_grid(self, grid):
+        self.grid = grid
+        self.connectivity = shared_connectivity(grid)
+        self.renderer.grid = grid
+        self.renderer.build()
+
+    def _run_instant(self, algorithm):
+        """Runs the search headlessly and paints the finished result in one frame."""
+        start, end = self.grid.start_node, self.grid.end_node
+        if algorithm == INCREMENTAL_ALGORITHM:
+            self.planner = LPAStar(self.grid, start, end)
+            self.stats = SearchStats(algorithm)
+            result = run_search(self.stats.measure(self.grid, self.planner.search()))
+        else:
+            self.stats = SearchStats()
+            result = find_path(self.grid, start, end, instrumented(algorithm, self.stats))
+        show_result(result)
+        self._show_stats()
+        print(f"LOG: {result.nodes_expanded} nodes expanded, "
+              f"{'path cost ' + str(result.cost) if result.found else 'no path found'}.")
+        self.draw_grid()
+        self.is_running = False
+        self._toggle_controls(tk.NORMAL)
 
     def stop_animation(self):
-        """Stops any running animation."""
+        """Stops any running animation (a replay stays where it is)."""
         if self.animation_job:
             self.after_cancel(self.animation_job)
             self.animation_job = None
         self.is_running = False
         self._toggle_controls(tk.NORMAL)
+        self._show_replay_position()
     
     def clear_path(self, draw=True):
         if self.is_running: self.stop_animation()
+        self._close_replay()
         self.grid.clear_path()
         if draw:
-            self.draw_grid(full_redraw=True)
+            self.draw_grid()
         
     def generate_random_walls(self):
         if self.is_running: self.stop_animation()
-        self.grid.generate_random_walls()
-        self.draw_grid(full_redraw=True)
+        self._close_planner()
+        self._close_replay()
+        seed = self.tk_state.seed_var.get().strip() or None # Any text works as a seed
+        generate(self.grid, self.tk_state.generator_var.get(), seed=seed)
+        self.connectivity.rebuild()
+        self.draw_grid()
 
     def reset_all(self):
         if self.is_running: self.stop_animation()
+        self._close_planner()
+        self._close_replay()
         self.grid.clear_all()
         # Reset the tool selection back to default
         self.tk_state.tool_var.set("start")
-        self.draw_grid(full_redraw=True)
\ No newline at end of file
+        self.draw_grid()
\ No newline at end of file
@@ -0,0 +1,224 @@
+# app/wavefront.py
+
+from array import array
+from itertools import islice
+
+# Bit-parallel breadth-first search. The walkable cells of the grid are packed
+# into one Python int (bit p = row * width + col, with one always-empty pad
+# column per row so shifts never wrap between rows). A whole BFS layer is then
+# expanded with four shifts and a mask:
+#
+#     next = (frontier << 1 | frontier >> 1 | frontier << width | frontier >> width) & unseen
+#
+# Each layer costs a handful of big-int operations done in C over 64 cells
+# per machine word, instead of a Python loop iteration per cell.
+#
+# Layers stay bit masks. Nothing is done per cell while the wavefront runs:
+# cells are only decoded when a caller iterates over them, and distances
+# are read back from three masks holding the layers by distance mod 3 (see
+# DistanceField).
+
+# Byte -> 1 if any bit set, and byte -> offsets of its set bits.
+_NONZERO = bytes([0] + [1] * 255)
+_BIT_OFFSETS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+# Walkable byte (grid.adjacency.open) -> ASCII "0" or "1".
+_ASCII_TABLE = b"0" + b"1" * 255
+
+def _walkable_bits(grid):
+    """Packs the walkable cells of a Grid or CompactGrid into an int."""
+    text = grid.adjacency.open.translate(_ASCII_TABLE)
+    cols = grid.cols
+    rows = [text[start:start + cols] + b"0" for start in range(0, grid.rows * cols, cols)]
+    # int(..., 2) reads the most significant bit first, so reverse the text.
+    return int(b"".join(rows)[::-1] or b"0", 2)
+
+def _decode(bits):
+    """Returns the positions of the set bits of a (sparse) int, ascending."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    find = data.translate(_NONZERO).find
+    positions = []
+    index = find(1)
+    while index >= 0:
+        base = index * 8
+        for bit in _BIT_OFFSETS[data[index]]:
+            positions.append(base + bit)
+        index = find(1, index + 1)
+    return positions
+
+def waves(free, width, source_bit, target_bit=0):
+    """
+    Yields the BFS layers (as bit masks) starting from `source_bit` over the
+    walkable mask `free`. Stops after the layer containing `target_bit`, or
+    when no cells remain reachable.
+    """
+    frontier = source_bit
+    unseen = free & ~source_bit
+    while frontier:
+        yield frontier
+        if frontier & target_bit:
+            return
+        grown = (frontier << 1) | (frontier >> 1) | (frontier << width) | (frontier >> width)
+        frontier = grown & unseen
+        unseen ^= frontier
+
+class LayerCells:
+    """
+    The cells of one wavefront layer. Stands in for a list of cells in
+    search steps: len() is a popcount, and the cells are only decoded when
+    iterated.
+    """
+    def __init__(self, field, bits):
+        self.field = field
+        self.bits = bits
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        return map(self.field._cell, _decode(self.bits))
+
+class ReachedCells:
+    """
+    Every cell a DistanceField reached, layer by layer. Used as
+    SearchResult.expanded; iterating reruns the wavefront rather than
+    keeping the layers around.
+    """
+    def __init__(self, field):
+        self.field = field
+
+    def __len__(self):
+        return self.field.reached
+
+    def __iter__(self):
+        field = self.field
+        for layer in islice(field.waves(), field.layers):
+            yield from LayerCells(field, layer)
+
+class DistanceField:
+    """
+    Exact step distances from one source cell to every cell reached by the
+    wavefront. Built by `distance_field`. Because the grid is undirected and
+    unit-cost, a field built from a goal is also an exact heuristic for A*
+    searches towards that goal (see `heuristic`).
+
+    The field keeps three masks, `residues[k]` holding the layers whose
+    distance is k mod 3. Neighbouring cells are at most one step apart, so
+    those residues tell a cell's neighbour one step closer to the source
+    from the others. Distances and paths are found by walking down that
+    way, and distances are remembered as they are found.
+    """
+    def __init__(self, grid, source, target=None):
+        self.grid = grid
+        self.source = source
+        self.width = grid.cols + 1
+        self.free = _walkable_bits(grid) # The walkable cells when the field was built
+        self.target_bit = 1 << self._bit(target) if target is not None else 0
+        self.residues = [0, 0, 0]
+        self.layers = 0       # number of BFS layers computed
+        self.reached = 0      # number of cells in those layers
+        self.complete = True  # False if the wavefront stopped early at a target
+        self._known = None    # Distances found so far, -1 if not yet
+        self._lookup = None   # residues as bytes, for single-bit tests
+
+    def _bit(self, cell):
+        row, col = self.grid.position(cell)
+        return row * self.width + col
+
+    def _cell(self, bit):
+        return self.grid.get_node(*divmod(bit, self.width))
+
+    def waves(self):
+        """The layers of the field as bit masks, recomputed from the start."""
+        return waves(self.free, self.width, 1 << self._bit(self.source), self.target_bit)
+
+    def add_layer(self, layer):
+        """Records the next layer (a bit mask) of the wavefront."""
+        self.residues[self.layers % 3] |= layer
+        self.layers += 1
+        self.reached += layer.bit_count()
+        self._lookup = None
+        if layer & self.target_bit:
+            self.complete = False
+
+    def _residue(self, bit):
+        """The distance of cell `bit` mod 3, or None if it was not reached."""
+        if self._lookup is None:
+            size = (self.grid.rows * self.width + 7) // 8
+            self._lookup = [mask.to_bytes(size, "little") for mask in self.residues]
+        byte, shift = bit >> 3, bit & 7
+        for residue, data in enumerate(self._lookup):
+            if data[byte] >> shift & 1:
+                return residue
+        return None
+
+    def _closer(self, bit):
+        """The neighbour of reached cell `bit` that is one step closer to the source."""
+        wanted = (self._residue(bit) - 1) % 3
+        for step in (1, -1, self.width, -self.width):
+            neighbor = bit + step
+            if 0 <= neighbor < self.grid.rows * self.width and self._residue(neighbor) == wanted:
+                return neighbor
+
+    def _distance(self, bit):
+        if self._known is None:
+            self._known = array("i", [-1]) * (self.grid.rows * self.width)
+            self._known[self._bit(self.source)] = 0
+        known = self._known
+        if known[bit] < 0 and self._residue(bit) is None:
+            return None
+        trail = []
+        while known[bit] < 0:
+            trail.append(bit)
+            bit = self._closer(bit)
+        distance = known[bit]
+        for bit in reversed(trail):
+            distance += 1
+            known[bit] = distance
+        return distance
+
+    def distance(self, cell):
+        """Steps from the source to `cell`, or None if it was not reached."""
+        return self._distance(self._bit(cell))
+
+    def heuristic(self, cell, goal):
+        """
+        Exact remaining distance for A* when the field was built from `goal`.
+        Unreached cells get infinity, as they cannot reach the goal.
+        """
+        distance = self._distance(self._bit(cell))
+        return distance if distance is not None else float("inf")
+
+    def path_to(self, cell):
+        """
+        Returns a shortest path from the source to `cell` by walking down the
+        distances, or [] if `cell` was not reached.
+        """
+        bit, source = self._bit(cell), self._bit(self.source)
+        if self._residue(bit) is None:
+            return []
+        bits = [bit]
+        while bit != source:
+            bit = self._closer(bit)
+            bits.append(bit)
+        bits.reverse()
+        return [self._cell(b) for b in bits]
+
+def iter_layers(grid, source, target=None):
+    """
+    Runs the wavefront from `source`, yielding `(field, layer)` for each
+    layer, where `layer` is the layer's bit mask (LayerCells decodes it).
+    The field is filled in as the layers are produced.
+    """
+    field = DistanceField(grid, source, target)
+    for layer in field.waves():
+        field.add_layer(layer)
+        yield field, layer
+
+def distance_field(grid, source, target=None):
+    """
+    Computes the BFS distance field from `source`. With a `target`, the
+    wavefront stops as soon as the target's layer is reached.
+    """
+    for field, _ in iter_layers(grid, source, target):
+        pass
+    return field
@@ -0,0 +1,62 @@
+# app/workspace.py
+
+import contextlib
+import weakref
+from array import array
+
+class SearchWorkspace:
+    """
+    Scratch arrays for one search over a grid of `size` cells: a score and
+    a parent (cell index) per cell, plus a stamp saying whether they belong
+    to the current query. Nothing is cleared between queries. begin()
+    moves the generation on, which makes every older stamp stale at once,
+    so a query only ever touches the cells it explores.
+
+    For the generation g returned by begin(), a cell's stamp is
+        < g      not reached by this query (its score and parent are junk)
+        == g     reached: scores[i] and parents[i] are valid
+        == g + 1 closed (expanded); its score and parent are still valid
+    """
+    def __init__(self, size):
+        self.size = size
+        self.generation = 0
+        self.stamps = array("I", bytes(4 * size))
+        # Doubles: 8-connected scores are multiples of sqrt(2), and integer
+        # costs stay exact far beyond any path a grid can hold.
+        self.scores = array("d", bytes(8 * size))
+        self.parents = array("i", bytes(4 * size))
+
+    def begin(self):
+        """Starts a new query and returns its generation."""
+        self.generation += 2
+        if self.generation >= 2 ** 32 - 1: # Stamps would wrap: clear them once
+            self.stamps = array("I", bytes(4 * self.size))
+            self.generation = 2
+        return self.generation
+
+    def path_to(self, grid, index):
+        """The cells from the query's start to cell `index`, following parents."""
+        parents, cell_at = self.parents, grid.cell_at
+        path = []
+        while index != -1:
+            path.append(cell_at(index))
+            index = parents[index]
+        path.reverse()
+        return path
+
+# Idle workspaces per grid. A search borrows one for as long as it runs, so
+# searches interleaved on the same grid each get their own.
+_pools = weakref.WeakKeyDictionary()
+
+@contextlib.contextmanager
+def borrowed_workspace(grid):
+    """Lends a SearchWorkspace sized for `grid` and takes it back afterwards."""
+    pool = _pools.get(grid)
+    if pool is None:
+        pool = _pools[grid] = []
+    size = grid.rows * grid.cols
+    workspace = pool.pop() if pool else SearchWorkspace(size)
+    try:
+        yield workspace
+    finally:
+        pool.append(workspace)
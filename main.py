@@ -1,7 +1,13 @@
 # main.py
 
+import argparse
+from app.constants import GRID_ROWS, GRID_COLS
 from app.visualizer import PathfindingVisualizer
 
 if __name__ == "__main__":
-    app = PathfindingVisualizer()
+    parser = argparse.ArgumentParser(description="Pathfinding visualizer")
+    parser.add_argument("--rows", type=int, default=GRID_ROWS)
+    parser.add_argument("--cols", type=int, default=GRID_COLS)
+    args = parser.parse_args()
+    app = PathfindingVisualizer(args.rows, args.cols)
     app.mainloop()
\ No newline at end of file
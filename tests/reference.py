@@ -0,0 +1,95 @@
+# tests/reference.py
+#
+# Plain, obviously correct implementations and small helpers shared by the
+# tests. Everything works through the public grid interface, so each helper
+# runs on both Grid and CompactGrid.
+
+import collections
+import heapq
+import math
+import random
+
+from app.compact_grid import CompactGrid
+from app.constants import NodeState
+from app.grid import Grid
+
+GRID_CLASSES = [Grid, CompactGrid]
+
+def set_wall(grid, cell, wall):
+    state = NodeState.WALL if wall else NodeState.EMPTY
+    if isinstance(grid, CompactGrid):
+        grid.set_state(cell, state)
+    else:
+        cell.state = state
+
+def reference_cost(grid, start, goal):
+    """Cheapest start -> goal cost by textbook Dijkstra over (row, col), or None."""
+    rows, cols = grid.rows, grid.cols
+    def free(row, col):
+        return 0 <= row < rows and 0 <= col < cols and grid.is_walkable(grid.get_node(row, col))
+    moves = [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)
+             if (d_row or d_col) and (grid.diagonal or not (d_row and d_col))]
+    source, target = grid.position(start), grid.position(goal)
+    best = {source: 0}
+    heap = [(0, source)]
+    while heap:
+        dist, (row, col) = heapq.heappop(heap)
+        if (row, col) == target:
+            return dist
+        if dist > best[row, col]:
+            continue
+        for d_row, d_col in moves:
+            r, c = row + d_row, col + d_col
+            if not free(r, c) or (d_row and d_col and not (free(r, col) and free(row, c))):
+                continue
+            step = grid.cost(grid.get_node(r, c)) * (math.sqrt(2) if d_row and d_col else 1)
+            if dist + step < best.get((r, c), math.inf):
+                best[r, c] = dist + step
+                heapq.heappush(heap, (dist + step, (r, c)))
+    return None
+
+def step_distances(grid, start):
+    """Steps from `start` to every reachable cell, by BFS over get_neighbors."""
+    distances = {start: 0}
+    queue = collections.deque([start])
+    while queue:
+        cell = queue.popleft()
+        for neighbor in grid.get_neighbors(cell):
+            if neighbor not in distances:
+                distances[neighbor] = distances[cell] + 1
+                queue.append(neighbor)
+    return distances
+
+def reachable(grid, start):
+    """Cells reachable from `start`."""
+    return set(step_distances(grid, start))
+
+def random_grid(grid_class, rows, cols, seed, density=0.3, weights=False, diagonal=False):
+    grid = grid_class(rows, cols)
+    grid.generate_random_walls(density, seed=seed)
+    grid.set_diagonal(diagonal)
+    if weights:
+        rng = random.Random(seed)
+        for _ in range(rows * cols // 4):
+            cell = grid.cell_at(rng.randrange(rows * cols))
+            if grid.is_walkable(cell):
+                grid.set_weight(cell, rng.choice((2, 3, 5, 9)))
+    return grid
+
+def open_pairs(grid, rng, count):
+    """`count` random (start, goal) pairs of walkable cells."""
+    cells = [grid.cell_at(index) for index in range(grid.rows * grid.cols)]
+    cells = [cell for cell in cells if grid.is_walkable(cell)]
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+def assert_valid_path(grid, result):
+    for a, b in zip(result.path, result.path[1:]):
+        (r1, c1), (r2, c2) = grid.position(a), grid.position(b)
+        assert max(abs(r1 - r2), abs(c1 - c2)) == 1
+        assert grid.is_walkable(b)
+
+def assert_same_cost(result, expected):
+    if expected is None:
+        assert not result.found
+    else:
+        assert result.found and math.isclose(result.cost, expected)
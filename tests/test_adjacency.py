@@ -0,0 +1,66 @@
+# tests/test_adjacency.py
+
+import random
+
+import pytest
+
+from app.adjacency import DIRECTIONS, Adjacency
+from app.engine import DIAGONAL_SEARCHES, SEARCHES, find_path
+
+from .reference import GRID_CLASSES, assert_same_cost, assert_valid_path, open_pairs, random_grid, reference_cost, set_wall
+
+def expected_neighbors(grid, cell):
+    """Walkable neighbours in DIRECTIONS order, diagonals only without corner cutting."""
+    row, col = grid.position(cell)
+    def free(r, c):
+        return 0 <= r < grid.rows and 0 <= c < grid.cols and grid.is_walkable(grid.get_node(r, c))
+    moves = DIRECTIONS if grid.diagonal else DIRECTIONS[:4]
+    return [grid.get_node(row + d_row, col + d_col) for d_row, d_col in moves
+            if free(row + d_row, col + d_col) and (not (d_row and d_col) or (free(row + d_row, col) and free(row, col + d_col)))]
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_neighbors_match_the_rules(grid_class, diagonal):
+    grid = random_grid(grid_class, 13, 17, seed=50, density=0.35, diagonal=diagonal)
+    for index in range(13 * 17):
+        cell = grid.cell_at(index)
+        assert grid.get_neighbors(cell) == expected_neighbors(grid, cell)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_adjacency_edits_match_rebuild(grid_class):
+    grid = random_grid(grid_class, 17, 23, seed=13)
+    rng = random.Random(5)
+    for _ in range(300):
+        cell = grid.cell_at(rng.randrange(grid.rows * grid.cols))
+        set_wall(grid, cell, grid.is_walkable(cell))
+    adjacency = grid.adjacency
+    assert adjacency.links == Adjacency(grid.rows, grid.cols, adjacency.open).links
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("size", [(20, 27), (15, 2), (2, 15)])
+@pytest.mark.parametrize("algorithm", ["A* Search", "Dijkstra"])
+def test_diagonal_searches_match_octile_reference(grid_class, size, algorithm):
+    grid = random_grid(grid_class, *size, seed=5, density=0.2, weights=True, diagonal=True)
+    for start, goal in open_pairs(grid, random.Random(2), 40):
+        result = find_path(grid, start, goal, algorithm)
+        assert_same_cost(result, reference_cost(grid, start, goal))
+        assert_valid_path(grid, result)
+        for a, b in zip(result.path, result.path[1:]): # No cutting a wall's corner
+            (r1, c1), (r2, c2) = grid.position(a), grid.position(b)
+            assert grid.is_walkable(grid.get_node(r1, c2)) and grid.is_walkable(grid.get_node(r2, c1))
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_switching_movement_mode(grid_class):
+    grid = random_grid(grid_class, 10, 10, seed=51)
+    seen = []
+    grid.watch(seen.append)
+    grid.set_diagonal(True)
+    grid.set_diagonal(True) # No change, no notification
+    assert seen == [None]
+    start, goal = open_pairs(grid, random.Random(51), 1)[0]
+    for algorithm in SEARCHES:
+        if algorithm in DIAGONAL_SEARCHES:
+            find_path(grid, start, goal, algorithm)
+        else:
+            with pytest.raises(ValueError):
+                find_path(grid, start, goal, algorithm)
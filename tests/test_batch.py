@@ -0,0 +1,36 @@
+# tests/test_batch.py
+
+import random
+
+import pytest
+
+from app.batch import solve_batch
+from app.engine import find_path
+
+from .reference import GRID_CLASSES, open_pairs, random_grid
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_batch_matches_find_path(grid_class, diagonal):
+    grid = random_grid(grid_class, 25, 30, seed=14, density=0.3, weights=True, diagonal=diagonal)
+    queries = open_pairs(grid, random.Random(14), 50)
+    results = list(solve_batch(grid, queries, "Dijkstra", workers=2, chunksize=7))
+    assert [result.index for result in results] == list(range(len(queries)))
+    for (start, goal), result in zip(queries, results):
+        expected = find_path(grid, start, goal, "Dijkstra")
+        assert (result.start, result.goal) == (start, goal)
+        assert result.path == expected.path and result.cost == expected.cost
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_unordered_results_cover_every_query(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=15, density=0.35)
+    queries = open_pairs(grid, random.Random(15), 30)
+    results = list(solve_batch(grid, queries, workers=2, ordered=False, chunksize=4))
+    assert sorted(result.index for result in results) == list(range(len(queries)))
+    for result in results:
+        assert result.cost == find_path(grid, result.start, result.goal).cost
+
+def test_movement_mode_is_checked():
+    grid = random_grid(GRID_CLASSES[1], 10, 10, seed=16, diagonal=True)
+    with pytest.raises(ValueError):
+        list(solve_batch(grid, [(0, 99)], "Jump Point Search", workers=1))
@@ -0,0 +1,39 @@
+# tests/test_bidirectional.py
+
+import random
+
+import pytest
+
+from app.engine import find_path
+
+from .reference import GRID_CLASSES, assert_same_cost, assert_valid_path, open_pairs, random_grid, reference_cost
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_bidirectional_bfs_finds_fewest_steps(grid_class):
+    grid = random_grid(grid_class, 30, 35, seed=1, density=0.3)
+    for start, goal in open_pairs(grid, random.Random(1), 40):
+        result = find_path(grid, start, goal, "Bidirectional BFS")
+        bfs = find_path(grid, start, goal, "Breadth-First Search (BFS)")
+        assert result.found == bfs.found and len(result.path) == len(bfs.path)
+        if result.found:
+            assert result.path[0] == start and result.path[-1] == goal
+        assert_valid_path(grid, result)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_bidirectional_a_star_finds_cheapest_path(grid_class):
+    grid = random_grid(grid_class, 24, 31, seed=2, weights=True)
+    for start, goal in open_pairs(grid, random.Random(2), 40):
+        result = find_path(grid, start, goal, "Bidirectional A*")
+        assert_same_cost(result, reference_cost(grid, start, goal))
+        assert_valid_path(grid, result)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("algorithm", ["Bidirectional BFS", "Bidirectional A*"])
+def test_wall_endpoints_have_no_path(grid_class, algorithm):
+    grid = random_grid(grid_class, 15, 15, seed=3, density=0.3)
+    cells = [grid.cell_at(index) for index in range(15 * 15)]
+    wall = next(cell for cell in cells if not grid.is_walkable(cell) and grid.get_neighbors(cell))
+    open_cell = next(cell for cell in cells if grid.is_walkable(cell))
+    for start, goal in ((open_cell, wall), (wall, open_cell), (wall, wall)):
+        result = find_path(grid, start, goal, algorithm)
+        assert not result.found and result.path == []
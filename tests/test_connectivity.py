@@ -0,0 +1,63 @@
+# tests/test_connectivity.py
+
+import gc
+import random
+import weakref
+
+import pytest
+
+from app.connectivity import ConnectivityIndex, shared_connectivity
+from app.engine import find_path
+
+from .reference import GRID_CLASSES, open_pairs, random_grid, reachable, set_wall
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("density", [0.2, 0.4, 0.5])
+def test_labels_match_reachability(grid_class, density):
+    for seed in range(3):
+        grid = random_grid(grid_class, 23, 29, seed=seed, density=density)
+        index = ConnectivityIndex(grid)
+        try:
+            for start, goal in open_pairs(grid, random.Random(seed), 40):
+                assert index.may_connect(start, goal) == (goal in reachable(grid, start))
+        finally:
+            index.close()
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_connectivity_tracks_edits(grid_class):
+    grid = random_grid(grid_class, 25, 25, seed=17, density=0.35)
+    index = ConnectivityIndex(grid)
+    rng = random.Random(6)
+    try:
+        for edit_round in range(30):
+            for _ in range(8):
+                cell = grid.cell_at(rng.randrange(grid.rows * grid.cols))
+                set_wall(grid, cell, grid.is_walkable(cell))
+            if edit_round == 15:
+                grid.generate_random_walls(0.3, seed=19) # A bulk change relabels from scratch
+            for start, goal in open_pairs(grid, rng, 10):
+                assert index.may_connect(start, goal) == (goal in reachable(grid, start))
+    finally:
+        index.close()
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_find_path_skips_disconnected_queries(grid_class):
+    grid = grid_class(9, 9)
+    for row in range(9):
+        set_wall(grid, grid.get_node(row, 4), True)
+    start, goal = grid.get_node(0, 0), grid.get_node(8, 8)
+    result = find_path(grid, start, goal, "Dijkstra")
+    assert not result.found and result.nodes_expanded == 0
+    assert find_path(grid, start, goal, "Dijkstra", precheck=False).nodes_expanded > 0
+    wall = grid.get_node(4, 4)
+    assert shared_connectivity(grid).may_connect(start, wall) # Left to the search
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_shared_index_does_not_keep_the_grid_alive(grid_class):
+    grid = random_grid(grid_class, 10, 10, seed=18)
+    find_path(grid, grid.cell_at(0), grid.cell_at(99))
+    assert shared_connectivity(grid) is shared_connectivity(grid)
+    alive = weakref.ref(grid)
+    del grid
+    gc.collect()
+    assert alive() is None
@@ -0,0 +1,56 @@
+# tests/test_generators.py
+
+import random
+
+import pytest
+
+from app.compact_grid import CompactGrid
+from app.constants import NodeState
+from app.generators import GENERATORS, caves, generate
+
+from .reference import reachable
+
+MAZES = ["Recursive Backtracker", "Kruskal", "Prim", "Sidewinder"]
+
+def test_caves_match_cellular_automaton():
+    for seed in range(40):
+        rng = random.Random(seed)
+        rows, cols = rng.randint(1, 20), rng.randint(1, 20)
+        noise = random.Random(seed).randbytes(rows * cols)
+        walls = [[noise[row * cols + col] < int(0.45 * 256) for col in range(cols)] for row in range(rows)]
+        for _ in range(4):
+            def wall(row, col):
+                return not (0 <= row < rows and 0 <= col < cols) or walls[row][col]
+            count = [[sum(wall(row + d_row, col + d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)
+                          if d_row or d_col) for col in range(cols)] for row in range(rows)]
+            walls = [[count[row][col] >= 5 or (walls[row][col] and count[row][col] >= 4) for col in range(cols)]
+                     for row in range(rows)]
+        expected = bytearray(NodeState.WALL if walls[row][col] else NodeState.EMPTY
+                             for row in range(rows) for col in range(cols))
+        assert caves(rows, cols, random.Random(seed)) == expected
+
+@pytest.mark.parametrize("name", MAZES)
+@pytest.mark.parametrize("size", [(21, 31), (20, 30), (3, 3), (3, 40), (40, 3)])
+def test_mazes_are_perfect(name, size):
+    rows, cols = size
+    height, width = (rows - 1) // 2, (cols - 1) // 2
+    grid = generate(CompactGrid(rows, cols), name, seed=7)
+    open_cells = [cell for cell in range(rows * cols) if grid.is_walkable(cell)]
+    # Every maze cell is open, plus exactly one passage per tree edge.
+    assert len(open_cells) == 2 * height * width - 1
+    for i in range(height):
+        for j in range(width):
+            assert grid.is_walkable((2 * i + 1) * cols + 2 * j + 1)
+    assert reachable(grid, open_cells[0]) == set(open_cells)
+
+@pytest.mark.parametrize("name", GENERATORS)
+def test_seeds_are_reproducible(name):
+    first = GENERATORS[name](30, 41, random.Random(3))
+    assert len(first) == 30 * 41
+    assert GENERATORS[name](30, 41, random.Random(3)) == first
+
+def test_rooms_are_connected():
+    for seed in range(5):
+        grid = generate(CompactGrid(60, 80), "Rooms & Corridors", seed=seed)
+        open_cells = [cell for cell in range(60 * 80) if grid.is_walkable(cell)]
+        assert reachable(grid, open_cells[0]) == set(open_cells)
@@ -0,0 +1,58 @@
+# tests/test_hierarchy.py
+
+import random
+
+import pytest
+
+from app.compact_grid import CompactGrid
+from app.engine import run_search
+from app.hierarchy import ClusterGraph
+
+from .reference import GRID_CLASSES, assert_valid_path, open_pairs, random_grid, reference_cost, set_wall
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_cluster_graph_local_rebuilds_match_fresh_graph(grid_class):
+    grid = random_grid(grid_class, 34, 41, seed=23, density=0.2)
+    graph = ClusterGraph(grid)
+    rng = random.Random(7)
+    try:
+        for edit_round in range(12):
+            for _ in range(6):
+                cell = grid.cell_at(rng.randrange(grid.rows * grid.cols))
+                set_wall(grid, cell, grid.is_walkable(cell))
+            if edit_round == 6:
+                grid.generate_random_walls(0.2, seed=29)
+            start, goal = open_pairs(grid, rng, 1)[0]
+            result = run_search(graph.search(start, goal))
+            fresh = ClusterGraph(grid)
+            expected = run_search(fresh.search(start, goal))
+            fresh.close()
+            optimal = reference_cost(grid, start, goal)
+            assert result.found == expected.found == (optimal is not None)
+            if result.found:
+                assert result.cost >= optimal
+                if grid_class is CompactGrid: # Grid's tie-breaking follows node ids
+                    assert result.cost == expected.cost
+                assert result.path[0] == start and result.path[-1] == goal
+                assert_valid_path(grid, result)
+    finally:
+        graph.close()
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_an_edit_rebuilds_only_nearby_clusters(grid_class):
+    grid = random_grid(grid_class, 50, 50, seed=24, density=0.1)
+    graph = ClusterGraph(grid)
+    try:
+        start, goal = grid.cell_at(0), grid.cell_at(50 * 50 - 1)
+        set_wall(grid, start, False)
+        set_wall(grid, goal, False)
+        run_search(graph.search(start, goal))
+        built = graph.rebuilds
+        set_wall(grid, grid.get_node(25, 25), True) # Inside cluster (2, 2)
+        run_search(graph.search(start, goal))
+        assert graph.rebuilds - built == 1
+        set_wall(grid, grid.get_node(29, 29), True) # A corner: two borders, three clusters
+        run_search(graph.search(start, goal))
+        assert graph.rebuilds - built == 4
+    finally:
+        graph.close()
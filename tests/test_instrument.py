@@ -0,0 +1,67 @@
+# tests/test_instrument.py
+
+import random
+
+import pytest
+
+from app.engine import find_path, run_search
+from app.instrument import SearchStats, instrumented, profile_search
+
+from .reference import GRID_CLASSES, open_pairs, random_grid
+
+def measured(grid, start, goal, algorithm):
+    stats = SearchStats()
+    result = run_search(instrumented(algorithm, stats)(grid, start, goal))
+    return result, stats
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_counters_match_the_result(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=1, density=0.2)
+    for start, goal in open_pairs(grid, random.Random(1), 10):
+        result, stats = measured(grid, start, goal, "A* Search")
+        assert stats.done and stats.algorithm == "A* Search"
+        assert stats.expanded == result.nodes_expanded and stats.pushes == result.nodes_opened
+        assert stats.pops == stats.expanded + stats.stale
+        assert stats.neighbor_calls > 0 or result.nodes_expanded <= 1
+        assert result.cost == find_path(grid, start, goal).cost
+    assert "get_neighbors" not in vars(grid)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_interleaved_searches_count_separately(grid_class):
+    grid = random_grid(grid_class, 30, 30, seed=2, density=0.2)
+    (start_a, goal_a), (start_b, goal_b) = open_pairs(grid, random.Random(2), 2)
+    _, alone_a = measured(grid, start_a, goal_a, "A* Search")
+    _, alone_b = measured(grid, start_b, goal_b, "Breadth-First Search (BFS)")
+
+    stats_a, stats_b = SearchStats(), SearchStats()
+    steps_a = instrumented("A* Search", stats_a)(grid, start_a, goal_a)
+    steps_b = instrumented("Breadth-First Search (BFS)", stats_b)(grid, start_b, goal_b)
+    running = [steps_a, steps_b]
+    while running:
+        for steps in list(running):
+            try:
+                next(steps)
+            except StopIteration:
+                running.remove(steps)
+    assert "get_neighbors" not in vars(grid) # Nothing stays shadowed
+    assert stats_a.neighbor_calls == alone_a.neighbor_calls
+    assert stats_b.neighbor_calls == alone_b.neighbor_calls
+
+    calls = stats_a.neighbor_calls
+    find_path(grid, start_b, goal_b) # An unmeasured search afterwards is not counted
+    assert stats_a.neighbor_calls == calls
+
+def test_profile_search_times_the_connectivity_check():
+    grid = random_grid(GRID_CLASSES[1], 25, 25, seed=3, density=0.3)
+    for start, goal in open_pairs(grid, random.Random(3), 10):
+        result, stats = profile_search(grid, start, goal, "Dijkstra")
+        assert stats.done and result.cost == find_path(grid, start, goal, "Dijkstra").cost
+        assert stats.phases["connectivity"] > 0
+    assert "get_neighbors" not in vars(grid)
+
+def test_movement_mode_is_checked():
+    grid = random_grid(GRID_CLASSES[1], 10, 10, seed=4, diagonal=True)
+    with pytest.raises(ValueError):
+        instrumented("Jump Point Search", SearchStats())(grid, 0, 99)
+    with pytest.raises(ValueError):
+        profile_search(grid, 0, 99, "Jump Point Search")
@@ -0,0 +1,37 @@
+# tests/test_jump_point.py
+
+import random
+
+import pytest
+
+from app.engine import find_path
+
+from .reference import GRID_CLASSES, assert_valid_path, open_pairs, random_grid, set_wall
+
+def assert_matches_bfs(grid, pairs):
+    for start, goal in pairs:
+        jps = find_path(grid, start, goal, "Jump Point Search")
+        bfs = find_path(grid, start, goal, "Breadth-First Search (BFS)")
+        assert jps.found == bfs.found and jps.cost == bfs.cost
+        assert_valid_path(grid, jps)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("density", [0.0, 0.05, 0.25, 0.4])
+def test_jump_point_search_matches_bfs(grid_class, density):
+    grid = random_grid(grid_class, 30, 37, seed=7, density=density)
+    assert_matches_bfs(grid, open_pairs(grid, random.Random(3), 40))
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("size", [(1, 20), (20, 1), (2, 65)])
+def test_thin_grids(grid_class, size):
+    grid = random_grid(grid_class, *size, seed=5, density=0.1)
+    assert_matches_bfs(grid, open_pairs(grid, random.Random(5), 20))
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_follows_wall_edits(grid_class):
+    grid = random_grid(grid_class, 25, 25, seed=8, density=0.2)
+    rng = random.Random(8)
+    for _ in range(10):
+        for _ in range(15):
+            set_wall(grid, grid.cell_at(rng.randrange(25 * 25)), rng.random() < 0.5)
+        assert_matches_bfs(grid, open_pairs(grid, rng, 8))
@@ -0,0 +1,54 @@
+# tests/test_landmarks.py
+
+import random
+
+import pytest
+
+from app.engine import find_path, landmark_a_star
+from app.landmarks import LandmarkHeuristic
+
+from .reference import GRID_CLASSES, assert_same_cost, assert_valid_path, open_pairs, random_grid, reference_cost, set_wall
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("weights", [False, True])
+def test_alt_finds_cheapest_path(grid_class, weights):
+    grid = random_grid(grid_class, 24, 29, seed=9, weights=weights)
+    for start, goal in open_pairs(grid, random.Random(9), 30):
+        result = find_path(grid, start, goal, "A* + Landmarks (ALT)")
+        assert_same_cost(result, reference_cost(grid, start, goal))
+        assert_valid_path(grid, result)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_bounds_are_admissible(grid_class):
+    grid = random_grid(grid_class, 18, 21, seed=10, weights=True)
+    landmarks = LandmarkHeuristic(grid, count=4)
+    for cell, goal in open_pairs(grid, random.Random(10), 60):
+        cost = reference_cost(grid, cell, goal)
+        if cost is not None:
+            assert landmarks.bound_for(goal)(cell, goal) <= cost
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_interleaved_searches_keep_their_own_goal(grid_class):
+    grid = random_grid(grid_class, 30, 30, seed=11, density=0.25, weights=True)
+    pairs = open_pairs(grid, random.Random(11), 6)
+    searches = [landmark_a_star(grid, start, goal) for start, goal in pairs]
+    results = [None] * len(searches)
+    while None in results:
+        for i, steps in enumerate(searches):
+            if results[i] is None:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    results[i] = stop.value
+    for (start, goal), result in zip(pairs, results):
+        assert_same_cost(result, reference_cost(grid, start, goal))
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_tables_follow_wall_edits(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=12, density=0.2)
+    rng = random.Random(12)
+    for _ in range(5):
+        for _ in range(10):
+            set_wall(grid, grid.cell_at(rng.randrange(20 * 20)), rng.random() < 0.5)
+        for start, goal in open_pairs(grid, rng, 10):
+            assert_same_cost(find_path(grid, start, goal, "A* + Landmarks (ALT)"), reference_cost(grid, start, goal))
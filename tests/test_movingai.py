@@ -0,0 +1,88 @@
+# tests/test_movingai.py
+
+import random
+
+import pytest
+
+from app.compact_grid import CompactGrid
+from app.movingai import load_map, load_scenarios, parse_map, run_scenarios, save_map
+
+from .reference import GRID_CLASSES, open_pairs, random_grid, reference_cost
+
+MAP = b"""type octile
+height 3
+width 5
+map
+.@..T
+G.S.O
+..W..
+"""
+
+def test_parse_map():
+    rows, cols, cells = parse_map(MAP)
+    assert (rows, cols) == (3, 5)
+    grid = CompactGrid.from_buffers(rows, cols, cells, bytearray([1]) * 15)
+    walls = [(row, col) for row in range(3) for col in range(5) if not grid.is_walkable(grid.get_node(row, col))]
+    assert walls == [(0, 1), (0, 4), (1, 4), (2, 2)]
+
+@pytest.mark.parametrize("data", [b"type octile\nheight 3\nwidth 5\n",
+                                  b"type octile\nheight x\nwidth 5\nmap\n",
+                                  MAP.replace(b"..W..", b"..W.")])
+def test_parse_map_rejects_bad_files(data):
+    with pytest.raises(ValueError):
+        parse_map(data)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_save_and_load_round_trip(grid_class, diagonal, tmp_path):
+    grid = random_grid(grid_class, 13, 21, seed=30, density=0.3)
+    save_map(grid, tmp_path / "random.map")
+    loaded = load_map(tmp_path / "random.map", grid_class, diagonal)
+    assert (loaded.rows, loaded.cols, loaded.diagonal) == (13, 21, diagonal)
+    for index in range(13 * 21):
+        assert loaded.is_walkable(loaded.cell_at(index)) == grid.is_walkable(grid.cell_at(index))
+    assert loaded.adjacency.links == grid.adjacency.links
+
+def write_scenarios(grid, pairs, path, lengths):
+    lines = ["version 1"]
+    for (start, goal), length in zip(pairs, lengths):
+        (start_row, start_col), (goal_row, goal_col) = grid.position(start), grid.position(goal)
+        lines.append(f"0\tgrid.map\t{grid.cols}\t{grid.rows}\t{start_col}\t{start_row}\t{goal_col}\t{goal_row}\t{length:.8f}")
+    path.write_text("\n".join(lines) + "\n")
+
+def test_load_scenarios(tmp_path):
+    path = tmp_path / "grid.map.scen"
+    path.write_text("version 1\n3\tarena.map\t49\t49\t1\t11\t1\t12\t1.00000000\n")
+    (scenario,) = load_scenarios(path)
+    assert (scenario.bucket, scenario.map_name) == (3, "arena.map")
+    assert (scenario.start, scenario.goal, scenario.optimal) == ((11, 1), (12, 1), 1.0)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_run_scenarios_checks_octile_lengths(grid_class, tmp_path):
+    grid = random_grid(grid_class, 20, 25, seed=31, density=0.25, diagonal=True)
+    pairs = [(start, goal) for start, goal in open_pairs(grid, random.Random(31), 30)
+             if reference_cost(grid, start, goal) is not None]
+    lengths = [reference_cost(grid, start, goal) for start, goal in pairs]
+    write_scenarios(grid, pairs, tmp_path / "grid.map.scen", lengths)
+    report = run_scenarios(grid, load_scenarios(tmp_path / "grid.map.scen"), "A* Search")
+    assert report.queries == report.solved == len(pairs) and not report.mismatches
+
+    lengths[0] += 1
+    write_scenarios(grid, pairs, tmp_path / "wrong.map.scen", lengths)
+    report = run_scenarios(grid, load_scenarios(tmp_path / "wrong.map.scen"), "A* Search")
+    assert [scenario.start for scenario, _, _ in report.mismatches] == [grid.position(pairs[0][0])]
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_run_scenarios_on_a_4_connected_grid(grid_class, tmp_path):
+    grid = random_grid(grid_class, 20, 25, seed=32, density=0.25)
+    pairs = open_pairs(grid, random.Random(32), 20)
+    write_scenarios(grid, pairs, tmp_path / "grid.map.scen", [0.0] * len(pairs))
+    scenarios = load_scenarios(tmp_path / "grid.map.scen")
+    assert not run_scenarios(grid, scenarios, "Jump Point Search").mismatches
+    assert run_scenarios(grid, scenarios, "Depth-First Search (DFS)").mismatches # Not optimal
+
+def test_scenarios_outside_the_map_are_rejected(tmp_path):
+    path = tmp_path / "grid.map.scen"
+    path.write_text("version 1\n0\tgrid.map\t99\t99\t50\t50\t0\t0\t70.0\n")
+    with pytest.raises(ValueError):
+        run_scenarios(CompactGrid(10, 10), load_scenarios(path))
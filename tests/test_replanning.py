@@ -0,0 +1,49 @@
+# tests/test_replanning.py
+
+import random
+
+import pytest
+
+from app.engine import find_path, run_search
+from app.replanning import LPAStar
+
+from .reference import GRID_CLASSES, assert_same_cost, open_pairs, random_grid, set_wall
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_lpa_star_matches_dijkstra_over_edits(grid_class):
+    grid = random_grid(grid_class, 20, 25, seed=11, density=0.2, weights=True)
+    rng = random.Random(4)
+    start, goal = open_pairs(grid, rng, 1)[0]
+    planner = LPAStar(grid, start, goal)
+    try:
+        for edit_round in range(25):
+            for _ in range(6):
+                cell = grid.cell_at(rng.randrange(grid.rows * grid.cols))
+                if cell in (start, goal):
+                    continue
+                if rng.random() < 0.7:
+                    set_wall(grid, cell, grid.is_walkable(cell))
+                elif grid.is_walkable(cell):
+                    grid.set_weight(cell, rng.choice((1, 2, 5)))
+            if edit_round == 12: # A bulk change makes the planner start over
+                grid.generate_random_walls(0.2, seed=5)
+                set_wall(grid, start, False)
+                set_wall(grid, goal, False)
+            result = run_search(planner.search())
+            assert_same_cost(result, find_path(grid, start, goal, "Dijkstra", precheck=False).cost)
+    finally:
+        planner.close()
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_small_edits_are_repaired_locally(grid_class):
+    grid = grid_class(40, 40)
+    start, goal = grid.cell_at(0), grid.cell_at(40 * 40 - 1)
+    planner = LPAStar(grid, start, goal)
+    try:
+        first = run_search(planner.search())
+        set_wall(grid, first.path[len(first.path) // 2], True)
+        repaired = run_search(planner.search())
+        assert repaired.cost == first.cost # Another path is just as short
+        assert repaired.nodes_expanded < first.nodes_expanded
+    finally:
+        planner.close()
@@ -0,0 +1,67 @@
+# tests/test_trace.py
+
+import random
+
+import pytest
+
+from app.engine import find_path
+from app.trace import CLOSED, OPEN, PATH, SearchTrace, TracePlayer, record
+
+from .reference import GRID_CLASSES, open_pairs, random_grid
+
+def replay(trace, step):
+    """The overlay after `step` steps, applying every event from the start."""
+    overlay = bytearray(trace.rows * trace.cols)
+    for i in range(trace.event_start(step)):
+        overlay[trace.cells[i]] = trace.kinds[i]
+    return overlay
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_trace_matches_the_search(grid_class):
+    grid = random_grid(grid_class, 30, 30, seed=20, density=0.25, weights=True)
+    for start, goal in open_pairs(grid, random.Random(20), 10):
+        trace = record(grid, start, goal, "Dijkstra")
+        result = find_path(grid, start, goal, "Dijkstra")
+        assert trace.found == result.found and trace.cost == result.cost
+        closed = [cell for cell, kind in zip(trace.cells, trace.kinds) if kind == CLOSED]
+        # The goal's expansion ends the search without a step of its own.
+        expanded = [grid.index_of(cell) for cell in result.expanded]
+        assert closed == expanded[:len(closed)] and len(closed) >= len(expanded) - 1
+        path = [cell for cell, kind in zip(trace.cells, trace.kinds) if kind == PATH]
+        assert path == [grid.index_of(cell) for cell in result.path]
+        assert trace.steps == len(closed) + (1 if result.found else 0)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_save_and_load_round_trip(grid_class, tmp_path):
+    grid = random_grid(grid_class, 25, 35, seed=21, density=0.3, weights=True)
+    start, goal = open_pairs(grid, random.Random(21), 1)[0]
+    trace = record(grid, start, goal, "A* Search")
+    trace.save(tmp_path / "search.trace")
+    loaded = SearchTrace.load(tmp_path / "search.trace")
+    for name in ("algorithm", "rows", "cols", "start", "goal", "found", "cost",
+                 "cells", "kinds", "step_starts"):
+        assert getattr(loaded, name) == getattr(trace, name)
+    assert bytes(loaded.walls) == bytes(trace.walls)
+    assert bytes(loaded.weights) == bytes(trace.weights)
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not.trace"
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError):
+        SearchTrace.load(path)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_seeking_matches_a_full_replay(grid_class):
+    grid = random_grid(grid_class, 40, 40, seed=22, density=0.2)
+    trace = record(grid, grid.cell_at(0), grid.cell_at(40 * 40 - 1), "Breadth-First Search (BFS)")
+    assert trace.steps > 100 and OPEN in trace.kinds
+    player = TracePlayer(trace)
+    rng = random.Random(22)
+    for step in [5, 3, trace.steps, 0] + [rng.randrange(-5, trace.steps + 5) for _ in range(30)]:
+        before = bytes(player.overlay)
+        changed = player.seek(step)
+        step = max(0, min(step, trace.steps))
+        assert player.step == step
+        expected = replay(trace, step)
+        assert player.overlay == expected == trace.state_at(step)
+        assert changed == {cell for cell in range(len(expected)) if expected[cell] != before[cell]}
@@ -0,0 +1,91 @@
+# tests/test_wavefront.py
+
+import random
+
+import pytest
+
+from app.engine import a_star, find_path, run_search, wavefront_search
+from app.wavefront import distance_field
+
+from .reference import GRID_CLASSES, assert_valid_path, open_pairs, random_grid, reference_cost, step_distances
+
+def all_cells(grid):
+    return [grid.cell_at(index) for index in range(grid.rows * grid.cols)]
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("density", [0.0, 0.3])
+def test_distances_match_bfs(grid_class, density):
+    grid = random_grid(grid_class, 17, 23, seed=1, density=density)
+    for source, _ in open_pairs(grid, random.Random(1), 5):
+        field = distance_field(grid, source)
+        expected = step_distances(grid, source)
+        assert field.complete and field.reached == len(expected)
+        for cell in all_cells(grid):
+            assert field.distance(cell) == expected.get(cell)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_paths_are_shortest(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=2, density=0.3)
+    for start, goal in open_pairs(grid, random.Random(2), 20):
+        field = distance_field(grid, start)
+        path = field.path_to(goal)
+        if field.distance(goal) is None:
+            assert path == []
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert len(path) - 1 == field.distance(goal)
+        for a, b in zip(path, path[1:]):
+            assert b in grid.get_neighbors(a)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_stops_at_the_target_layer(grid_class):
+    grid = random_grid(grid_class, 25, 25, seed=3, density=0.2)
+    for source, target in open_pairs(grid, random.Random(3), 10):
+        expected = step_distances(grid, source)
+        if target not in expected or target == source:
+            continue
+        field = distance_field(grid, source, target)
+        assert not field.complete and field.layers == expected[target] + 1
+        for cell in all_cells(grid):
+            wanted = expected.get(cell)
+            assert field.distance(cell) == (wanted if wanted is not None and wanted <= expected[target] else None)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_field_is_an_exact_heuristic(grid_class):
+    grid = random_grid(grid_class, 20, 30, seed=4, density=0.25)
+    for start, goal in open_pairs(grid, random.Random(4), 10):
+        field = distance_field(grid, goal)
+        result = run_search(a_star(grid, start, goal, heuristic=field.heuristic))
+        assert result.cost == reference_cost(grid, start, goal)
+        if not result.found:
+            assert field.heuristic(start, goal) == float("inf")
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_search_matches_bfs(grid_class):
+    grid = random_grid(grid_class, 22, 19, seed=5, density=0.3)
+    for start, goal in open_pairs(grid, random.Random(5), 20):
+        result = find_path(grid, start, goal, "Wavefront BFS", precheck=False)
+        assert result.cost == find_path(grid, start, goal, "Breadth-First Search (BFS)").cost
+        assert_valid_path(grid, result)
+        expanded = list(result.expanded)
+        assert len(expanded) == result.nodes_expanded == len(set(expanded))
+        if not result.found:
+            assert set(expanded) == set(step_distances(grid, start))
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_steps_hand_out_each_layer_once(grid_class):
+    grid = random_grid(grid_class, 15, 15, seed=6, density=0.2)
+    start, _ = open_pairs(grid, random.Random(6), 1)[0]
+    expected = step_distances(grid, start)
+    steps = wavefront_search(grid, start, grid.cell_at(0))
+    layers = []
+    try:
+        while True:
+            closed, opened = next(steps)
+            assert list(closed) == (layers[-1] if layers else [])
+            layers.append(list(opened))
+            assert len(opened) == len(layers[-1])
+    except StopIteration:
+        pass
+    for distance, layer in enumerate(layers):
+        assert all(expected[cell] == distance for cell in layer)
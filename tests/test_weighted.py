@@ -0,0 +1,29 @@
+# tests/test_weighted.py
+
+import random
+
+import pytest
+
+from app.constants import MAX_COST
+from app.engine import find_path
+
+from .reference import GRID_CLASSES, assert_same_cost, assert_valid_path, open_pairs, random_grid, reference_cost
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+@pytest.mark.parametrize("algorithm", ["A* Search", "Dijkstra", "Bidirectional A*"])
+def test_weighted_searches_find_cheapest_path(grid_class, algorithm):
+    grid = random_grid(grid_class, 24, 31, seed=3, weights=True)
+    for start, goal in open_pairs(grid, random.Random(1), 40):
+        result = find_path(grid, start, goal, algorithm)
+        assert_same_cost(result, reference_cost(grid, start, goal))
+        assert_valid_path(grid, result)
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_costs_are_range_checked(grid_class):
+    grid = grid_class(5, 5)
+    cell = grid.cell_at(7)
+    for cost in (0, MAX_COST + 1):
+        with pytest.raises(ValueError):
+            grid.set_weight(cell, cost)
+    grid.set_weight(cell, MAX_COST)
+    assert grid.cost(cell) == grid.max_cost() == MAX_COST
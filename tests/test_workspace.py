@@ -0,0 +1,52 @@
+# tests/test_workspace.py
+
+import random
+
+import pytest
+
+from app.engine import SEARCHES, find_path
+from app.workspace import _pools, borrowed_workspace
+
+from .reference import GRID_CLASSES, open_pairs, random_grid
+
+ALGORITHMS = ["A* Search", "Dijkstra", "Jump Point Search"]
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_interleaved_searches_match_sequential_runs(grid_class):
+    grid = random_grid(grid_class, 30, 30, seed=40, density=0.25, weights=True)
+    queries = [(algorithm, start, goal) for start, goal in open_pairs(grid, random.Random(40), 4)
+               for algorithm in ALGORITHMS]
+    expected = [find_path(grid, start, goal, algorithm, precheck=False) for algorithm, start, goal in queries]
+    searches = [SEARCHES[algorithm](grid, start, goal) for algorithm, start, goal in queries]
+    results = [None] * len(searches)
+    while None in results:
+        for i, steps in enumerate(searches):
+            if results[i] is None:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    results[i] = stop.value
+    for result, alone in zip(results, expected):
+        assert result.path == alone.path and result.cost == alone.cost
+        assert result.expanded == alone.expanded
+    assert len(_pools[grid]) == len(searches) # Every workspace was handed back
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_workspaces_are_reused(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=41)
+    start, goal = open_pairs(grid, random.Random(41), 1)[0]
+    find_path(grid, start, goal)
+    (workspace,) = _pools[grid]
+    generation = workspace.generation
+    find_path(grid, start, goal, "Dijkstra")
+    assert _pools[grid] == [workspace] and workspace.generation == generation + 2
+
+@pytest.mark.parametrize("grid_class", GRID_CLASSES)
+def test_stamps_survive_wrapping(grid_class):
+    grid = random_grid(grid_class, 20, 20, seed=42, density=0.3)
+    pairs = open_pairs(grid, random.Random(42), 10)
+    expected = [find_path(grid, start, goal).cost for start, goal in pairs]
+    with borrowed_workspace(grid) as workspace:
+        workspace.generation = 2 ** 32 - 6 # A few queries before the stamps would wrap
+    assert [find_path(grid, start, goal).cost for start, goal in pairs] == expected
+    assert workspace.generation < 2 ** 32 - 6